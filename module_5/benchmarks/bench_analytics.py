@@ -0,0 +1,83 @@
+"""
+Benchmarks the analysis metrics: NumPy snapshot vs the SQL statements.
+
+Builds an ``ApplicantSnapshot`` of ``--rows`` rows by repeating the entries of
+the scraped ``applicant_data.json`` (mapped to columns as ``load_data`` inserts
+them) and reports the build time, the cost of appending a pull-sized batch, and
+the latency of one full ``metrics()`` pass. With ``--sql`` the same metrics are
+also timed through ``query_data.run_queries`` against the configured database,
+and the snapshot is loaded from that database instead.
+
+Usage (from module_5)::
+
+    python benchmarks/bench_analytics.py [--rows 300000] [--pull 500] [--repeat 5] [--sql]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+# pylint: disable=wrong-import-position
+from analytics import ApplicantSnapshot, SNAPSHOT_COLUMNS
+from load_data import INSERT_FIELDS, _entry_params
+
+CORPUS = os.path.join(ROOT, "src", "web_scrape", "raw_data", "applicant_data.json")
+
+
+def corpus_rows(count, first_id=1):
+    """``count`` snapshot rows cycling through the corpus entries, numbered from ``first_id``."""
+    with open(CORPUS, encoding="utf-8") as f:
+        entries = [dict(zip(INSERT_FIELDS, _entry_params(e))) for e in json.load(f)]
+    rows = []
+    for i in range(count):
+        values = dict(entries[i % len(entries)], p_id=first_id + i)
+        rows.append(tuple(values[name] for name in SNAPSHOT_COLUMNS))
+    return rows
+
+
+def best_ms(func, repeat):
+    """Best-of-``repeat`` wall time of ``func()`` in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    """Prints snapshot build/append times and metric latency per backend."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--rows", type=int, default=300_000)
+    parser.add_argument("--pull", type=int, default=500, help="rows appended per refresh")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--sql", action="store_true", help="also time the SQL backend")
+    args = parser.parse_args()
+
+    snapshot = ApplicantSnapshot()
+    start = time.perf_counter()
+    if args.sql:
+        snapshot.refresh()
+    else:
+        snapshot.append(corpus_rows(args.rows))
+    print(f"snapshot: {len(snapshot)} rows built in {time.perf_counter() - start:.2f} s")
+
+    pull = corpus_rows(args.pull, first_id=snapshot.last_id + 1)
+    start = time.perf_counter()
+    snapshot.append(pull)
+    print(f"append {args.pull} rows: {(time.perf_counter() - start) * 1000:8.2f} ms")
+
+    print(f"numpy metrics : {best_ms(snapshot.metrics, args.repeat):8.2f} ms "
+          f"(best of {args.repeat})")
+    if args.sql:
+        from query_data import run_queries  # pylint: disable=import-outside-toplevel
+        print(f"sql run_queries: {best_ms(run_queries, args.repeat):8.2f} ms "
+              f"(best of {args.repeat})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmarks canonical-name normalization: list scans + difflib vs CanonIndex.
+
+Both sides run the same lookup the LLM app does for every row (exact
+membership first, then a fuzzy match at the app's cutoffs) over the program and
+university names in the scraped applicant data, and report normalizations/sec.
+
+Usage (from module_5)::
+
+    python benchmarks/bench_canon_index.py [--repeat 3]
+"""
+import argparse
+import difflib
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LLM_DIR = os.path.join(ROOT, "src", "web_scrape", "llm_hosting")
+sys.path.insert(0, ROOT)
+
+from src.web_scrape.llm_hosting.canon_index import CanonIndex  # pylint: disable=wrong-import-position
+
+CORPUS = os.path.join(ROOT, "src", "web_scrape", "raw_data", "applicant_data.json")
+
+
+def read_lines(name):
+    """Non-empty lines of a canonical list."""
+    with open(os.path.join(LLM_DIR, name), encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def scan_lookup(name, names, cutoff):
+    """Original path: linear membership check, then difflib over the list."""
+    if name in names:
+        return name
+    matches = difflib.get_close_matches(name, names, n=1, cutoff=cutoff)
+    return matches[0] if matches else None
+
+
+def index_lookup(name, index, cutoff):
+    """Indexed path: set membership, then the trigram-shortlisted match."""
+    if name in index:
+        return name
+    return index.best_match(name, cutoff)[0]
+
+
+def run(lookup, workload, repeat):
+    """Best-of-``repeat`` normalizations/sec and the results of the last pass."""
+    best, results = 0.0, []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = [lookup(name, target, cutoff) for name, target, cutoff in workload]
+        best = max(best, len(workload) / (time.perf_counter() - start))
+    return best, results
+
+
+def main():
+    """Builds the workload from applicant_data.json and prints the comparison."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    unis, progs = read_lines("canon_universities.txt"), read_lines("canon_programs.txt")
+    uni_index, prog_index = CanonIndex(unis), CanonIndex(progs)
+    with open(CORPUS, encoding="utf-8") as f:
+        rows = json.load(f)
+
+    names = [(r.get("University") or "", r.get("Program Name") or "") for r in rows]
+    scan_work = [(u, unis, 0.86) for u, _ in names] + [(p, progs, 0.84) for _, p in names]
+    index_work = ([(u, uni_index, 0.86) for u, _ in names]
+                  + [(p, prog_index, 0.84) for _, p in names])
+
+    scan_rate, scan_results = run(scan_lookup, scan_work, args.repeat)
+    index_rate, index_results = run(index_lookup, index_work, args.repeat)
+
+    print(f"normalizations: {len(scan_work)} ({len(unis)} universities, {len(progs)} programs)")
+    print(f"difflib scan : {scan_rate:10.1f} /sec")
+    print(f"CanonIndex   : {index_rate:10.1f} /sec  ({index_rate / scan_rate:.1f}x)")
+    print(f"identical results: {scan_results == index_results}")
+
+
+if __name__ == "__main__":
+    main()
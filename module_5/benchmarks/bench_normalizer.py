@@ -0,0 +1,140 @@
+"""
+Micro-benchmarks the post-processing of standardized names.
+
+Compares the previous per-call implementation (a ``re.fullmatch`` loop over the
+abbreviation patterns, ``re.findall`` tokenizing for degree keywords, no memo)
+with ``Normalizer`` (one combined abbreviation regex, one keyword regex, LRU
+memo), cold (memo cleared before each pass) and warm. Inputs are the program
+and university strings of ``sample_data.json`` and ``applicant_data.json``,
+split the way the model answers them. Reports microseconds per call.
+
+Usage (from module_5)::
+
+    python benchmarks/bench_normalizer.py [--rows 5000] [--repeat 5]
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LLM_DIR = os.path.join(ROOT, "src", "web_scrape", "llm_hosting")
+sys.path.insert(0, ROOT)
+
+os.environ["LLM_CACHE_PATH"] = ""
+os.environ.setdefault("CANON_UNIS_PATH", os.path.join(LLM_DIR, "canon_universities.txt"))
+os.environ.setdefault("CANON_PROGS_PATH", os.path.join(LLM_DIR, "canon_programs.txt"))
+
+from src.web_scrape.llm_hosting import app as llm_app  # pylint: disable=wrong-import-position
+from src.web_scrape.llm_hosting.normalizer import (  # pylint: disable=wrong-import-position
+    DEGREE_KEYWORDS, Normalizer,
+)
+
+CORPORA = (
+    os.path.join(LLM_DIR, "sample_data.json"),
+    os.path.join(ROOT, "src", "web_scrape", "raw_data", "applicant_data.json"),
+)
+
+
+def legacy_program(prog):
+    """Program post-processing as it was before the Normalizer."""
+    p = (prog or "").strip()
+    p = llm_app.COMMON_PROG_FIXES.get(p, p).title()
+    index = llm_app._canon()["PROG_INDEX"]  # pylint: disable=protected-access
+    if p in index:
+        return p
+    return index.best_match(p, 0.84)[0] or p
+
+
+def legacy_university(uni):
+    """University post-processing as it was before the Normalizer."""
+    u = (uni or "").strip()
+    for pat, full in llm_app.ABBREV_UNI.items():
+        if re.fullmatch(pat, u):
+            u = full
+            break
+    u = llm_app.COMMON_UNI_FIXES.get(u, u)
+    if u:
+        u = re.sub(r"\bOf\b", "of", u.title())
+    index = llm_app._canon()["UNI_INDEX"]  # pylint: disable=protected-access
+    if u in index:
+        return u
+    return index.best_match(u, 0.86)[0] or u or "Unknown"
+
+
+def legacy_validate(prog, uni, original_text=""):
+    """Swap/infer validation as it was before the Normalizer."""
+    def keywords(text):
+        return [w for w in re.findall(r"\b[\w\.]+\b", text.lower()) if w in DEGREE_KEYWORDS]
+
+    prog_has_degree = bool(keywords(prog))
+    if keywords(uni) and not prog_has_degree:
+        prog, uni = uni, prog
+        prog_has_degree = True
+    if not prog_has_degree and original_text:
+        for word in keywords(original_text)[:1]:
+            degree = word.upper() if "ms" in word or "ma" in word else word.replace(".", "").title()
+            prog = f"{prog} {degree}".strip()
+    return prog, uni
+
+
+def load_calls(limit):
+    """(program, university, original text) triples from both corpora."""
+    calls = []
+    for path in CORPORA:
+        with open(path, encoding="utf-8") as f:
+            rows = json.load(f)
+        for r in rows:
+            text = r.get("program") or (
+                f"{r.get('Program Name') or ''}, {r.get('University') or ''}".strip(", "))
+            text = " ".join(text.split())
+            prog, _, uni = text.partition(",")
+            calls.append((prog.strip().title(), uni.strip() or "Unknown", text))
+    return calls[:limit]
+
+
+def per_call_us(func, args_list, repeat, before=None):
+    """Best-of-``repeat`` mean microseconds per call; ``before`` runs untimed per pass."""
+    best = float("inf")
+    for _ in range(repeat):
+        if before:
+            before()
+        start = time.perf_counter()
+        for args in args_list:
+            func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best / max(1, len(args_list)) * 1e6
+
+
+def main():
+    """Prints microseconds per call for each step, legacy vs cold/warm Normalizer."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    calls = load_calls(args.rows)
+    canon = llm_app._canon()  # pylint: disable=protected-access
+    normalizer = Normalizer(canon["PROG_INDEX"], canon["UNI_INDEX"], llm_app.ABBREV_UNI,
+                            (llm_app.COMMON_PROG_FIXES, llm_app.COMMON_UNI_FIXES),
+                            cache_size=llm_app.NORMALIZE_CACHE_SIZE)
+    steps = (
+        ("program", legacy_program, normalizer.program, [(c[0],) for c in calls]),
+        ("university", legacy_university, normalizer.university, [(c[1],) for c in calls]),
+        ("validate", legacy_validate, normalizer.validate, calls),
+    )
+
+    print(f"calls: {len(calls)} ({len({c[2] for c in calls})} distinct rows), "
+          f"best of {args.repeat}")
+    print(f"{'step':12} {'legacy':>10} {'cold':>10} {'warm':>10}  (us/call)")
+    for name, legacy, fast, args_list in steps:
+        legacy_us = per_call_us(legacy, args_list, args.repeat)
+        cold_us = per_call_us(fast, args_list, args.repeat, before=fast.cache_clear)
+        warm_us = per_call_us(fast, args_list, args.repeat)
+        print(f"{name:12} {legacy_us:10.1f} {cold_us:10.1f} {warm_us:10.1f}")
+
+
+if __name__ == "__main__":
+    main()
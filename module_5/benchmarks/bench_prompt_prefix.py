@@ -0,0 +1,79 @@
+"""
+Benchmarks prompt-prefix KV reuse in the llama.cpp standardizer.
+
+Runs ``_infer_llm`` over program strings from the scraped applicant data twice:
+once with the context reset before every call (the full system prompt and
+few-shot turns are evaluated per row) and once with the saved prefix state, so
+only the per-row suffix is evaluated. Reports prompt tokens evaluated and
+latency per call. The program-text cache and rules-first fast path are
+bypassed. Requires llama-cpp-python and the GGUF model (downloaded on first run).
+
+Usage (from module_5)::
+
+    python benchmarks/bench_prompt_prefix.py [--rows 50]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.web_scrape.llm_hosting import app as llm_app  # pylint: disable=wrong-import-position
+
+CORPUS = os.path.join(ROOT, "src", "web_scrape", "raw_data", "applicant_data.json")
+
+
+def load_programs(limit):
+    """'Program, University' strings like the scraper produces."""
+    with open(CORPUS, encoding="utf-8") as f:
+        rows = json.load(f)
+    return [
+        f"{r.get('Program Name') or ''}, {r.get('University') or ''}".strip(", ")
+        for r in rows[:limit]
+    ]
+
+
+def run(programs, prefix_cache):
+    """Per-call latencies (ms) and prompt tokens evaluated for one mode."""
+    llm = llm_app._load_llm()  # pylint: disable=protected-access
+    llm_app.PROMPT_PREFIX_CACHE = prefix_cache
+    stats = llm_app._LLM_STATS  # pylint: disable=protected-access
+    before = dict(stats)
+
+    latencies = []
+    for text in programs:
+        if not prefix_cache:
+            llm.reset()  # evaluate the whole prompt, as every call did before
+        start = time.perf_counter()
+        llm_app._infer_llm(text)  # pylint: disable=protected-access
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    evaluated = (stats["prompt_tokens"] - before["prompt_tokens"]) - (
+        stats["prompt_tokens_reused"] - before["prompt_tokens_reused"]
+    )
+    return latencies, evaluated / len(programs)
+
+
+def main():
+    """Prints tokens evaluated and latency per call with and without reuse."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--rows", type=int, default=50)
+    args = parser.parse_args()
+
+    programs = load_programs(args.rows)
+    print(f"rows: {len(programs)}, model: {llm_app.MODEL_FILE}, n_threads: {llm_app.N_THREADS}")
+    for label, enabled in (("full prompt", False), ("prefix reuse", True)):
+        latencies, tokens = run(programs, enabled)
+        print(
+            f"{label:12}: {tokens:7.1f} prompt tokens evaluated/call, "
+            f"mean {statistics.mean(latencies):8.1f} ms, "
+            f"p50 {statistics.median(latencies):8.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
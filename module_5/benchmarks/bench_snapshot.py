@@ -0,0 +1,85 @@
+"""
+Benchmarks reading one column: pretty-printed JSON vs a columnar snapshot.
+
+Writes ``--rows`` rows (the scraped ``applicant_data.json`` entries, repeated)
+as JSON and as a snapshot in each available format, then times reading the
+``GPA`` and ``Applicant Status`` columns from each and reports file sizes.
+
+Usage (from module_5)::
+
+    python benchmarks/bench_snapshot.py [--rows 200000] [--repeat 3]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# pylint: disable=wrong-import-position
+from src.web_scrape.snapshot import CLEAN_FIELDS, _pyarrow, read_snapshot, write_snapshot
+
+CORPUS = os.path.join(ROOT, "src", "web_scrape", "raw_data", "applicant_data.json")
+COLUMNS = ("GPA", "Applicant Status")
+
+
+def size_mb(path):
+    """Size of a file or snapshot directory in MiB."""
+    if os.path.isdir(path):
+        return sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path)) / 2 ** 20
+    return os.path.getsize(path) / 2 ** 20
+
+
+def best_ms(func, repeat):
+    """Best-of-``repeat`` wall time of ``func()`` in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def read_json_columns(path):
+    """Parse the whole JSON array to pull out two fields."""
+    with open(path, encoding="utf-8") as f:
+        rows = json.load(f)
+    return [r.get(COLUMNS[0]) for r in rows], [r.get(COLUMNS[1]) for r in rows]
+
+
+def read_snapshot_columns(path):
+    """Open the snapshot with a two-column projection."""
+    snap = read_snapshot(path, columns=COLUMNS)
+    return snap.floats(COLUMNS[0]).sum(), snap.dictionary(COLUMNS[1])[0].max()
+
+
+def main():
+    """Prints read time and size per format."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with open(CORPUS, encoding="utf-8") as f:
+        corpus = json.load(f)
+    rows = [corpus[i % len(corpus)] for i in range(args.rows)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "applicant_data.json")
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=4)
+        print(f"rows: {args.rows}, columns read: {', '.join(COLUMNS)}")
+        print(f"{'json':8}: {best_ms(lambda: read_json_columns(json_path), args.repeat):9.1f} ms"
+              f"  {size_mb(json_path):7.1f} MiB")
+        for fmt in ("npy", "parquet") if _pyarrow() else ("npy",):
+            path = os.path.join(tmp, f"applicant_data.{fmt}")
+            write_snapshot(rows, path, fields=CLEAN_FIELDS, fmt=fmt)
+            read_ms = best_ms(lambda p=path: read_snapshot_columns(p), args.repeat)
+            print(f"{fmt:8}: {read_ms:9.1f} ms  {size_mb(path):7.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+"""
+Benchmarks the standardization layer end to end with a stub llama.cpp model.
+
+Swaps the GGUF model for ``StubLlama``, a deterministic stand-in with a
+configurable per-call latency, and runs ``_call_llm`` over program strings from
+``sample_data.json`` and the scraped ``applicant_data.json``. Reports rows/sec,
+where the time goes (model, prompt/parse, post-processing, rules resolver,
+cache), the program-cache and rules-first fast-path hit rates, and per-call
+costs of ``_post_normalize_program``, ``_post_normalize_university`` and
+``_validate_and_fix_results``. No llama-cpp-python or model file is needed.
+
+Usage (from module_5)::
+
+    python benchmarks/bench_standardize.py [--rows 1000] [--latency-ms 20] [--passes 1]
+        [--no-fast-path] [--repeat 5]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LLM_DIR = os.path.join(ROOT, "src", "web_scrape", "llm_hosting")
+sys.path.insert(0, ROOT)
+
+# Memory-only result cache; canonical lists from the app directory
+os.environ["LLM_CACHE_PATH"] = ""
+os.environ.setdefault("CANON_UNIS_PATH", os.path.join(LLM_DIR, "canon_universities.txt"))
+os.environ.setdefault("CANON_PROGS_PATH", os.path.join(LLM_DIR, "canon_programs.txt"))
+
+from src.web_scrape.llm_hosting import app as llm_app  # pylint: disable=wrong-import-position
+
+CORPORA = (
+    os.path.join(LLM_DIR, "sample_data.json"),
+    os.path.join(ROOT, "src", "web_scrape", "raw_data", "applicant_data.json"),
+)
+TIMED = ("_finalize_fields", "_validate_and_fix_results",
+         "_post_normalize_program", "_post_normalize_university")
+
+
+class TokenIds(list):
+    """Token list whose slices keep ``tolist`` like llama.cpp's numpy ``input_ids``."""
+
+    def __getitem__(self, key):
+        item = super().__getitem__(key)
+        return TokenIds(item) if isinstance(key, slice) else item
+
+    def tolist(self):
+        """Plain list copy."""
+        return list(self)
+
+
+class StubLlama:
+    """
+    Deterministic llama.cpp stand-in: same interface, fixed latency, no weights.
+
+    Completions answer ``{"standardized_program": ..., "standardized_university": ...}``
+    from the text before/after the first comma of the row, so post-processing
+    sees realistic model output. ``seconds`` accumulates time spent "in the model".
+    """
+
+    def __init__(self, latency_ms):
+        self.latency = latency_ms / 1000
+        self.seconds = 0.0
+        self.calls = 0
+        self._ids = TokenIds()
+
+    @property
+    def input_ids(self):
+        """Tokens currently in the context."""
+        return self._ids
+
+    @property
+    def n_tokens(self):
+        """Number of tokens in the context."""
+        return len(self._ids)
+
+    def tokenize(self, text, add_bos=True, special=False):  # pylint: disable=unused-argument
+        """One token per byte, like a character-level tokenizer."""
+        return ([1] if add_bos else []) + list(text)
+
+    def reset(self):
+        """Clear the context."""
+        self._ids = TokenIds()
+
+    def eval(self, tokens):
+        """Append tokens to the context."""
+        self._ids.extend(tokens)
+
+    def save_state(self):
+        """Snapshot of the context."""
+        return list(self._ids)
+
+    def load_state(self, state):
+        """Restore a snapshot."""
+        self._ids = TokenIds(state)
+
+    def _answer(self, prompt_text):
+        """JSON answer for the last ``{"program": ...}`` turn in the prompt."""
+        start = prompt_text.rfind('{"program"')
+        try:
+            program = json.loads(prompt_text[start:prompt_text.index("}", start) + 1])["program"]
+        except ValueError:
+            program = ""
+        prog, _, uni = program.partition(",")
+        return json.dumps({"standardized_program": prog.strip().title(),
+                           "standardized_university": uni.strip() or "Unknown"})
+
+    def create_completion(self, prompt, **kwargs):  # pylint: disable=unused-argument
+        """Sleep ``latency_ms`` and return a llama.cpp-shaped completion."""
+        start = time.perf_counter()
+        self._ids = TokenIds(prompt)
+        text = self._answer(bytes(prompt[1:]).decode("utf-8", "replace"))
+        time.sleep(self.latency)
+        self.calls += 1
+        self.seconds += time.perf_counter() - start
+        return {"choices": [{"text": text}],
+                "usage": {"prompt_tokens": len(prompt), "completion_tokens": len(text) // 4}}
+
+    def create_chat_completion(self, messages, **kwargs):  # pylint: disable=unused-argument
+        """Chat-style variant used when PROMPT_PREFIX_CACHE is off."""
+        start = time.perf_counter()
+        text = self._answer(messages[-1]["content"])
+        time.sleep(self.latency)
+        self.calls += 1
+        self.seconds += time.perf_counter() - start
+        return {"choices": [{"message": {"content": text}}],
+                "usage": {"prompt_tokens": sum(len(m["content"]) for m in messages),
+                          "completion_tokens": len(text) // 4}}
+
+
+def load_programs(limit):
+    """'Program, University' strings from both corpora, in file order."""
+    programs = []
+    for path in CORPORA:
+        with open(path, encoding="utf-8") as f:
+            rows = json.load(f)
+        for r in rows:
+            text = r.get("program") or (
+                f"{r.get('Program Name') or ''}, {r.get('University') or ''}".strip(", "))
+            programs.append(" ".join(text.split()))
+    return programs[:limit]
+
+
+def install_timers(totals):
+    """Wrap the app's stage functions so each call adds its wall time to ``totals``."""
+    def timed(name, func):
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                totals[name] += time.perf_counter() - start
+        return wrapper
+
+    for name in TIMED:
+        setattr(llm_app, name, timed(name, getattr(llm_app, name)))
+
+    infer = llm_app._infer_llm  # pylint: disable=protected-access
+
+    def timed_infer(program_text):
+        # Model rows are post-processed inside _infer_llm: keep that share apart
+        start, before = time.perf_counter(), totals["_finalize_fields"]
+        try:
+            return infer(program_text)
+        finally:
+            totals["_infer_llm"] += time.perf_counter() - start
+            totals["finalize_in_llm"] += totals["_finalize_fields"] - before
+
+    llm_app._infer_llm = timed_infer  # pylint: disable=protected-access
+    resolver = llm_app._resolver()  # pylint: disable=protected-access
+    resolver.resolve = timed("resolver", resolver.resolve)
+
+
+def run(programs, passes):
+    """Standardize every program ``passes`` times; returns (seconds, stage totals)."""
+    totals = defaultdict(float)
+    install_timers(totals)
+    start = time.perf_counter()
+    for _ in range(passes):
+        for text in programs:
+            llm_app._call_llm(text)  # pylint: disable=protected-access
+    return time.perf_counter() - start, totals
+
+
+def per_call_us(func, args_list, repeat):
+    """Best-of-``repeat`` mean microseconds per call of ``func`` over ``args_list``."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for args in args_list:
+            func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best / max(1, len(args_list)) * 1e6
+
+
+def post_processing_costs(stub, programs, repeat):
+    """Microseconds per call of each post-processing step on the stub's raw answers."""
+    raw = [json.loads(stub._answer(json.dumps({"program": t})))  # pylint: disable=protected-access
+           for t in programs]
+    calls = {
+        "_post_normalize_program": [(r["standardized_program"],) for r in raw],
+        "_post_normalize_university": [(r["standardized_university"],) for r in raw],
+        "_validate_and_fix_results": [
+            (r["standardized_program"], r["standardized_university"], t)
+            for r, t in zip(raw, programs)
+        ],
+    }
+    return {name: per_call_us(getattr(llm_app, name), args, repeat)
+            for name, args in calls.items()}
+
+
+def time_split(seconds, totals, model_seconds):
+    """Wall time per stage of ``_call_llm``; the remainder is cache lookups and glue."""
+    split = {
+        "model (stub)": model_seconds,
+        "prompt + parse": totals["_infer_llm"] - model_seconds - totals["finalize_in_llm"],
+        "post-processing": totals["_finalize_fields"],
+        "rules resolver": totals["resolver"],
+    }
+    split["cache + other"] = seconds - sum(split.values())
+    return split
+
+
+def main():
+    """Prints throughput, time split, hit rates and post-processing costs."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--latency-ms", type=float, default=20.0,
+                        help="stub model time per completion")
+    parser.add_argument("--passes", type=int, default=1,
+                        help="runs over the corpus (later passes hit the cache)")
+    parser.add_argument("--no-fast-path", action="store_true",
+                        help="send every cache miss to the model")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    programs = load_programs(args.rows)
+    stub = StubLlama(args.latency_ms)
+    llm_app._LLM = stub  # pylint: disable=protected-access
+    llm_app.LLM_JSON_GRAMMAR = False  # grammars need llama.cpp; the stub always emits JSON
+    if args.no_fast_path:
+        llm_app.FAST_PATH_THRESHOLD = 2.0
+
+    micro = post_processing_costs(stub, programs, args.repeat)
+    seconds, totals = run(programs, args.passes)
+    rows = len(programs) * args.passes
+
+    print(f"rows: {rows} ({len(programs)} programs x {args.passes} passes), "
+          f"stub latency: {args.latency_ms:g} ms, fast path: {not args.no_fast_path}")
+    print(f"throughput: {rows / seconds:9.1f} rows/sec ({seconds:.2f} s, "
+          f"{stub.calls} model calls)")
+    for label, value in time_split(seconds, totals, stub.seconds).items():
+        print(f"  {label:16}: {value:8.3f} s ({100 * value / seconds:5.1f}%)")
+    cache = llm_app._cache().stats()  # pylint: disable=protected-access
+    hits = cache["memory_hits"] + cache["disk_hits"]
+    print(f"cache hit rate: {hits / max(1, hits + cache['misses']):.1%} {cache}")
+    print(f"fast-path hit rate: {llm_app._resolver().stats()}")  # pylint: disable=protected-access
+    for name, value in micro.items():
+        print(f"{name:28}: {value:8.1f} us/call")
+
+
+if __name__ == "__main__":
+    main()
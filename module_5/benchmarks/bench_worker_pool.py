@@ -0,0 +1,76 @@
+"""
+Sweeps LLM worker-pool layouts (K processes x threads per process).
+
+For every layout whose total thread count fits the machine, standardizes the
+same program strings through ``iter_standardized`` and reports rows/sec, so
+``LLM_WORKERS`` / ``N_THREADS`` can be picked per machine. The program-text
+cache and rules-first fast path are disabled so every row reaches the model.
+Requires llama-cpp-python and the GGUF model.
+
+Usage (from module_5)::
+
+    python benchmarks/bench_worker_pool.py [--rows 64] [--chunk-size 8]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+# Every row must hit the model: memory-only cache, fast path disabled
+os.environ["LLM_CACHE_PATH"] = ""
+os.environ["LLM_CACHE_SIZE"] = "0"
+os.environ["FAST_PATH_THRESHOLD"] = "2"
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# pylint: disable=wrong-import-position
+from src.web_scrape.llm_hosting.worker_pool import iter_standardized
+
+CORPUS = os.path.join(ROOT, "src", "web_scrape", "raw_data", "applicant_data.json")
+
+
+def load_items(limit):
+    """(index, 'Program, University') pairs from the scraped applicant data."""
+    with open(CORPUS, encoding="utf-8") as f:
+        rows = json.load(f)
+    return [
+        (i, f"{r.get('Program Name') or ''}, {r.get('University') or ''}".strip(", "))
+        for i, r in enumerate(rows[:limit])
+    ]
+
+
+def layouts(cpus):
+    """(processes, threads) pairs with processes * threads <= cpus."""
+    procs = [k for k in (1, 2, 3, 4, 6, 8, 12, 16) if k <= cpus]
+    return [(k, t) for k in procs for t in sorted({1, 2, 4, cpus // k}) if 0 < t and k * t <= cpus]
+
+
+def main():
+    """Prints rows/sec for each layout and the best one."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--rows", type=int, default=64)
+    parser.add_argument("--chunk-size", type=int, default=8)
+    parser.add_argument("--cpus", type=int, default=os.cpu_count() or 2)
+    args = parser.parse_args()
+
+    items = load_items(args.rows)
+    results = []
+    for processes, threads in layouts(args.cpus):
+        start = time.perf_counter()
+        failures = sum(
+            1 for _, _, error in iter_standardized(items, processes, threads, args.chunk_size)
+            if error
+        )
+        rate = len(items) / (time.perf_counter() - start)
+        results.append((rate, processes, threads))
+        print(f"K={processes:2d} x {threads:2d} threads: {rate:7.2f} rows/sec "
+              f"({failures} failures, includes model load)")
+
+    rate, processes, threads = max(results)
+    print(f"best: LLM_WORKERS={processes} N_THREADS={processes * threads} ({rate:.2f} rows/sec)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,358 @@
+"""
+This module computes the analysis page metrics from an in-memory columnar snapshot.
+
+It is an optional backend for ``run_queries`` (``ANALYTICS_BACKEND=numpy``);
+besides the columnar snapshot format in ``web_scrape.snapshot``, it is the only
+module that imports NumPy. ``applicantdata`` (or a cleaned JSON file) is loaded
+once into column arrays: text columns are dictionary-encoded as
+integer codes and scores are float arrays with NaN for missing values. Every
+metric is then a few vectorized masks and reductions; substring (ILIKE)
+predicates are evaluated once per distinct value of a column instead of once
+per row. ``refresh`` appends only rows whose ``p_id`` is above the last one
+loaded, so after a pull the snapshot costs one indexed range scan of the new
+rows. Results are rounded like PostgreSQL's ``ROUND(x::numeric, 2)`` so both
+backends render the same page.
+"""
+import json
+import math
+import threading
+import time
+from datetime import date, datetime
+from functools import lru_cache
+from decimal import Decimal, ROUND_HALF_UP
+import numpy as np
+from psycopg import sql
+from config import pooled_connection
+from instrumentation import record_query, timed_execute
+
+TABLE_NAME = "applicantdata"
+
+# Text columns kept as dictionary codes and numeric score columns (NaN = NULL)
+CATEGORICAL_COLUMNS = (
+    "program", "status", "term", "us_or_international", "degree",
+    "llm_generated_program", "llm_generated_university"
+)
+SCORE_COLUMNS = ("gpa", "gre", "gre_v", "gre_aw")
+SNAPSHOT_COLUMNS = ("p_id", "date_added") + CATEGORICAL_COLUMNS + SCORE_COLUMNS
+
+# Substrings matched case-insensitively, as the ILIKE patterns of query_data
+_TOP_SCHOOLS = ("georgetown", "mit", "stanford", "carnegie mellon")
+_CENTS = Decimal("0.01")
+
+_SNAPSHOT = None
+_SNAPSHOT_LOCK = threading.Lock()
+
+
+def _round2(value):
+    """``ROUND(value::numeric, 2)`` of a float average; None for NULL (NaN)."""
+    if value is None or math.isnan(value):
+        return None
+    # float8 -> numeric keeps 15 significant digits, then rounds half away from zero
+    return Decimal(f"{value:.15g}").quantize(_CENTS, rounding=ROUND_HALF_UP)
+
+
+def _percent(part, whole):
+    """``ROUND(100.0 * part / NULLIF(whole, 0), 2)`` in exact decimal arithmetic."""
+    if not whole:
+        return None
+    return (Decimal(100) * int(part) / int(whole)).quantize(_CENTS, rounding=ROUND_HALF_UP)
+
+
+@lru_cache(maxsize=4096)
+def _year(value):
+    """Calendar year of a DATE or a scraped date string; 0 when unknown."""
+    if isinstance(value, (date, datetime)):
+        return value.year
+    for fmt in ("%B %d, %Y", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(str(value).strip(), fmt).year
+        except ValueError:
+            continue
+    return 0
+
+
+def _score(value):
+    """Float score, NaN for NULL or unparseable values."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def _contains(*needles):
+    """Predicate for ``ILIKE '%needle%'`` against any of ``needles``."""
+    lowered = [n.lower() for n in needles]
+    return lambda text: any(n in text.lower() for n in lowered)
+
+
+class Categorical:
+    """
+    A dictionary-encoded text column.
+
+    ``codes[i]`` indexes ``values``; code 0 is reserved for NULL. New values
+    extend the dictionary, so existing codes never change on append.
+    """
+
+    def __init__(self):
+        self.values = [None]
+        self._index = {None: 0}
+        self.codes = np.zeros(0, dtype=np.int32)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def extend(self, items):
+        """Append one value per row, encoding unseen values."""
+        index, values = self._index, self.values
+        codes = np.empty(len(items), dtype=np.int32)
+        for i, item in enumerate(items):
+            code = index.get(item)
+            if code is None:
+                code = index[item] = len(values)
+                values.append(item)
+            codes[i] = code
+        self.codes = np.concatenate((self.codes, codes))
+
+    def equals(self, value):
+        """Row mask of ``column = value``."""
+        code = self._index.get(value)
+        if code is None:
+            return np.zeros(len(self.codes), dtype=bool)
+        return self.codes == code
+
+    def where(self, predicate):
+        """Row mask of ``predicate(value)``, evaluated once per distinct non-NULL value."""
+        table = np.fromiter((v is not None and predicate(v) for v in self.values),
+                            dtype=bool, count=len(self.values))
+        return table[self.codes]
+
+    def group_by(self, key, mask):
+        """
+        Most frequent ``key(value)`` among masked rows, as (key, count).
+
+        Keys are computed per distinct value and rows are counted with one
+        ``bincount``; ties go to the key seen first.
+        """
+        keys, key_codes = [], {}
+        lookup = np.zeros(len(self.values), dtype=np.int32)
+        for code, value in enumerate(self.values[1:], start=1):
+            group = key(value)
+            if group not in key_codes:
+                key_codes[group] = len(keys)
+                keys.append(group)
+            lookup[code] = key_codes[group]
+        codes = self.codes[mask]
+        counts = np.bincount(lookup[codes[codes != 0]], minlength=len(keys))
+        if not counts.any():
+            return None, 0
+        best = int(np.argmax(counts))
+        return keys[best], int(counts[best])
+
+
+class ApplicantSnapshot:
+    """
+    Column arrays for every ``applicantdata`` row, with the analysis metrics.
+
+    Rows are appended in ``p_id`` order; ``last_id`` is the high-water mark used
+    by ``refresh`` to fetch only rows inserted since the previous call.
+    """
+
+    def __init__(self):
+        self.p_id = np.zeros(0, dtype=np.int64)
+        self.year = np.zeros(0, dtype=np.int16)
+        self.text = {name: Categorical() for name in CATEGORICAL_COLUMNS}
+        self.scores = {name: np.zeros(0, dtype=np.float64) for name in SCORE_COLUMNS}
+
+    def __len__(self):
+        return len(self.p_id)
+
+    @property
+    def last_id(self):
+        """Highest ``p_id`` loaded so far (0 when empty)."""
+        return int(self.p_id[-1]) if len(self.p_id) else 0
+
+    def append(self, rows):
+        """
+        Appends rows given as tuples in ``SNAPSHOT_COLUMNS`` order.
+
+        :param rows: Rows sorted by ``p_id``.
+        :type rows: list[tuple]
+        :return: Number of rows appended.
+        :rtype: int
+        """
+        if not rows:
+            return 0
+        columns = dict(zip(SNAPSHOT_COLUMNS, zip(*rows)))
+        self.p_id = np.concatenate((self.p_id, np.asarray(columns["p_id"], dtype=np.int64)))
+        years = np.fromiter(map(_year, columns["date_added"]), dtype=np.int16, count=len(rows))
+        self.year = np.concatenate((self.year, years))
+        for name, column in self.text.items():
+            column.extend(columns[name])
+        for name in SCORE_COLUMNS:
+            values = np.fromiter(map(_score, columns[name]), dtype=np.float64, count=len(rows))
+            self.scores[name] = np.concatenate((self.scores[name], values))
+        return len(rows)
+
+    @classmethod
+    def from_json(cls, json_file_path):
+        """
+        Builds a snapshot from a cleaned (optionally LLM-extended) JSON file.
+
+        Entries are mapped to columns exactly as ``load_data`` inserts them, and
+        duplicate URLs are skipped like ``ON CONFLICT (url) DO NOTHING``.
+
+        :param json_file_path: Path to a JSON list (or dict) of cleaned entries.
+        :type json_file_path: str
+        :return: Snapshot with ``p_id`` numbered from 1 in file order.
+        :rtype: ApplicantSnapshot
+        """
+        # Imported here so the SQL-only web path never loads the scraper modules
+        from load_data import INSERT_FIELDS, _entry_params  # pylint: disable=import-outside-toplevel
+
+        with open(json_file_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        entries = data.values() if isinstance(data, dict) else data
+
+        rows, seen = [], set()
+        for entry in entries:
+            values = dict(zip(INSERT_FIELDS, _entry_params(entry)))
+            if values["url"] is not None:
+                if values["url"] in seen:
+                    continue
+                seen.add(values["url"])
+            values["p_id"] = len(rows) + 1
+            rows.append(tuple(values[name] for name in SNAPSHOT_COLUMNS))
+        snapshot = cls()
+        snapshot.append(rows)
+        return snapshot
+
+    def refresh(self):
+        """
+        Appends rows inserted into ``applicantdata`` since the last refresh.
+
+        :return: Number of new rows.
+        :rtype: int
+        :raises psycopg.DatabaseError: If a database error occurs.
+        """
+        stmt = sql.SQL("SELECT {cols} FROM {table} WHERE {pid} > %s ORDER BY {pid};").format(
+            cols=sql.SQL(", ").join(map(sql.Identifier, SNAPSHOT_COLUMNS)),
+            table=sql.Identifier(TABLE_NAME),
+            pid=sql.Identifier("p_id")
+        )
+        with pooled_connection() as connection:
+            with connection.cursor() as cur:
+                rows = timed_execute(cur, "analytics_refresh", stmt, (self.last_id,)).fetchall()
+        return self.append(rows)
+
+    def _mean(self, name, mask=None):
+        """Average of the non-NULL values of a score column (NaN if none)."""
+        values = self.scores[name] if mask is None else self.scores[name][mask]
+        values = values[~np.isnan(values)]
+        return float(values.mean()) if len(values) else math.nan
+
+    def _cs_top_school_count(self, program_column, school_column):
+        """2026 PhD CS acceptances at the top schools, on raw or LLM fields."""
+        text = self.text
+        return int(np.count_nonzero(
+            (self.year == 2026)
+            & text["status"].equals("Accepted")
+            & text["degree"].where(_contains("phd"))
+            & text[program_column].where(_contains("computer science"))
+            & text[school_column].where(_contains(*_TOP_SCHOOLS))
+        ))
+
+    def metrics(self):
+        """
+        Computes every ``query_data.run_queries`` metric with vectorized masks.
+
+        :return: Dictionary with the same keys and value types as ``run_queries``.
+        :rtype: dict
+        """
+        text = self.text
+        fall_2026 = text["term"].equals("Fall 2026")
+        fall_2025 = text["term"].equals("Fall 2025")
+        accepted = text["status"].equals("Accepted")
+        american = text["us_or_international"].equals("American")
+        top_uni, top_count = text["program"].group_by(
+            lambda p: p[:p.find(" - ")],
+            accepted & text["program"].where(lambda p: " - " in p)
+        )
+        return {
+            "fall_2026_app_count": int(np.count_nonzero(fall_2026)),
+            "percent_international": _percent(
+                np.count_nonzero(text["us_or_international"].equals("International")), len(self)),
+            "avg_gpa": _round2(self._mean("gpa")),
+            "avg_gre": _round2(self._mean("gre")),
+            "avg_gre_v": _round2(self._mean("gre_v")),
+            "avg_gre_aw": _round2(self._mean("gre_aw")),
+            "avg_gpa_american_fall_2026": _round2(self._mean("gpa", american & fall_2026)),
+            "percent_accepted_fall_2025": _percent(
+                np.count_nonzero(accepted & fall_2025), np.count_nonzero(fall_2025)),
+            "avg_gpa_fall_2026_acceptances": _round2(self._mean("gpa", accepted & fall_2026)),
+            "jhu_cs_masters_count": int(np.count_nonzero(
+                text["program"].where(_contains("johns hopkins"))
+                & text["degree"].where(_contains("masters"))
+                & text["program"].where(_contains("computer science"))
+            )),
+            "num_entries_phd_cs_specified_schools":
+                self._cs_top_school_count("program", "program"),
+            "llm_variance": (
+                self._cs_top_school_count("program", "program")
+                - self._cs_top_school_count("llm_generated_program", "llm_generated_university")
+            ),
+            "rejected_missing_gpa": int(np.count_nonzero(
+                text["status"].equals("Rejected") & np.isnan(self.scores["gpa"]))),
+            "top_university": top_uni,
+            "top_count": top_count,
+        }
+
+
+def get_snapshot():
+    """
+    Returns the process-wide snapshot, loading ``applicantdata`` on first use.
+
+    :return: The shared snapshot.
+    :rtype: ApplicantSnapshot
+    :raises psycopg.DatabaseError: If a database error occurs.
+    """
+    global _SNAPSHOT  # pylint: disable=global-statement
+    with _SNAPSHOT_LOCK:
+        if _SNAPSHOT is None:
+            snapshot = ApplicantSnapshot()
+            snapshot.refresh()
+            _SNAPSHOT = snapshot
+        return _SNAPSHOT
+
+
+def refresh_snapshot():
+    """
+    Appends rows inserted since the last refresh (e.g. by a pull) to the snapshot.
+
+    :return: Number of new rows.
+    :rtype: int
+    :raises psycopg.DatabaseError: If a database error occurs.
+    """
+    snapshot = get_snapshot()
+    with _SNAPSHOT_LOCK:
+        return snapshot.refresh()
+
+
+def run_queries():
+    """
+    NumPy counterpart of ``query_data.run_queries``.
+
+    The snapshot is refreshed incrementally first, so results include rows
+    inserted by other processes. Compute time is recorded as the
+    ``analytics_metrics`` entry of the query metrics.
+
+    :return: Dictionary containing results of all analysis metrics.
+    :rtype: dict
+    :raises psycopg.DatabaseError: If a database error occurs.
+    """
+    refresh_snapshot()
+    snapshot = get_snapshot()
+    with _SNAPSHOT_LOCK:
+        start = time.perf_counter()
+        results = snapshot.metrics()
+    record_query("analytics_metrics", (time.perf_counter() - start) * 1000, len(snapshot))
+    return results
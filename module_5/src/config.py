@@ -6,6 +6,8 @@ psycopg SQL composition to handle dynamic SQL components safely. It also impleme
 Step 3 Database Hardening by utilizing environment variables for credentials.
 """
 import os
+import queue
+from contextlib import contextmanager
 from urllib.parse import quote_plus
 import psycopg
 from psycopg import sql
@@ -35,6 +37,18 @@ class Config:
     # Fixed W1508: Changed default to string "100" to match os.getenv expectations
     MAX_ALLOWED_LIMIT = int(os.getenv("MAX_ALLOWED_LIMIT", "100"))
 
+    # Number of idle connections kept open for reuse by pooled_connection()
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "4"))
+
+    # Statements slower than this (milliseconds) are logged with their plan
+    SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "250"))
+
+    # Recent timings kept per statement for percentile histograms
+    QUERY_SAMPLE_SIZE = int(os.getenv("QUERY_SAMPLE_SIZE", "1000"))
+
+    # "numpy" serves the analysis page from the in-memory snapshot in analytics.py
+    ANALYTICS_BACKEND = os.getenv("ANALYTICS_BACKEND", "sql").strip().lower()
+
     # Connection string utilizing environment variables
     DATABASE_URL = f"postgresql://{DB_USER}:{SAFE_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 
@@ -55,16 +69,71 @@ def get_db_connection():
     return connection
 
 
+# Idle autocommit connections shared by the read-only analysis layer
+_CONNECTION_POOL = queue.LifoQueue(maxsize=max(1, Config.DB_POOL_SIZE))
+
+
+@contextmanager
+def pooled_connection():
+    """
+    Yields a reusable autocommit connection from the module-level pool.
+
+    Connections are kept open between requests so server-side prepared
+    statements survive across calls. A new connection is opened when the pool
+    is empty. Only connections whose block finished normally go back to the
+    pool; any exception (including ``GeneratorExit``) closes the connection,
+    as does a full pool.
+
+    :return: Context manager yielding a pooled connection.
+    :rtype: contextlib.AbstractContextManager[psycopg.Connection]
+    :raises psycopg.OperationalError: If a new connection cannot be established.
+    """
+    try:
+        connection = _CONNECTION_POOL.get_nowait()
+    except queue.Empty:
+        connection = get_db_connection()
+        connection.autocommit = True
+
+    try:
+        yield connection
+    except BaseException:
+        connection.close()
+        raise
+
+    if connection.closed:
+        return
+    try:
+        _CONNECTION_POOL.put_nowait(connection)
+    except queue.Full:
+        connection.close()
+
+
+def close_pooled_connections():
+    """
+    Closes every idle connection held by the pool.
+
+    :return: None
+    :rtype: None
+    """
+    while True:
+        try:
+            _CONNECTION_POOL.get_nowait().close()
+        except queue.Empty:
+            return
+
+
 def clamp_limit(user_limit):
     """
     Enforces a maximum allowed limit for database queries.
 
     This fulfills the Step 2 requirement to clamp query limits to 1-100.
     It ensures that endpoints handle input safely without returning excessive data.
+    It is the single clamp used by every module; input that is not an integer
+    falls back to 10 rows rather than the maximum.
 
     :param user_limit: The limit requested by the user or application logic.
     :type user_limit: int or str
-    :return: An integer between 1 and 100.
+    :return: An integer between 1 and 100, or 10 for invalid input.
     :rtype: int
     """
     try:
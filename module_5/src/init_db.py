@@ -17,6 +17,146 @@ from psycopg import sql
 from config import get_db_connection
 from load_data import load_json_to_db
 
+# Columns filtered with equality predicates by query_builder.py
+INDEXED_COLUMNS = [
+    "term", "status", "us_or_international", "degree",
+    "llm_generated_university", "llm_generated_program"
+]
+
+# (sum column, non-null count column, source column) kept per counters group
+COUNTER_SCORE_COLUMNS = [
+    ("gpa_sum", "gpa_n", "gpa"),
+    ("gre_sum", "gre_n", "gre"),
+    ("gre_v_sum", "gre_v_n", "gre_v"),
+    ("gre_aw_sum", "gre_aw_n", "gre_aw"),
+]
+
+
+def setup_counters(cur):
+    """
+    Creates the incrementally maintained ``applicant_counters`` table.
+
+    Each row holds the applicant count plus GPA/GRE sums and non-null counts for
+    one (term, status, us_or_international, degree) group, with NULL keys stored
+    as empty strings. Row-level triggers on ``applicantdata`` apply every insert,
+    update and delete to the matching group, so the headline metrics in
+    ``query_data`` read a handful of summary rows instead of scanning the table.
+    The bump function runs as its owner, so the least-privilege app_worker
+    never needs write access to the counters table.
+    The counters are rebuilt from ``applicantdata`` on every call, which keeps
+    this function idempotent.
+
+    :param cur: Open cursor inside the schema setup transaction.
+    :type cur: psycopg.Cursor
+    :return: None
+    :rtype: None
+    :raises psycopg.Error: Raised if the table, functions or triggers cannot be created.
+    """
+    ids = {
+        "table": sql.Identifier("applicantdata"),
+        "counters": sql.Identifier("applicant_counters"),
+        "bump": sql.Identifier("applicant_counters_bump"),
+        "apply": sql.Identifier("applicant_counters_apply"),
+        "reset": sql.Identifier("applicant_counters_reset"),
+        "sum_defs": sql.SQL(", ").join(
+            sql.SQL("{s} DOUBLE PRECISION NOT NULL DEFAULT 0, "
+                    "{n} BIGINT NOT NULL DEFAULT 0").format(
+                        s=sql.Identifier(s), n=sql.Identifier(n))
+            for s, n, _ in COUNTER_SCORE_COLUMNS
+        ),
+        "sum_cols": sql.SQL(", ").join(
+            sql.SQL("{s}, {n}").format(s=sql.Identifier(s), n=sql.Identifier(n))
+            for s, n, _ in COUNTER_SCORE_COLUMNS
+        ),
+        "delta_vals": sql.SQL(", ").join(
+            sql.SQL("delta * COALESCE(r.{c}, 0), delta * (r.{c} IS NOT NULL)::INT").format(
+                c=sql.Identifier(c))
+            for _, _, c in COUNTER_SCORE_COLUMNS
+        ),
+        "group_vals": sql.SQL(", ").join(
+            sql.SQL("COALESCE(SUM({c}), 0), COUNT({c})").format(c=sql.Identifier(c))
+            for _, _, c in COUNTER_SCORE_COLUMNS
+        ),
+        "updates": sql.SQL(", ").join(
+            sql.SQL("{col} = c.{col} + EXCLUDED.{col}").format(col=sql.Identifier(col))
+            for col in ["n"] + [x for s, n, _ in COUNTER_SCORE_COLUMNS for x in (s, n)]
+        ),
+    }
+
+    statements = [
+        """
+        CREATE TABLE IF NOT EXISTS {counters} (
+            term TEXT NOT NULL DEFAULT '',
+            status TEXT NOT NULL DEFAULT '',
+            us_or_international TEXT NOT NULL DEFAULT '',
+            degree TEXT NOT NULL DEFAULT '',
+            n BIGINT NOT NULL DEFAULT 0,
+            {sum_defs},
+            PRIMARY KEY (term, status, us_or_international, degree)
+        );
+        """,
+        """
+        CREATE OR REPLACE FUNCTION {bump}(r {table}, delta INTEGER) RETURNS VOID AS $$
+            INSERT INTO applicant_counters AS c
+                (term, status, us_or_international, degree, n, {sum_cols})
+            VALUES (
+                COALESCE(r.term, ''), COALESCE(r.status, ''),
+                COALESCE(r.us_or_international, ''), COALESCE(r.degree, ''),
+                delta, {delta_vals}
+            )
+            ON CONFLICT (term, status, us_or_international, degree)
+            DO UPDATE SET {updates};
+        $$ LANGUAGE sql SECURITY DEFINER SET search_path = public;
+        """,
+        """
+        CREATE OR REPLACE FUNCTION {apply}() RETURNS TRIGGER AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                PERFORM applicant_counters_bump(OLD, -1);
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                PERFORM applicant_counters_bump(NEW, 1);
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """,
+        """
+        CREATE OR REPLACE FUNCTION {reset}() RETURNS TRIGGER AS $$
+        BEGIN
+            DELETE FROM applicant_counters;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """,
+        "DROP TRIGGER IF EXISTS applicant_counters_row ON {table};",
+        """
+        CREATE TRIGGER applicant_counters_row
+            AFTER INSERT OR UPDATE OR DELETE ON {table}
+            FOR EACH ROW EXECUTE FUNCTION {apply}();
+        """,
+        "DROP TRIGGER IF EXISTS applicant_counters_truncate ON {table};",
+        """
+        CREATE TRIGGER applicant_counters_truncate
+            AFTER TRUNCATE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION {reset}();
+        """,
+        # Rebuild from the base table while writers are blocked
+        "LOCK TABLE {table} IN SHARE ROW EXCLUSIVE MODE;",
+        "DELETE FROM {counters};",
+        """
+        INSERT INTO {counters} (term, status, us_or_international, degree, n, {sum_cols})
+        SELECT COALESCE(term, ''), COALESCE(status, ''),
+               COALESCE(us_or_international, ''), COALESCE(degree, ''),
+               COUNT(*), {group_vals}
+        FROM {table}
+        GROUP BY 1, 2, 3, 4;
+        """,
+    ]
+    for template in statements:
+        cur.execute(sql.SQL(template).format(**ids))
+
+
 def setup_schema():
     """
     Creates the necessary database tables and constraints using SQL composition.
@@ -72,6 +212,19 @@ def setup_schema():
                 )
                 cur.execute(alter_stmt)
 
+            # Indexes backing the equality predicates of the query builder
+            for column in INDEXED_COLUMNS:
+                index_stmt = sql.SQL(
+                    "CREATE INDEX IF NOT EXISTS {idx} ON {table} ({col});"
+                ).format(
+                    idx=sql.Identifier(f"applicantdata_{column}_idx"),
+                    table=sql.Identifier("applicantdata"),
+                    col=sql.Identifier(column)
+                )
+                cur.execute(index_stmt)
+
+            setup_counters(cur)
+
         connection.commit()
         print("[OK] Database schema initialized successfully.")
     except psycopg.Error as e:
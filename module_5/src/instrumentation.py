@@ -0,0 +1,181 @@
+"""
+This module provides lightweight timing instrumentation for database statements.
+
+Every instrumented execution records its statement name, wall time and row
+count. Executions slower than ``Config.SLOW_QUERY_MS`` are logged together with
+their PostgreSQL plan so slow analysis queries can be diagnosed without a
+profiler; only the first slow run of each SELECT is re-run with ANALYZE.
+Recent timings are kept per statement in bounded windows from which
+percentile histograms are computed for the web application's metrics endpoint.
+"""
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+import psycopg
+from psycopg import sql
+from config import Config
+from stats_utils import percentile
+
+# Percentiles reported for every statement
+PERCENTILES = (50, 90, 95, 99)
+
+# Statement name -> aggregate counters and a bounded window of recent timings
+_QUERY_METRICS = {}
+_METRICS_LOCK = threading.Lock()
+# Statement names whose plan has already been captured with EXPLAIN ANALYZE
+_ANALYZED = set()
+
+logger = logging.getLogger(__name__)
+
+
+def record_query(name, elapsed_ms, rows, slow=False):
+    """
+    Records one statement execution in the in-process metrics.
+
+    :param name: Statement name used as the metrics key.
+    :type name: str
+    :param elapsed_ms: Wall time of the execution in milliseconds.
+    :type elapsed_ms: float
+    :param rows: Rows returned or affected (negative when unknown).
+    :type rows: int
+    :param slow: Whether the execution exceeded the slow-query threshold.
+    :type slow: bool
+    :return: None
+    :rtype: None
+    """
+    with _METRICS_LOCK:
+        metrics = _QUERY_METRICS.get(name)
+        if metrics is None:
+            metrics = {
+                "calls": 0, "rows": 0, "slow_calls": 0, "total_ms": 0.0,
+                "max_ms": 0.0, "samples": deque(maxlen=Config.QUERY_SAMPLE_SIZE)
+            }
+            _QUERY_METRICS[name] = metrics
+        metrics["calls"] += 1
+        metrics["rows"] += max(rows, 0)
+        metrics["slow_calls"] += int(slow)
+        metrics["total_ms"] += elapsed_ms
+        metrics["max_ms"] = max(metrics["max_ms"], elapsed_ms)
+        metrics["samples"].append(elapsed_ms)
+
+
+def get_query_metrics(names=None):
+    """
+    Returns counters and latency percentiles for instrumented statements.
+
+    :param names: Statement names to include even if they have not run yet.
+    :type names: iterable or None
+    :return: Mapping of statement name to calls, rows, slow calls, timings and
+        ``p50_ms``/``p90_ms``/``p95_ms``/``p99_ms`` over the recent window.
+    :rtype: dict
+    """
+    with _METRICS_LOCK:
+        snapshot = {
+            name: dict(metrics, samples=sorted(metrics["samples"]))
+            for name, metrics in _QUERY_METRICS.items()
+        }
+
+    report = {}
+    for name in sorted(set(snapshot) | set(names or ())):
+        metrics = snapshot.get(name, {
+            "calls": 0, "rows": 0, "slow_calls": 0, "total_ms": 0.0,
+            "max_ms": 0.0, "samples": []
+        })
+        samples = metrics.pop("samples")
+        metrics["avg_ms"] = metrics["total_ms"] / metrics["calls"] if metrics["calls"] else 0.0
+        for pct in PERCENTILES:
+            metrics[f"p{pct}_ms"] = percentile(samples, pct)
+        report[name] = metrics
+    return report
+
+
+def reset_query_metrics():
+    """
+    Clears all recorded statement metrics.
+
+    :return: None
+    :rtype: None
+    """
+    with _METRICS_LOCK:
+        _QUERY_METRICS.clear()
+        _ANALYZED.clear()
+
+
+def _first_analyze(name):
+    """True the first time ``name`` asks for an ANALYZE plan, False afterwards."""
+    with _METRICS_LOCK:
+        if name in _ANALYZED:
+            return False
+        _ANALYZED.add(name)
+        return True
+
+
+def explain_statement(cur, stmt, params=None, analyze=False):
+    """
+    Returns the PostgreSQL plan for a statement as a list of text lines.
+
+    With ``analyze`` a SELECT is explained with ``EXPLAIN (ANALYZE, BUFFERS)``,
+    which runs it again; otherwise, and always for writes, a plain ``EXPLAIN``
+    is used. The plan is fetched on a separate cursor so the caller's results
+    survive, and inside a savepoint when the connection is not in autocommit
+    mode so a failing EXPLAIN cannot abort the caller's transaction.
+
+    :param cur: Cursor whose connection ran the statement.
+    :type cur: psycopg.Cursor
+    :param stmt: The composed statement that was executed.
+    :type stmt: psycopg.sql.Composable
+    :param params: Parameters bound to the statement.
+    :type params: tuple or None
+    :param analyze: Whether a SELECT may be re-run with ANALYZE/BUFFERS.
+    :type analyze: bool
+    :return: Plan lines, or a single line describing why no plan is available.
+    :rtype: list[str]
+    """
+    connection = cur.connection
+    try:
+        is_select = stmt.as_string(cur).lstrip().upper().startswith("SELECT")
+        options = sql.SQL("(ANALYZE, BUFFERS) " if analyze and is_select else "")
+        explain = sql.SQL("EXPLAIN {opts}{stmt}").format(opts=options, stmt=stmt)
+        with connection.transaction() if not connection.autocommit else nullcontext():
+            with connection.cursor() as plan_cur:
+                plan_cur.execute(explain, params)
+                return [line[0] for line in plan_cur.fetchall()]
+    except psycopg.Error as e:
+        return [f"plan unavailable: {e}"]
+
+
+def timed_execute(cur, name, stmt, params=None, prepare=None):
+    """
+    Executes a statement on a cursor while recording its timing and row count.
+
+    Executions slower than ``Config.SLOW_QUERY_MS`` are logged as warnings with
+    their plan; the first slow run of each statement name is explained with
+    ANALYZE, later ones with a plain ``EXPLAIN``.
+
+    :param cur: Cursor used to run the statement.
+    :type cur: psycopg.Cursor
+    :param name: Statement name used for metrics and slow-query logs.
+    :type name: str
+    :param stmt: The composed statement to execute.
+    :type stmt: psycopg.sql.Composable
+    :param params: Parameters bound to the statement.
+    :type params: tuple or None
+    :param prepare: Forwarded to ``cursor.execute`` to force server-side preparation.
+    :type prepare: bool or None
+    :return: The cursor, so results can be fetched by the caller.
+    :rtype: psycopg.Cursor
+    :raises psycopg.Error: If the statement itself fails.
+    """
+    start = time.perf_counter()
+    cur.execute(stmt, params, prepare=prepare)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    slow = elapsed_ms >= Config.SLOW_QUERY_MS
+    record_query(name, elapsed_ms, cur.rowcount, slow=slow)
+
+    if slow:
+        plan = explain_statement(cur, stmt, params, analyze=_first_analyze(name))
+        logger.warning("[SLOW QUERY] %s took %.1f ms (%d rows)\n    %s",
+                       name, elapsed_ms, cur.rowcount, "\n    ".join(plan))
+    return cur
@@ -10,6 +10,7 @@ import json
 import psycopg
 from psycopg import sql
 from config import get_db_connection, Config
+from instrumentation import timed_execute
 from web_scrape.scrape import scrape_data
 from web_scrape.clean import clean_data
 
@@ -41,21 +42,57 @@ def get_latest_entry_text(raw_json_path="Web_Scrape/raw_data/raw.json"):
         return data[first_key].get("text")
 
 
+# applicantdata columns written per entry, in the order of ``_entry_params``
+INSERT_FIELDS = [
+    "program", "comments", "date_added", "url", "status", "term",
+    "us_or_international", "gpa", "gre", "gre_v", "gre_aw", "degree",
+    "llm_generated_program", "llm_generated_university"
+]
+
+
+# Entry keys read by ``_entry_params``: the columns projected from a snapshot
+ENTRY_KEYS = [
+    "Program Name", "University", "Comments", "date_added", "URL", "Applicant Status",
+    "Program Start Date", "Citizenship", "GPA", "GRE Score", "GRE V Score", "GRE AW",
+    "Degree Program", "llm-generated-program", "llm-generated-university",
+    "LLM Program Name", "LLM University Name"
+]
+
+
 def _get_insert_statement():
     """Helper to generate composed SQL and reduce local variable count."""
-    fields = [
-        "program", "comments", "date_added", "url", "status", "term",
-        "us_or_international", "gpa", "gre", "gre_v", "gre_aw", "degree",
-        "llm_generated_program", "llm_generated_university"
-    ]
     return sql.SQL("""
         INSERT INTO {table} ({fields})
         VALUES ({placeholders})
         ON CONFLICT (url) DO NOTHING;
     """).format(
         table=sql.Identifier("applicantdata"),
-        fields=sql.SQL(", ").join(map(sql.Identifier, fields)),
-        placeholders=sql.SQL(", ").join([sql.Placeholder()] * len(fields))
+        fields=sql.SQL(", ").join(map(sql.Identifier, INSERT_FIELDS)),
+        placeholders=sql.SQL(", ").join([sql.Placeholder()] * len(INSERT_FIELDS))
+    )
+
+
+def _entry_params(entry, missing_llm=None):
+    """
+    Bind parameters for one cleaned (and optionally standardized) entry.
+
+    :param entry: Cleaned applicant dictionary.
+    :type entry: dict
+    :param missing_llm: Value stored when the entry has no LLM-generated field.
+    :type missing_llm: str or None
+    :return: Values in the column order of ``_get_insert_statement``.
+    :rtype: tuple
+    """
+    univ, prog = entry.get('University', ''), entry.get('Program Name', '')
+    combined = f"{univ} - {prog}" if univ and prog else prog
+    return (
+        combined, entry.get("Comments"), entry.get("date_added"),
+        entry.get("URL"), entry.get("Applicant Status"),
+        entry.get("Program Start Date"), entry.get("Citizenship"),
+        entry.get("GPA"), entry.get("GRE Score"), entry.get("GRE V Score"),
+        entry.get("GRE AW"), entry.get("Degree Program"),
+        entry.get("llm-generated-program", entry.get("LLM Program Name", missing_llm)),
+        entry.get("llm-generated-university", entry.get("LLM University Name", missing_llm))
     )
 
 
@@ -91,18 +128,8 @@ def scrape_and_update_db(start_page=1, end_page=50):
     with connection.cursor() as cur:
         for row in cleaned_rows:
             try:
-                univ, prog = row.get('University', ''), row.get('Program Name', '')
-                combined = f"{univ} - {prog}" if univ and prog else prog
-                params = (
-                    combined, row.get("Comments"), row.get("date_added"),
-                    row.get("URL"), row.get("Applicant Status"),
-                    row.get("Program Start Date"), row.get("Citizenship"),
-                    row.get("GPA"), row.get("GRE Score"), row.get("GRE V Score"),
-                    row.get("GRE AW"), row.get("Degree Program"),
-                    row.get("llm-generated-program", "Unknown"),
-                    row.get("llm-generated-university", "Unknown")
-                )
-                cur.execute(insert_stmt, params)
+                timed_execute(cur, "insert_applicant", insert_stmt,
+                              _entry_params(row, missing_llm="Unknown"))
                 if cur.rowcount == 1:
                     new_rows += 1
             except (psycopg.Error, KeyError, ValueError) as e:
@@ -115,6 +142,33 @@ def scrape_and_update_db(start_page=1, end_page=50):
     return new_rows
 
 
+def insert_rows(rows):
+    """
+    Inserts a batch of cleaned rows in one transaction.
+
+    Used by the pipeline's load stage, which calls it once per batch while
+    earlier stages keep producing rows.
+
+    :param rows: Cleaned applicant dictionaries.
+    :type rows: Iterable[dict]
+    :return: Number of rows newly inserted (duplicates by URL are skipped).
+    :rtype: int
+    """
+    connection = get_db_connection()
+    new_rows = 0
+    insert_stmt = _get_insert_statement()
+    try:
+        with connection.cursor() as cur:
+            for row in rows:
+                timed_execute(cur, "insert_applicant", insert_stmt, _entry_params(row))
+                if cur.rowcount == 1:
+                    new_rows += 1
+        connection.commit()
+    finally:
+        connection.close()
+    return new_rows
+
+
 def load_json_to_db(json_file_path):
     """
     Loads applicant data from a JSON file and inserts it into the database.
@@ -142,17 +196,7 @@ def load_json_to_db(json_file_path):
 
         with connection.cursor() as cur:
             for entry in entries:
-                univ, prog = entry.get('University', ''), entry.get('Program Name', '')
-                combined = f"{univ} - {prog}" if univ and prog else prog
-                cur.execute(insert_stmt, (
-                    combined, entry.get("Comments"), entry.get("date_added"),
-                    entry.get("URL"), entry.get("Applicant Status"),
-                    entry.get("Program Start Date"), entry.get("Citizenship"),
-                    entry.get("GPA"), entry.get("GRE Score"), entry.get("GRE V Score"),
-                    entry.get("GRE AW"), entry.get("Degree Program"),
-                    entry.get("llm-generated-program"),
-                    entry.get("llm-generated-university")
-                ))
+                timed_execute(cur, "insert_applicant", insert_stmt, _entry_params(entry))
                 if cur.rowcount == 1:
                     new_rows += 1
 
@@ -165,3 +209,75 @@ def load_json_to_db(json_file_path):
         return 0
     finally:
         connection.close()
+
+
+def bulk_insert_rows(cur, rows):
+    """
+    Inserts many cleaned rows with one COPY and one set-based merge.
+
+    Rows are streamed with ``COPY`` into a temporary staging table (dropped at
+    commit) and then moved into ``applicantdata`` by a single
+    ``INSERT ... SELECT ... ON CONFLICT (url) DO NOTHING`` in input order, so
+    duplicates are skipped exactly as with row-by-row inserts.
+
+    :param cur: Cursor of the connection that will commit the load.
+    :type cur: psycopg.Cursor
+    :param rows: Cleaned (optionally standardized) applicant dictionaries.
+    :type rows: Iterable[dict]
+    :return: Number of rows newly inserted.
+    :rtype: int
+    :raises psycopg.Error: If staging or merging fails.
+    """
+    names = {
+        "table": sql.Identifier("applicantdata"),
+        "stage": sql.Identifier("applicantdata_stage"),
+        "fields": sql.SQL(", ").join(map(sql.Identifier, INSERT_FIELDS)),
+    }
+    timed_execute(cur, "stage_applicants", sql.SQL("""
+        CREATE TEMP TABLE {stage} ON COMMIT DROP AS
+        SELECT 0::BIGINT AS ord, {fields} FROM {table} WITH NO DATA;
+    """).format(**names))
+    with cur.copy(sql.SQL("COPY {stage} (ord, {fields}) FROM STDIN").format(**names)) as copy:
+        for ordinal, row in enumerate(rows):
+            copy.write_row((ordinal,) + _entry_params(row))
+    timed_execute(cur, "merge_applicants", sql.SQL("""
+        INSERT INTO {table} ({fields})
+        SELECT {fields} FROM {stage} ORDER BY ord
+        ON CONFLICT (url) DO NOTHING;
+    """).format(**names))
+    return max(cur.rowcount, 0)
+
+
+def load_snapshot_to_db(snapshot_path):
+    """
+    Bulk-loads a columnar snapshot (see ``web_scrape.snapshot``) into the database.
+
+    Only the columns ``_entry_params`` reads are projected from the snapshot,
+    and rows are inserted with ``bulk_insert_rows``.
+
+    :param snapshot_path: Parquet file or npy directory written by a snapshot writer.
+    :type snapshot_path: str
+    :return: Number of rows successfully inserted into the database.
+    :rtype: int
+    """
+    if not os.path.exists(snapshot_path):
+        print(f"Snapshot not found: {snapshot_path}")
+        return 0
+
+    # NumPy (and pyarrow for parquet) are only needed for snapshot loads
+    from web_scrape.snapshot import read_snapshot  # pylint: disable=import-outside-toplevel
+
+    connection = get_db_connection()
+    try:
+        snapshot = read_snapshot(snapshot_path, columns=ENTRY_KEYS)
+        with connection.cursor() as cur:
+            new_rows = bulk_insert_rows(cur, snapshot.rows())
+        connection.commit()
+        print(f"[OK] {new_rows} rows inserted from snapshot.")
+        return new_rows
+
+    except (OSError, ValueError, psycopg.Error) as error:
+        print(f"[ERROR] Error loading snapshot: {error}")
+        return 0
+    finally:
+        connection.close()
@@ -0,0 +1,279 @@
+"""
+This module builds parameterized analytics queries over the applicant data.
+
+Instead of hardcoding cohorts the way the ``query_data`` functions do, callers
+pass a mapping of filters (term, status, citizenship, degree, university and
+program) and receive the same aggregate families as the analysis page. Every
+filter is compiled to an equality predicate on an indexed column and all values
+are bound as parameters (Step 2). Composed statements are cached per filter
+shape and executed as server-side prepared statements on pooled connections,
+so a repeated question reuses both the composition and the PostgreSQL plan.
+Cohorts filtered only on counter keys (term, status, citizenship, degree) read
+their aggregates from the trigger-maintained ``applicant_counters`` table.
+"""
+from decimal import Decimal
+from datetime import date
+from psycopg import sql
+from config import pooled_connection, clamp_limit
+from instrumentation import timed_execute
+
+TABLE_NAME = "applicantdata"
+COUNTERS_TABLE_NAME = "applicant_counters"
+
+# Public filter name -> indexed column it is compared against (see init_db.py)
+FILTER_COLUMNS = {
+    "term": "term",
+    "status": "status",
+    "citizenship": "us_or_international",
+    "degree": "degree",
+    "university": "llm_generated_university",
+    "program": "llm_generated_program",
+}
+
+# Filters that are also grouping keys of applicant_counters (see init_db.py)
+COUNTER_FILTERS = frozenset(["term", "status", "citizenship", "degree"])
+
+# Columns returned by the keyset-paginated row listing
+LISTING_COLUMNS = [
+    "p_id", "program", "date_added", "url", "status", "term",
+    "us_or_international", "gpa", "gre", "gre_v", "gre_aw", "degree",
+    "llm_generated_program", "llm_generated_university"
+]
+
+# Longest filter value accepted from a request before it is rejected outright
+MAX_FILTER_LENGTH = 200
+
+# Composed statements keyed by (statement kind, filter shape)
+_STATEMENT_CACHE = {}
+
+
+def normalize_filters(raw_filters):
+    """
+    Reduces an arbitrary mapping (e.g. ``request.args``) to the supported filters.
+
+    Unknown keys, empty values and values longer than ``MAX_FILTER_LENGTH`` are
+    dropped so they can never reach the statement composition layer.
+
+    :param raw_filters: Mapping of filter names to requested values.
+    :type raw_filters: dict or None
+    :return: Dictionary of supported filter names to stripped string values.
+    :rtype: dict
+    """
+    filters = {}
+    for name in FILTER_COLUMNS:
+        value = (raw_filters or {}).get(name)
+        if value is None:
+            continue
+        value = str(value).strip()
+        if value and len(value) <= MAX_FILTER_LENGTH:
+            filters[name] = value
+    return filters
+
+
+def filter_shape(filters):
+    """
+    Returns the cache key describing which filters are present.
+
+    :param filters: Normalized filters from ``normalize_filters``.
+    :type filters: dict
+    :return: Sorted tuple of filter names.
+    :rtype: tuple
+    """
+    return tuple(sorted(filters))
+
+
+def build_where_clause(shape):
+    """
+    Composes the WHERE predicate for a filter shape.
+
+    Each filter becomes ``<indexed column> = %s`` so the planner can use the
+    single-column indexes created by ``init_db.setup_schema``.
+
+    :param shape: Sorted tuple of filter names.
+    :type shape: tuple
+    :return: Composed predicate (``TRUE`` when no filters are present).
+    :rtype: psycopg.sql.Composable
+    """
+    if not shape:
+        return sql.SQL("TRUE")
+    return sql.SQL(" AND ").join(
+        sql.SQL("{col} = %s").format(col=sql.Identifier(FILTER_COLUMNS[name]))
+        for name in shape
+    )
+
+
+def _cached_statement(kind, shape, builder):
+    """Return the composed statement for (kind, shape), composing it once."""
+    key = (kind, shape)
+    if key not in _STATEMENT_CACHE:
+        _STATEMENT_CACHE[key] = builder(shape)
+    return _STATEMENT_CACHE[key]
+
+
+def _build_stats_statement(shape):
+    """Compose the aggregate statement for a filter shape."""
+    if COUNTER_FILTERS.issuperset(shape):
+        return _build_counter_stats_statement(shape)
+    return sql.SQL("""
+        SELECT
+            COUNT(*) AS applicant_count,
+            ROUND((100.0 * COUNT(*) FILTER (WHERE us_or_international = %s)
+                / NULLIF(COUNT(*), 0))::numeric, 2) AS percent_international,
+            ROUND((100.0 * COUNT(*) FILTER (WHERE status = %s)
+                / NULLIF(COUNT(*), 0))::numeric, 2) AS percent_accepted,
+            ROUND(AVG(gpa)::numeric, 2) AS avg_gpa,
+            ROUND(AVG(gre)::numeric, 2) AS avg_gre,
+            ROUND(AVG(gre_v)::numeric, 2) AS avg_gre_v,
+            ROUND(AVG(gre_aw)::numeric, 2) AS avg_gre_aw,
+            COUNT(*) FILTER (WHERE gpa IS NULL) AS missing_gpa_count
+        FROM {table}
+        WHERE {where};
+    """).format(
+        table=sql.Identifier(TABLE_NAME),
+        where=build_where_clause(shape)
+    )
+
+
+def _build_counter_stats_statement(shape):
+    """Compose the aggregate statement over the summary rows of applicant_counters."""
+    return sql.SQL("""
+        SELECT
+            COALESCE(SUM(n), 0)::BIGINT AS applicant_count,
+            ROUND((100.0 * COALESCE(SUM(n) FILTER (WHERE us_or_international = %s), 0)
+                / NULLIF(SUM(n), 0))::numeric, 2) AS percent_international,
+            ROUND((100.0 * COALESCE(SUM(n) FILTER (WHERE status = %s), 0)
+                / NULLIF(SUM(n), 0))::numeric, 2) AS percent_accepted,
+            ROUND((SUM(gpa_sum) / NULLIF(SUM(gpa_n), 0))::numeric, 2) AS avg_gpa,
+            ROUND((SUM(gre_sum) / NULLIF(SUM(gre_n), 0))::numeric, 2) AS avg_gre,
+            ROUND((SUM(gre_v_sum) / NULLIF(SUM(gre_v_n), 0))::numeric, 2) AS avg_gre_v,
+            ROUND((SUM(gre_aw_sum) / NULLIF(SUM(gre_aw_n), 0))::numeric, 2) AS avg_gre_aw,
+            COALESCE(SUM(n - gpa_n), 0)::BIGINT AS missing_gpa_count
+        FROM {table}
+        WHERE {where};
+    """).format(
+        table=sql.Identifier(COUNTERS_TABLE_NAME),
+        where=build_where_clause(shape)
+    )
+
+
+def _build_top_university_statement(shape):
+    """Compose the most-acceptances statement for a filter shape."""
+    return sql.SQL("""
+        SELECT llm_generated_university, COUNT(*) AS num_acceptances
+        FROM {table}
+        WHERE status = %s AND {where}
+        GROUP BY llm_generated_university
+        ORDER BY num_acceptances DESC
+        LIMIT {lim};
+    """).format(
+        table=sql.Identifier(TABLE_NAME),
+        where=build_where_clause(shape),
+        lim=sql.Literal(1)
+    )
+
+
+def _build_listing_statement(shape):
+    """Compose the keyset-paginated listing statement for a filter shape."""
+    return sql.SQL("""
+        SELECT {cols}
+        FROM {table}
+        WHERE {where} AND p_id > %s
+        ORDER BY p_id
+        LIMIT %s;
+    """).format(
+        cols=sql.SQL(", ").join(map(sql.Identifier, LISTING_COLUMNS)),
+        table=sql.Identifier(TABLE_NAME),
+        where=build_where_clause(shape)
+    )
+
+
+def _to_json_value(value):
+    """Convert database values (Decimal, date) into JSON-friendly types."""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+def get_filtered_stats(raw_filters=None):
+    """
+    Returns the analysis aggregates for an arbitrary applicant cohort.
+
+    :param raw_filters: Mapping of filter names to values (see ``FILTER_COLUMNS``).
+    :type raw_filters: dict or None
+    :return: Dictionary with the applied filters and the aggregate results.
+    :rtype: dict
+    :raises psycopg.DatabaseError: If a database error occurs.
+    """
+    filters = normalize_filters(raw_filters)
+    shape = filter_shape(filters)
+    values = tuple(filters[name] for name in shape)
+
+    stats_stmt = _cached_statement("stats", shape, _build_stats_statement)
+    top_stmt = _cached_statement("top_university", shape, _build_top_university_statement)
+
+    with pooled_connection() as connection:
+        with connection.cursor() as cur:
+            stats_row = timed_execute(
+                cur, "builder_stats", stats_stmt,
+                ("International", "Accepted") + values, prepare=True
+            ).fetchone()
+            top_row = timed_execute(
+                cur, "builder_top_university", top_stmt, ("Accepted",) + values, prepare=True
+            ).fetchone()
+
+    keys = [
+        "applicant_count", "percent_international", "percent_accepted",
+        "avg_gpa", "avg_gre", "avg_gre_v", "avg_gre_aw", "missing_gpa_count"
+    ]
+    results = {"filters": filters}
+    results.update(
+        (key, _to_json_value(value)) for key, value in zip(keys, stats_row or ())
+    )
+    results["top_university"] = top_row[0] if top_row else None
+    results["top_count"] = top_row[1] if top_row else 0
+    return results
+
+
+def list_applicants(raw_filters=None, after_id=None, limit=10):
+    """
+    Returns one keyset-paginated page of applicant rows for a cohort.
+
+    Pages are ordered by ``p_id``; pass the returned ``next_after_id`` back as
+    ``after_id`` to fetch the following page. The page size is clamped with
+    ``clamp_limit`` to the configured maximum (Step 2).
+
+    :param raw_filters: Mapping of filter names to values (see ``FILTER_COLUMNS``).
+    :type raw_filters: dict or None
+    :param after_id: Last ``p_id`` of the previous page, or None for the first page.
+    :type after_id: int or str or None
+    :param limit: Requested page size.
+    :type limit: int or str
+    :return: Dictionary with the rows and the cursor for the next page.
+    :rtype: dict
+    :raises psycopg.DatabaseError: If a database error occurs.
+    """
+    filters = normalize_filters(raw_filters)
+    shape = filter_shape(filters)
+    values = tuple(filters[name] for name in shape)
+    page_size = clamp_limit(limit)
+
+    try:
+        cursor_id = max(0, int(after_id)) if after_id is not None else 0
+    except (ValueError, TypeError):
+        cursor_id = 0
+
+    stmt = _cached_statement("listing", shape, _build_listing_statement)
+    with pooled_connection() as connection:
+        with connection.cursor() as cur:
+            fetched = timed_execute(
+                cur, "builder_listing", stmt, values + (cursor_id, page_size), prepare=True
+            ).fetchall()
+
+    rows = [
+        {col: _to_json_value(value) for col, value in zip(LISTING_COLUMNS, row)}
+        for row in fetched
+    ]
+    next_after_id = rows[-1]["p_id"] if len(rows) == page_size else None
+    return {"filters": filters, "rows": rows, "next_after_id": next_after_id}
@@ -4,29 +4,180 @@ Module contains functions to query PostgreSQL for graduate school application in
 This module implements Step 2 SQL Injection Defenses by using psycopg SQL composition,
 separating query construction from execution, and enforcing strict result limits
 based on environment configuration (Step 3).
+
+Every analysis statement is composed exactly once, at import time, into the
+``STATEMENTS`` registry. The ``get_*`` functions execute registry entries as
+server-side prepared statements on pooled connections, so PostgreSQL parses and
+plans each statement once per connection rather than once per request.
+Per-statement execution counts, timings and percentiles are recorded by the
+``instrumentation`` module and available from ``get_statement_stats``.
 """
 from psycopg import sql
-from config import get_db_connection, Config  # Updated to use centralized Config
+from config import pooled_connection, clamp_limit, Config  # Updated to use centralized Config
+from instrumentation import timed_execute, get_query_metrics
 
 # Module 5 Requirement: Enforce a maximum allowed limit from environment
 MAX_ALLOWED_LIMIT = Config.MAX_ALLOWED_LIMIT
 
 
-def clamp_limit(requested_limit):
+def _compose(template, lim=None):
+    """Compose a statement template against the applicant tables and clamped limit."""
+    return sql.SQL(template).format(
+        table=sql.Identifier('applicantdata'),
+        counters=sql.Identifier('applicant_counters'),
+        lim=sql.Literal(clamp_limit(MAX_ALLOWED_LIMIT) if lim is None else lim)
+    )
+
+
+_TOP_SCHOOL_PARAMS = ('%Georgetown%', '%MIT%', '%Stanford%', '%Carnegie Mellon%')
+
+# Statement name -> (composed SQL, bound parameters); composed once at import (Step 2).
+# Headline counts, percentages and averages read the trigger-maintained
+# applicant_counters groups (see init_db.setup_counters) instead of scanning
+# applicantdata, so their cost does not grow with the table.
+STATEMENTS = {
+    "fall_2026_apps_count": (_compose("""
+        SELECT COALESCE(SUM(n), 0)::BIGINT
+        FROM {counters}
+        WHERE term = %s
+        LIMIT {lim};
+    """), ('Fall 2026',)),
+    "percent_international": (_compose("""
+        SELECT
+            ROUND(
+                (100.0 * COALESCE(SUM(n) FILTER (WHERE us_or_international = %s), 0)
+                / NULLIF(SUM(n), 0))::NUMERIC,
+                2
+            ) AS percent_international
+        FROM {counters}
+        LIMIT {lim};
+    """), ('International',)),
+    "averages": (_compose("""
+        SELECT
+            ROUND((SUM(gpa_sum) / NULLIF(SUM(gpa_n), 0))::numeric, 2) AS avg_gpa,
+            ROUND((SUM(gre_sum) / NULLIF(SUM(gre_n), 0))::numeric, 2) AS avg_gre,
+            ROUND((SUM(gre_v_sum) / NULLIF(SUM(gre_v_n), 0))::numeric, 2) AS avg_gre_v,
+            ROUND((SUM(gre_aw_sum) / NULLIF(SUM(gre_aw_n), 0))::numeric, 2) AS avg_gre_aw
+        FROM {counters}
+        LIMIT {lim};
+    """), ()),
+    "avg_gpa_american_fall_2026": (_compose("""
+        SELECT ROUND((SUM(gpa_sum) / NULLIF(SUM(gpa_n), 0))::numeric, 2)
+            AS avg_gpa_american_fall_2026
+        FROM {counters}
+        WHERE us_or_international = %s
+                AND term = %s
+        LIMIT {lim};
+    """), ('American', 'Fall 2026')),
+    "percent_accepted_fall_2025": (_compose("""
+        SELECT ROUND(
+            (100.0 * COALESCE(SUM(n) FILTER (WHERE status = %s), 0)
+            / NULLIF(SUM(n), 0))::NUMERIC,
+            2
+        ) AS percent_accepted
+        FROM {counters}
+        WHERE term = %s
+        LIMIT {lim};
+    """), ('Accepted', 'Fall 2025')),
+    "avg_gpa_fall_2026_acceptances": (_compose("""
+        SELECT ROUND((SUM(gpa_sum) / NULLIF(SUM(gpa_n), 0))::numeric, 2)
+            AS avg_gpa_fall_2026_acceptances
+        FROM {counters}
+        WHERE term = %s
+            AND status = %s
+        LIMIT {lim};
+    """), ('Fall 2026', 'Accepted')),
+    "jhu_cs_masters_count": (_compose("""
+        SELECT COUNT(*)
+        FROM {table}
+        WHERE program ILIKE %s
+            AND degree ILIKE %s
+            AND program ILIKE %s
+        LIMIT {lim};
+    """), ('%Johns Hopkins%', '%masters%', '%computer Science%')),
+    "phd_cs_specified_schools": (_compose("""
+        SELECT COUNT(*) AS num_entries
+            FROM {table}
+            WHERE EXTRACT(YEAR FROM date_added) = 2026
+                AND status = %s
+                AND degree ILIKE %s
+                AND program ILIKE %s
+                AND (
+                    program ILIKE %s
+                    OR program ILIKE %s
+                    OR program ILIKE %s
+                    OR program ILIKE %s
+                )
+        LIMIT {lim};
+    """), ('Accepted', '%phd%', '%Computer Science%', '%Georgetown%',
+           '%Mit%', '%Stanford%', '%Carnegie Mellon%')),
+    # Standard field check construction (Step 2)
+    "llm_variance_program": (_compose("""
+        SELECT COUNT(*) FROM {table}
+        WHERE EXTRACT(YEAR FROM date_added) = 2026 AND status = %s
+            AND degree ILIKE %s AND program ILIKE %s
+            AND (program ILIKE %s OR program ILIKE %s OR
+                 program ILIKE %s OR program ILIKE %s)
+        LIMIT {lim};
+    """), ('Accepted', '%phd%', '%computer science%') + _TOP_SCHOOL_PARAMS),
+    # LLM field check construction (Step 2)
+    "llm_variance_llm": (_compose("""
+        SELECT COUNT(*) FROM {table}
+        WHERE EXTRACT(YEAR FROM date_added) = 2026 AND status = %s
+            AND degree ILIKE %s AND llm_generated_program ILIKE %s
+            AND (llm_generated_university ILIKE %s OR llm_generated_university ILIKE %s OR
+                 llm_generated_university ILIKE %s OR llm_generated_university ILIKE %s)
+        LIMIT {lim};
+    """), ('Accepted', '%phd%', '%computer science%') + _TOP_SCHOOL_PARAMS),
+    "rejected_missing_gpa": (_compose("""
+        SELECT COALESCE(SUM(n - gpa_n), 0)::BIGINT AS rejected_missing_gpa
+        FROM {counters}
+        WHERE status = %s
+        LIMIT {lim};
+    """), ('Rejected',)),
+    # SQL composition with proper GROUP BY for PostgreSQL compliance
+    "most_apps": (_compose("""
+        SELECT
+            SUBSTRING(program FROM 1 FOR POSITION(' - ' IN program) - 1) as university,
+            COUNT(*) AS num_acceptances
+        FROM {table}
+        WHERE status = %s
+            AND program LIKE %s
+        GROUP BY SUBSTRING(program FROM 1 FOR POSITION(' - ' IN program) - 1)
+        ORDER BY num_acceptances DESC
+        LIMIT {lim};
+    """, lim=1), ('Accepted', '% - %')),  # Strict inherent limit of 1
+}
+
+def execute_statement(name):
     """
-    Enforces a maximum allowed limit (1-100) for any database query.
-    This prevents potential Denial of Service (DoS) by requesting excessive rows.
+    Executes a registry statement as a prepared statement and returns its first row.
 
-    :param requested_limit: The limit provided by the user or logic.
-    :type requested_limit: int or str
-    :return: Clamped integer between 1 and 100.
-    :rtype: int
+    :param name: Key of the statement in ``STATEMENTS``.
+    :type name: str
+    :return: The first result row, or None if the statement returned nothing.
+    :rtype: tuple or None
+    :raises KeyError: If the statement name is not registered.
+    :raises psycopg.DatabaseError: If a database error occurs.
+    """
+    stmt, params = STATEMENTS[name]
+    with pooled_connection() as connection:
+        with connection.cursor() as cur:
+            # prepare=True keeps the parsed plan on this pooled connection
+            row = timed_execute(cur, name, stmt, params, prepare=True).fetchone()
+    return row
+
+
+def get_statement_stats():
+    """
+    Returns execution counts and timings for every registry statement.
+
+    :return: Mapping of statement name to calls, rows, total/average/max
+        milliseconds and latency percentiles.
+    :rtype: dict
     """
-    try:
-        val = int(requested_limit)
-        return max(1, min(val, MAX_ALLOWED_LIMIT))
-    except (ValueError, TypeError):
-        return MAX_ALLOWED_LIMIT
+    metrics = get_query_metrics(STATEMENTS)
+    return {name: metrics[name] for name in STATEMENTS}
 
 
 def get_fall_2026_apps_count():
@@ -40,24 +191,8 @@ def get_fall_2026_apps_count():
     :rtype: int
     :raises psycopg.DatabaseError: If a database error occurs.
     """
-    connection = get_db_connection()
-    with connection.cursor() as cur:
-        # SQL statement construction with SQL composition (Step 2)
-        stmt = sql.SQL("""
-            SELECT COUNT(term) 
-            FROM {table}
-            WHERE term = %s
-            LIMIT {lim};
-        """).format(
-            table=sql.Identifier('applicantdata'),
-            lim=sql.Literal(clamp_limit(MAX_ALLOWED_LIMIT))
-        )
-        # Execution with parameters to prevent injection
-        cur.execute(stmt, ('Fall 2026',))
-        result = cur.fetchone()
-        count = result[0] if result else 0
-    connection.close()
-    return count
+    result = execute_statement("fall_2026_apps_count")
+    return result[0] if result else 0
 
 
 def get_percent_international():
@@ -70,26 +205,8 @@ def get_percent_international():
     :rtype: float
     :raises psycopg.DatabaseError: If a database error occurs.
     """
-    connection = get_db_connection()
-    with connection.cursor() as cur:
-        stmt = sql.SQL("""
-            SELECT
-                ROUND(
-                    (100.0 * SUM(CASE WHEN us_or_international = %s 
-                    THEN 1 ELSE 0 END)::FLOAT / COUNT(*))::NUMERIC,
-                    2
-                ) AS percent_international
-            FROM {table}
-            LIMIT {lim};
-        """).format(
-            table=sql.Identifier('applicantdata'),
-            lim=sql.Literal(clamp_limit(MAX_ALLOWED_LIMIT))
-        )
-        cur.execute(stmt, ('International',))
-        result = cur.fetchone()
-        percentage = result[0] if result else 0.0
-    connection.close()
-    return percentage
+    result = execute_statement("percent_international")
+    return result[0] if result else 0.0
 
 
 def get_averages():
@@ -102,24 +219,7 @@ def get_averages():
     :rtype: tuple
     :raises psycopg.DatabaseError: If a database error occurs.
     """
-    connection = get_db_connection()
-    with connection.cursor() as cur:
-        stmt = sql.SQL("""
-            SELECT
-                ROUND(AVG(gpa)::numeric, 2) AS avg_gpa,
-                ROUND(AVG(gre)::numeric, 2) AS avg_gre,
-                ROUND(AVG(gre_v)::numeric, 2) AS avg_gre_v,
-                ROUND(AVG(gre_aw)::numeric, 2) AS avg_gre_aw
-            FROM {table}
-            LIMIT {lim};
-        """).format(
-            table=sql.Identifier('applicantdata'),
-            lim=sql.Literal(clamp_limit(MAX_ALLOWED_LIMIT))
-        )
-        cur.execute(stmt)
-        averages = cur.fetchone()
-    connection.close()
-    return averages
+    return execute_statement("averages")
 
 
 def get_avg_gpa_american_fall_2026():
@@ -130,23 +230,8 @@ def get_avg_gpa_american_fall_2026():
     :rtype: float
     :raises psycopg.DatabaseError: If a database error occurs.
     """
-    connection = get_db_connection()
-    with connection.cursor() as cur:
-        stmt = sql.SQL("""
-            SELECT ROUND(AVG(gpa)::numeric, 2) AS avg_gpa_american_fall_2026
-            FROM {table}
-            WHERE us_or_international = %s
-                    AND term = %s
-            LIMIT {lim};
-        """).format(
-            table=sql.Identifier('applicantdata'),
-            lim=sql.Literal(clamp_limit(MAX_ALLOWED_LIMIT))
-        )
-        cur.execute(stmt, ('American', 'Fall 2026'))
-        result = cur.fetchone()
-        avg_gpa = result[0] if result else 0.0
-    connection.close()
-    return avg_gpa
+    result = execute_statement("avg_gpa_american_fall_2026")
+    return result[0] if result else 0.0
 
 
 def get_percent_accepted_fall_2025():
@@ -157,25 +242,8 @@ def get_percent_accepted_fall_2025():
     :rtype: float
     :raises psycopg.DatabaseError: If a database error occurs.
     """
-    connection = get_db_connection()
-    with connection.cursor() as cur:
-        stmt = sql.SQL("""
-            SELECT ROUND(
-                (100 * SUM(CASE WHEN status = %s THEN 1 ELSE 0 END)::FLOAT / COUNT(*))::NUMERIC,
-                2
-            ) AS percent_accepted
-            FROM {table}
-            WHERE term = %s
-            LIMIT {lim};
-        """).format(
-            table=sql.Identifier('applicantdata'),
-            lim=sql.Literal(clamp_limit(MAX_ALLOWED_LIMIT))
-        )
-        cur.execute(stmt, ('Accepted', 'Fall 2025'))
-        result = cur.fetchone()
-        percentage = result[0] if result else 0.0
-    connection.close()
-    return percentage
+    result = execute_statement("percent_accepted_fall_2025")
+    return result[0] if result else 0.0
 
 
 def get_avg_gpa_fall_2026_acceptances():
@@ -186,23 +254,8 @@ def get_avg_gpa_fall_2026_acceptances():
     :rtype: float
     :raises psycopg.DatabaseError: If a database error occurs.
     """
-    connection = get_db_connection()
-    with connection.cursor() as cur:
-        stmt = sql.SQL("""
-            SELECT ROUND(AVG(gpa)::numeric, 2) AS avg_gpa_fall_2026_acceptances
-            FROM {table}
-            WHERE term = %s
-                AND status = %s
-            LIMIT {lim};
-        """).format(
-            table=sql.Identifier('applicantdata'),
-            lim=sql.Literal(clamp_limit(MAX_ALLOWED_LIMIT))
-        )
-        cur.execute(stmt, ('Fall 2026', 'Accepted'))
-        result = cur.fetchone()
-        avg_gpa = result[0] if result else 0.0
-    connection.close()
-    return avg_gpa
+    result = execute_statement("avg_gpa_fall_2026_acceptances")
+    return result[0] if result else 0.0
 
 
 def get_jhu_cs_masters_count():
@@ -213,24 +266,8 @@ def get_jhu_cs_masters_count():
     :rtype: int
     :raises psycopg.DatabaseError: If a database error occurs.
     """
-    connection = get_db_connection()
-    with connection.cursor() as cur:
-        stmt = sql.SQL("""
-            SELECT COUNT(*)
-            FROM {table}
-            WHERE program ILIKE %s
-                AND degree ILIKE %s
-                AND program ILIKE %s
-            LIMIT {lim};
-        """).format(
-            table=sql.Identifier('applicantdata'),
-            lim=sql.Literal(clamp_limit(MAX_ALLOWED_LIMIT))
-        )
-        cur.execute(stmt, ('%Johns Hopkins%', '%masters%', '%computer Science%'))
-        result = cur.fetchone()
-        count = result[0] if result else 0
-    connection.close()
-    return count
+    result = execute_statement("jhu_cs_masters_count")
+    return result[0] if result else 0
 
 
 def get_num_entries_phd_cs_specified_schools():
@@ -241,35 +278,8 @@ def get_num_entries_phd_cs_specified_schools():
     :rtype: int
     :raises psycopg.DatabaseError: If a database error occurs.
     """
-    connection = get_db_connection()
-    with connection.cursor() as cur:
-        stmt = sql.SQL("""
-            SELECT COUNT(*) AS num_entries
-                FROM {table}
-                WHERE EXTRACT(YEAR FROM date_added) = 2026
-                    AND status = %s
-                    AND degree ILIKE %s
-                    AND program ILIKE %s
-                    AND (
-                        program ILIKE %s
-                        OR program ILIKE %s
-                        OR program ILIKE %s
-                        OR program ILIKE %s
-                    )
-            LIMIT {lim};
-        """).format(
-            table=sql.Identifier('applicantdata'),
-            lim=sql.Literal(clamp_limit(MAX_ALLOWED_LIMIT))
-        )
-        params = (
-            'Accepted', '%phd%', '%Computer Science%', '%Georgetown%',
-            '%Mit%', '%Stanford%', '%Carnegie Mellon%'
-        )
-        cur.execute(stmt, params)
-        result = cur.fetchone()
-        count = result[0] if result else 0
-    connection.close()
-    return count
+    result = execute_statement("phd_cs_specified_schools")
+    return result[0] if result else 0
 
 
 def get_llm_variance():
@@ -283,42 +293,8 @@ def get_llm_variance():
     :rtype: int
     :raises psycopg.DatabaseError: If a database error occurs.
     """
-    connection = get_db_connection()
-    with connection.cursor() as cur:
-        table_id = sql.Identifier('applicantdata')
-        lim_lit = sql.Literal(clamp_limit(MAX_ALLOWED_LIMIT))
-
-        # Standard field check construction (Step 2)
-        stmt1 = sql.SQL("""
-            SELECT COUNT(*) FROM {table}
-            WHERE EXTRACT(YEAR FROM date_added) = 2026 AND status = %s
-                AND degree ILIKE %s AND program ILIKE %s
-                AND (program ILIKE %s OR program ILIKE %s OR 
-                     program ILIKE %s OR program ILIKE %s)
-            LIMIT {lim};
-        """).format(table=table_id, lim=lim_lit)
-
-        params = (
-            'Accepted', '%phd%', '%computer science%', '%Georgetown%',
-            '%MIT%', '%Stanford%', '%Carnegie Mellon%'
-        )
-        cur.execute(stmt1, params)
-        prog_count = cur.fetchone()[0]
-
-        # LLM field check construction (Step 2)
-        stmt2 = sql.SQL("""
-            SELECT COUNT(*) FROM {table}
-            WHERE EXTRACT(YEAR FROM date_added) = 2026 AND status = %s
-                AND degree ILIKE %s AND llm_generated_program ILIKE %s
-                AND (llm_generated_university ILIKE %s OR llm_generated_university ILIKE %s OR 
-                     llm_generated_university ILIKE %s OR llm_generated_university ILIKE %s)
-            LIMIT {lim};
-        """).format(table=table_id, lim=lim_lit)
-
-        cur.execute(stmt2, params)
-        llm_count = cur.fetchone()[0]
-
-    connection.close()
+    prog_count = execute_statement("llm_variance_program")[0]
+    llm_count = execute_statement("llm_variance_llm")[0]
     return prog_count - llm_count
 
 
@@ -330,23 +306,8 @@ def get_rejected_missing_gpa():
     :rtype: int
     :raises psycopg.DatabaseError: If a database error occurs.
     """
-    connection = get_db_connection()
-    with connection.cursor() as cur:
-        stmt = sql.SQL("""
-            SELECT COUNT(*) AS rejected_missing_gpa
-            FROM {table}
-            WHERE status = %s
-                AND gpa IS NULL
-            LIMIT {lim};
-        """).format(
-            table=sql.Identifier('applicantdata'),
-            lim=sql.Literal(clamp_limit(MAX_ALLOWED_LIMIT))
-        )
-        cur.execute(stmt, ('Rejected',))
-        result = cur.fetchone()
-        count = result[0] if result else 0
-    connection.close()
-    return count
+    result = execute_statement("rejected_missing_gpa")
+    return result[0] if result else 0
 
 
 def get_most_apps():
@@ -361,35 +322,15 @@ def get_most_apps():
     :rtype: tuple
     :raises psycopg.DatabaseError: If a database error occurs.
     """
-    connection = get_db_connection()
-    with connection.cursor() as cur:
-        # SQL composition with proper GROUP BY for PostgreSQL compliance
-        stmt = sql.SQL("""
-            SELECT 
-                SUBSTRING(program FROM 1 FOR POSITION(' - ' IN program) - 1) as university,
-                COUNT(*) AS num_acceptances
-            FROM {table}
-            WHERE status = %s
-                AND program LIKE %s
-            GROUP BY SUBSTRING(program FROM 1 FOR POSITION(' - ' IN program) - 1)
-            ORDER BY num_acceptances DESC
-            LIMIT {lim};
-        """).format(
-            table=sql.Identifier('applicantdata'),
-            lim=sql.Literal(1) # Strict inherent limit of 1
-        )
-        cur.execute(stmt, ('Accepted', '% - %'))
-        row = cur.fetchone()
-        top_res = (row[0], row[1]) if row else (None, 0)
-    connection.close()
-    return top_res
+    row = execute_statement("most_apps")
+    return (row[0], row[1]) if row else (None, 0)
 
 
 def run_queries():
     """
     Runs all defined queries and returns their results in a dictionary.
 
-    This acts as the primary data aggregator for the web application's 
+    This acts as the primary data aggregator for the web application's
     analysis view.
 
     :return: Dictionary containing results of all query functions.
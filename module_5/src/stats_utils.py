@@ -0,0 +1,28 @@
+"""
+This module holds the latency summary helpers shared across the project.
+
+The database instrumentation, the ingestion pipeline's progress reporter and
+the LLM request scheduler all summarize bounded windows of timings the same
+way, so the nearest-rank percentile lives here rather than in any one of them.
+"""
+
+# Percentiles reported for pipeline stages and the LLM request scheduler
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(sorted_samples, pct):
+    """
+    Nearest-rank percentile of an already sorted sequence.
+
+    :param sorted_samples: Samples in ascending order.
+    :type sorted_samples: Sequence[float]
+    :param pct: Percentile in (0, 100].
+    :type pct: float
+    :return: The smallest sample with at least ``pct`` percent of samples at or
+        below it, or 0.0 when there are no samples.
+    :rtype: float
+    """
+    if not sorted_samples:
+        return 0.0
+    rank = max(1, -(-len(sorted_samples) * pct // 100))
+    return sorted_samples[int(rank) - 1]
@@ -9,15 +9,28 @@ hardened database layer to enforce Step 2 and Step 3 security standards.
 import os
 import sys
 import threading
-from flask import Blueprint, render_template, current_app, jsonify
+from flask import Blueprint, render_template, current_app, jsonify, request
 from query_data import run_queries
+from query_builder import get_filtered_stats, list_applicants
+from instrumentation import get_query_metrics
 from load_data import scrape_and_update_db
+from config import Config as DbConfig
 
 # Adjust pathing for local imports
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
 
 bp = Blueprint('views', __name__)
 
+
+def _numpy_backend():
+    """Return the NumPy analytics module when it is the configured backend, else None."""
+    if DbConfig.ANALYTICS_BACKEND != "numpy":
+        return None
+    # Optional dependency: NumPy is only imported when the backend is enabled
+    import analytics  # pylint: disable=import-outside-toplevel
+    return analytics
+
+
 @bp.route('/')
 def home():
     """
@@ -57,17 +70,67 @@ def analysis():
 
     This endpoint triggers the secure query execution logic defined in 
     the query_data module, adhering to SQL composition standards and 
-    inherent result limits (Step 2 & 3).
+    inherent result limits (Step 2 & 3). With ``ANALYTICS_BACKEND=numpy`` the
+    same metrics come from the analytics module's in-memory snapshot.
 
     :return: Rendered queries.html template populated with query results.
     :rtype: str
     """
-    results = run_queries()
+    backend = _numpy_backend()
+    results = backend.run_queries() if backend else run_queries()
     # Pull current state from the hardened application configuration
     results['is_pulling_data'] = current_app.config.get("IS_PULLING_DATA", False)
     return render_template("queries.html", **results)
 
 
+@bp.route('/api/stats')
+def api_stats():
+    """
+    Return analysis aggregates for a cohort selected by query-string filters.
+
+    Supported filters are ``term``, ``status``, ``citizenship``, ``degree``,
+    ``university`` and ``program``; unknown parameters are ignored. Values are
+    bound as parameters by the query builder (Step 2).
+
+    :return: JSON response with the applied filters and aggregate results.
+    :rtype: flask.Response
+    """
+    return jsonify(get_filtered_stats(request.args))
+
+
+@bp.route('/api/applicants')
+def api_applicants():
+    """
+    Return a keyset-paginated page of applicant rows matching the filters.
+
+    Accepts the same filters as ``/api/stats`` plus ``after_id`` (the
+    ``next_after_id`` of the previous page) and ``limit``, which is clamped
+    to the configured maximum (Step 3).
+
+    :return: JSON response with the rows and the cursor for the next page.
+    :rtype: flask.Response
+    """
+    return jsonify(list_applicants(
+        request.args,
+        after_id=request.args.get("after_id"),
+        limit=request.args.get("limit", 10)
+    ))
+
+
+@bp.route('/metrics')
+def metrics():
+    """
+    Return timing metrics for every instrumented database statement.
+
+    Each statement reports its call and row counts, slow-call count, total,
+    average and max wall time, and p50/p90/p95/p99 latency percentiles.
+
+    :return: JSON response mapping statement names to their metrics.
+    :rtype: flask.Response
+    """
+    return jsonify(get_query_metrics())
+
+
 @bp.route('/pull_data', methods=['GET', 'POST'])
 def pull_data():
     """
@@ -98,6 +161,10 @@ def pull_data():
             try:
                 # Limit the scope of initial background scrape (Inherent Limit)
                 scrape_and_update_db(start_page=1, end_page=10)
+                backend = _numpy_backend()
+                if backend:
+                    # Append only the rows this pull inserted to the in-memory snapshot
+                    backend.refresh_snapshot()
             except Exception as exc:  # pylint: disable=broad-except
                 # Safety: Ensure error doesn't crash main app thread
                 print(f"Background Task Error: {exc}")
@@ -166,6 +166,38 @@ def extract_gre_aw(text):
     return None
 
 
+def clean_entry(entry):
+    """
+    Clean and structure a single raw applicant entry.
+
+    :param entry: One raw scraped entry (``text``, ``decision``, ``program``, ...).
+    :type entry: dict
+    :return: The cleaned applicant dictionary.
+    :rtype: dict
+    """
+    text = entry.get("text", "")
+    decision_text = entry.get("decision", "")
+
+    decision, decision_date = extract_decision_and_date(decision_text)
+
+    return {
+        "Program Name": entry.get("program"),
+        "University": entry.get("university"),
+        "Comments": extract_comments(text),
+        "date_added": entry.get("date_added"),
+        "URL": entry.get("url"),
+        "Applicant Status": decision,
+        "Decision Date": decision_date,
+        "Program Start Date": extract_program_start(text),
+        "Citizenship": extract_citizenship(text),
+        "GRE Score": extract_gre_score(text),
+        "GRE V Score": extract_gre_v_score(text),
+        "Degree Program": extract_degree_type(text),
+        "GPA": extract_gpa(text),
+        "GRE AW": extract_gre_aw(text)
+    }
+
+
 def clean_data(raw_data):
     """
     Clean and structure raw applicant data into a list of dictionaries.
@@ -175,42 +207,18 @@ def clean_data(raw_data):
     :return: List of cleaned applicant dictionaries.
     :rtype: list[dict]
     """
-    cleaned_list = []
-
-    for entry in raw_data.values():
-        text = entry.get("text", "")
-        decision_text = entry.get("decision", "")
-
-        decision, decision_date = extract_decision_and_date(decision_text)
+    return [clean_entry(entry) for entry in raw_data.values()]
 
-        cleaned_entry = {
-            "Program Name": entry.get("program"),
-            "University": entry.get("university"),
-            "Comments": extract_comments(text),
-            "date_added": entry.get("date_added"),
-            "URL": entry.get("url"),
-            "Applicant Status": decision,
-            "Decision Date": decision_date,
-            "Program Start Date": extract_program_start(text),
-            "Citizenship": extract_citizenship(text),
-            "GRE Score": extract_gre_score(text),
-            "GRE V Score": extract_gre_v_score(text),
-            "Degree Program": extract_degree_type(text),
-            "GPA": extract_gpa(text),
-            "GRE AW": extract_gre_aw(text)
-        }
 
-        cleaned_list.append(cleaned_entry)
-    return cleaned_list
-
-
-def load_data():
+def load_data(snapshot_path=None):
     """
     Load raw JSON data, clean it, and save the structured output.
 
     This fulfills Step 3 Hardening by ensuring raw scraped data is 
     stored in a structured JSON format before insertion via restricted roles.
 
+    :param snapshot_path: Also write the cleaned rows as a columnar snapshot here.
+    :type snapshot_path: str or None
     :return: List of cleaned applicant dictionaries.
     :rtype: list[dict]
     """
@@ -222,4 +230,9 @@ def load_data():
     with open("raw_data/applicant_data.json", "w", encoding="utf-8") as file:
         json.dump(cleaned_results, file, indent=4)
 
+    if snapshot_path:
+        # NumPy (and pyarrow) are only needed when a snapshot is requested
+        from .snapshot import CLEAN_FIELDS, write_snapshot  # pylint: disable=import-outside-toplevel
+        write_snapshot(cleaned_results, snapshot_path, fields=CLEAN_FIELDS)
+
     return cleaned_results
@@ -0,0 +1,142 @@
+"""
+This module keeps the append-only journal of per-row LLM results.
+
+Each processed row adds one JSON line (``{"i": <row index>, <field>: <value>, ...}``)
+to the journal. Lines are buffered and flushed with ``fsync`` once every
+``fsync_every`` rows, so a checkpoint costs one small write instead of
+rewriting every result so far. Resuming replays the journal in a single pass,
+and ``JsonArrayWriter`` streams the final artifact to disk one row at a time.
+"""
+import json
+import os
+import textwrap
+
+
+def replay_journal(path):
+    """
+    Read every complete entry of a journal in one pass.
+
+    A torn last line (the process died mid-write) is dropped and the file is
+    truncated back to the last complete entry so new appends start cleanly.
+
+    :param path: Path of the JSONL journal.
+    :type path: str
+    :return: Row index mapped to that row's recorded fields (later lines win).
+    :rtype: dict[int, dict]
+    """
+    results = {}
+    if not os.path.exists(path):
+        return results
+
+    good_end = 0
+    with open(path, "rb") as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                entry = json.loads(line)
+                index = int(entry.pop("i"))
+            except (ValueError, KeyError, TypeError, AttributeError):
+                break
+            results[index] = entry
+            good_end += len(line)
+
+    if good_end < os.path.getsize(path):
+        with open(path, "r+b") as f:
+            f.truncate(good_end)
+    return results
+
+
+class RowJournal:
+    """
+    Append-only JSONL journal of per-row results, fsync'd in batches.
+
+    :param path: Path of the JSONL journal (created if missing).
+    :type path: str
+    :param fsync_every: Number of appended rows between flush + ``fsync``.
+    :type fsync_every: int
+    """
+
+    def __init__(self, path, fsync_every=50):
+        self.path = path
+        self.fsync_every = max(1, fsync_every)
+        self._pending = 0
+        self._file = open(path, "a", encoding="utf-8")  # pylint: disable=consider-using-with
+
+    def append(self, index, fields):
+        """
+        Record the result of one row; durable after the next batch sync.
+
+        :param index: Row index in the cleaned data.
+        :type index: int
+        :param fields: Result fields to store for the row.
+        :type fields: dict
+        """
+        entry = {"i": index}
+        entry.update(fields)
+        self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._pending += 1
+        if self._pending >= self.fsync_every:
+            self.sync()
+
+    def sync(self):
+        """Flush buffered entries and ``fsync`` them to disk."""
+        if self._file.closed or not self._pending:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending = 0
+
+    def close(self):
+        """Sync outstanding entries and close the journal."""
+        if not self._file.closed:
+            self.sync()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class JsonArrayWriter:
+    """
+    Streams rows into a JSON array file, one row at a time.
+
+    The layout matches ``json.dump(rows, f, indent=4, ensure_ascii=False)``.
+    Rows go to ``<out_path>.tmp``, which replaces ``out_path`` on ``close``.
+
+    :param out_path: Destination JSON file.
+    :type out_path: str
+    """
+
+    def __init__(self, out_path):
+        self.out_path = out_path
+        self.tmp_path = f"{out_path}.tmp"
+        self.count = 0
+        self._file = open(self.tmp_path, "w", encoding="utf-8")  # pylint: disable=consider-using-with
+
+    def write(self, row):
+        """
+        Append one row to the array.
+
+        :param row: The row to serialize.
+        :type row: dict
+        """
+        item = json.dumps(row, indent=4, ensure_ascii=False)
+        self._file.write(("[\n" if self.count == 0 else ",\n") + textwrap.indent(item, "    "))
+        self.count += 1
+
+    def close(self):
+        """
+        Terminate the array and move the file into place.
+
+        :return: Number of rows written.
+        :rtype: int
+        """
+        if not self._file.closed:
+            self._file.write("\n]" if self.count else "[]")
+            self._file.close()
+            os.replace(self.tmp_path, self.out_path)
+        return self.count
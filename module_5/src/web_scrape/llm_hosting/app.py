@@ -3,18 +3,42 @@
 
 from __future__ import annotations
 
+import gc
+import hashlib
 import json
 import os
 import re
 import sys
-import difflib
-from typing import Any, Dict, List, Tuple
-
-from flask import Flask, jsonify, request
-from huggingface_hub import hf_hub_download
-from llama_cpp import Llama  # CPU-only by default if N_GPU_LAYERS=0
+import time
+from collections import deque
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from typing import (
+    TYPE_CHECKING, Any, BinaryIO, Deque, Dict, Iterable, Iterator, List, Set, TextIO, Tuple,
+)
 
-app = Flask(__name__)
+try:
+    from .batching import BatchScheduler, QueueFullError
+    from .canon_index import CanonIndex
+    from .json_stream import iter_json_rows
+    from .model_registry import ModelRegistry
+    from .normalizer import Normalizer
+    from .prefork import serve_prefork, smaps_rollup
+    from .program_cache import ProgramCache
+    from .rules_resolver import RulesResolver
+except ImportError:  # executed as a script: python app.py
+    from batching import BatchScheduler, QueueFullError
+    from canon_index import CanonIndex
+    from json_stream import iter_json_rows
+    from model_registry import ModelRegistry
+    from normalizer import Normalizer
+    from prefork import serve_prefork, smaps_rollup
+    from program_cache import ProgramCache
+    from rules_resolver import RulesResolver
+
+# llama.cpp, Hugging Face and Flask are imported on first use so that importing
+# this module (e.g. from the pipeline CLI or the tests) stays cheap
+if TYPE_CHECKING:
+    from llama_cpp import Llama, LlamaGrammar
 
 # ---------------- Model config ----------------
 MODEL_REPO = os.getenv(
@@ -25,10 +49,64 @@ MODEL_FILE = os.getenv(
     "MODEL_FILE",
     "tinyllama-1.1b-chat-v1.0.Q4_K_M.gguf",
 )
+# Model files are resolved offline: MODEL_PATH, then MODEL_FILE (or a copy with
+# the expected checksum) in MODEL_DIRS. The hub is used only with MODEL_ALLOW_DOWNLOAD=1.
+_HERE = os.path.dirname(os.path.abspath(__file__))
+MODEL_PATH = os.getenv("MODEL_PATH", "")
+MODEL_DIRS = [
+    d for d in os.getenv(
+        "MODEL_DIRS",
+        os.pathsep.join([
+            "models",
+            os.path.join(_HERE, "models"),
+            os.path.join(_HERE, "..", "..", "web_app", "models"),
+        ]),
+    ).split(os.pathsep) if d
+]
+MODEL_SHA256 = os.getenv("MODEL_SHA256", "")  # default: the oid of a git-lfs pointer, if any
+MODEL_ALLOW_DOWNLOAD = os.getenv("MODEL_ALLOW_DOWNLOAD", "0") != "0"
 
 N_THREADS = int(os.getenv("N_THREADS", str(os.cpu_count() or 2)))
 N_CTX = int(os.getenv("N_CTX", "512"))  # Optimized for speed - short prompts don't need 2048
 N_GPU_LAYERS = int(os.getenv("N_GPU_LAYERS", "10"))  # Conservative GPU offload (try 10 layers first)
+# mmap the GGUF so weights live in the shared page cache (one copy for all
+# --serve workers); mlock pins them so they are never paged out
+LLM_USE_MMAP = os.getenv("LLM_USE_MMAP", "1") != "0"
+LLM_USE_MLOCK = os.getenv("LLM_USE_MLOCK", "0") != "0"
+SERVE_WORKERS = int(os.getenv("SERVE_WORKERS", "1"))  # --serve processes sharing the model
+
+# Program-text memo shared by main.py, /standardize and the --file CLI.
+# Set LLM_CACHE_PATH="" for a memory-only cache.
+LLM_CACHE_PATH = os.getenv(
+    "LLM_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "llm_cache.sqlite3"),
+)
+LLM_CACHE_SIZE = int(os.getenv("LLM_CACHE_SIZE", "4096"))
+# Memoized post-processing results per step (program, university, validation)
+NORMALIZE_CACHE_SIZE = int(os.getenv("NORMALIZE_CACHE_SIZE", "8192"))
+
+# Evaluate the system prompt + few-shots once per model and reuse its KV state
+PROMPT_PREFIX_CACHE = os.getenv("PROMPT_PREFIX_CACHE", "1") != "0"
+
+# Constrain generation to the two-field JSON object (GBNF grammar)
+LLM_JSON_GRAMMAR = os.getenv("LLM_JSON_GRAMMAR", "1") != "0"
+
+# Rules-first answers at or above this confidence skip the model (>1 disables)
+FAST_PATH_THRESHOLD = float(os.getenv("FAST_PATH_THRESHOLD", "0.9"))
+
+# /standardize queue: jobs collected per batch (duplicate texts in a batch share
+# one model call; distinct texts still run one at a time), how long to wait to
+# fill one, and pending jobs held (a request finding the queue full gets 429)
+BATCH_MAX_SIZE = int(os.getenv("BATCH_MAX_SIZE", "8"))
+BATCH_MAX_WAIT_MS = float(os.getenv("BATCH_MAX_WAIT_MS", "5"))
+BATCH_QUEUE_SIZE = int(os.getenv("BATCH_QUEUE_SIZE", "256"))
+# Seconds /standardize waits for one row's result before giving up with 504 (0 = no limit)
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "60"))
+# Rows of one streaming request allowed in the scheduler at once
+STREAM_WINDOW = int(os.getenv("STREAM_WINDOW", "16"))
+NDJSON_MIMETYPE = "application/x-ndjson"
+# --file CLI: JSONL lines written (and flushed) per batch
+CLI_WRITE_BATCH = int(os.getenv("CLI_WRITE_BATCH", "64"))
 
 CANON_UNIS_PATH = os.getenv("CANON_UNIS_PATH", "canon_universities.txt")
 CANON_PROGS_PATH = os.getenv("CANON_PROGS_PATH", "canon_programs.txt")
@@ -36,6 +114,16 @@ CANON_PROGS_PATH = os.getenv("CANON_PROGS_PATH", "canon_programs.txt")
 # Precompiled, non-greedy JSON object matcher to tolerate chatter around JSON
 JSON_OBJ_RE = re.compile(r"\{.*?\}", re.DOTALL)
 
+# Exactly {"standardized_program": "...", "standardized_university": "..."}
+RESULT_GBNF = r"""
+root       ::= "{" ws program "," ws university "}"
+program    ::= "\"standardized_program\"" ws ":" ws string ws
+university ::= "\"standardized_university\"" ws ":" ws string ws
+string     ::= "\"" char* "\""
+char       ::= [^"\\\x00-\x1F] | "\\" (["\\/bfnrt] | "u" [0-9a-fA-F] [0-9a-fA-F] [0-9a-fA-F] [0-9a-fA-F])
+ws         ::= " "?
+"""
+
 # ---------------- Canonical lists + abbrev maps ----------------
 def _read_lines(path: str) -> List[str]:
     """Read non-empty, stripped lines from a file (UTF-8)."""
@@ -46,8 +134,23 @@ def _read_lines(path: str) -> List[str]:
         return []
 
 
-CANON_UNIS = _read_lines(CANON_UNIS_PATH)
-CANON_PROGS = _read_lines(CANON_PROGS_PATH)
+# CANON_UNIS / CANON_PROGS and their set lookups + trigram-shortlisted fuzzy
+# matching (UNI_INDEX / PROG_INDEX), read from disk on first use
+_CANON: Dict[str, Any] = {}
+
+
+def _canon() -> Dict[str, Any]:
+    """Canonical lists and their CanonIndex lookups (built once)."""
+    if not _CANON:
+        unis, progs = _read_lines(CANON_UNIS_PATH), _read_lines(CANON_PROGS_PATH)
+        _CANON.update(
+            CANON_UNIS=unis,
+            CANON_PROGS=progs,
+            UNI_INDEX=CanonIndex(unis),
+            PROG_INDEX=CanonIndex(progs),
+        )
+    return _CANON
+
 
 ABBREV_UNI: Dict[str, str] = {
     r"(?i)^mcg(\.|ill)?$": "McGill University",
@@ -104,33 +207,189 @@ FEW_SHOTS: List[Tuple[Dict[str, str], Dict[str, str]]] = [
     ),
 ]
 
+
+def _chat_turn(role: str, content: str) -> str:
+    """One turn in the TinyLlama (zephyr) chat template."""
+    return f"<|{role}|>\n{content}</s>\n"
+
+
+def _build_prompt_prefix() -> str:
+    """System prompt and few-shot turns: identical for every row."""
+    turns = [_chat_turn("system", SYSTEM_PROMPT)]
+    for x_in, x_out in FEW_SHOTS:
+        turns.append(_chat_turn("user", json.dumps(x_in, ensure_ascii=False)))
+        turns.append(_chat_turn("assistant", json.dumps(x_out, ensure_ascii=False)))
+    return "".join(turns)
+
+
+def _prompt_suffix(program_text: str) -> str:
+    """Per-row user turn plus the assistant header the model completes."""
+    user = json.dumps({"program": program_text}, ensure_ascii=False)
+    return _chat_turn("user", user) + "<|assistant|>\n"
+
+
+PROMPT_PREFIX = _build_prompt_prefix()
+
 _LLM: Llama | None = None
+# Tokens and saved llama.cpp state of PROMPT_PREFIX for the loaded model
+_PREFIX: Dict[str, Any] = {"tokens": None, "state": None}
+_GRAMMAR: Dict[str, Any] = {"grammar": None}
+# Prompt tokens seen vs. served from the prefix state, generated tokens and
+# outputs that were not valid JSON
+_LLM_STATS: Dict[str, int] = {
+    "calls": 0,
+    "prompt_tokens": 0,
+    "prompt_tokens_reused": 0,
+    "completion_tokens": 0,
+    "parse_failures": 0,
+}
+_MODELS = ModelRegistry(
+    MODEL_DIRS,
+    model_path=MODEL_PATH,
+    expected_sha256=MODEL_SHA256,
+    allow_download=MODEL_ALLOW_DOWNLOAD,
+)
+
+# Opened / built by _cache() and _resolver() on first use
+_CACHE: ProgramCache | None = None
+_RESOLVER: RulesResolver | None = None
+_NORMALIZER: Normalizer | None = None
+
+
+def _cache_namespace() -> str:
+    """
+    Namespace of persisted results: model file, fast-path threshold and rules digest.
+
+    Both paths of ``_call_llm`` depend on the canonical lists, the fix and
+    abbreviation maps and the prompt, and the threshold picks between them,
+    so changing any of these starts a fresh namespace instead of serving
+    stale answers from the SQLite store.
+    """
+    canon = _canon()
+    rules = [canon["CANON_UNIS"], canon["CANON_PROGS"], ABBREV_UNI, COMMON_UNI_FIXES,
+             COMMON_PROG_FIXES, SYSTEM_PROMPT, FEW_SHOTS]
+    digest = hashlib.sha256(json.dumps(rules, ensure_ascii=False).encode("utf-8")).hexdigest()
+    return f"{MODEL_FILE}:{FAST_PATH_THRESHOLD:g}:{digest[:16]}"
+
+
+def _cache() -> ProgramCache:
+    """The program-text result cache, opened on first use."""
+    global _CACHE
+    if _CACHE is None:
+        _CACHE = ProgramCache(LLM_CACHE_PATH or None, LLM_CACHE_SIZE, namespace=_cache_namespace())
+    return _CACHE
+
+
+def _resolver() -> RulesResolver:
+    """The rules-first resolver over the canonical lists, built on first use."""
+    global _RESOLVER
+    if _RESOLVER is None:
+        canon = _canon()
+        _RESOLVER = RulesResolver(
+            canon["PROG_INDEX"],
+            canon["UNI_INDEX"],
+            ABBREV_UNI,
+            (COMMON_PROG_FIXES, COMMON_UNI_FIXES),
+        )
+    return _RESOLVER
 
 
 def _load_llm() -> Llama:
-    """Download (or reuse) the GGUF file and initialize llama.cpp."""
+    """Resolve the verified local GGUF file (see ModelRegistry) and initialize llama.cpp."""
     global _LLM
     if _LLM is not None:
         return _LLM
 
-    model_path = hf_hub_download(
-        repo_id=MODEL_REPO,
-        filename=MODEL_FILE,
-        local_dir="models",
-        local_dir_use_symlinks=False,
-        force_filename=MODEL_FILE,
-    )
+    from llama_cpp import Llama  # pylint: disable=import-outside-toplevel
+
+    model_path = _MODELS.resolve(MODEL_FILE, MODEL_REPO)
 
     _LLM = Llama(
         model_path=model_path,
         n_ctx=N_CTX,
         n_threads=N_THREADS,
         n_gpu_layers=N_GPU_LAYERS,
+        use_mmap=LLM_USE_MMAP,
+        use_mlock=LLM_USE_MLOCK,
         verbose=False,
     )
+    _PREFIX.update(tokens=None, state=None)
     return _LLM
 
 
+def _unload_llm() -> None:
+    """Drop the cached model (and its prefix state) so its memory is actually released."""
+    global _LLM
+    llm, _LLM = _LLM, None
+    _PREFIX.update(tokens=None, state=None)
+    if llm is not None and hasattr(llm, "close"):
+        llm.close()  # frees the llama.cpp context and model now, not at GC time
+    del llm
+    gc.collect()
+
+
+def _prefix_tokens(llm: Llama) -> List[int]:
+    """Evaluate PROMPT_PREFIX once for this model and keep its KV state."""
+    if _PREFIX["state"] is None:
+        tokens = llm.tokenize(PROMPT_PREFIX.encode("utf-8"), add_bos=True, special=True)
+        llm.reset()
+        llm.eval(tokens)
+        _PREFIX.update(tokens=tokens, state=llm.save_state())
+    return _PREFIX["tokens"]
+
+
+def _result_grammar() -> LlamaGrammar | None:
+    """Parsed RESULT_GBNF (built once), or None when constraints are disabled."""
+    if not LLM_JSON_GRAMMAR:
+        return None
+    if _GRAMMAR["grammar"] is None:
+        from llama_cpp import LlamaGrammar  # pylint: disable=import-outside-toplevel
+
+        _GRAMMAR["grammar"] = LlamaGrammar.from_string(RESULT_GBNF, verbose=False)
+    return _GRAMMAR["grammar"]
+
+
+def _context_match(llm: Llama, tokens: List[int]) -> int:
+    """Number of leading ``tokens`` already evaluated in the live llama.cpp context."""
+    # input_ids keeps stale values past n_tokens (e.g. after reset()), so only
+    # the first n_tokens entries describe the current context
+    live = llm.input_ids[: min(llm.n_tokens, len(tokens))].tolist()
+    shared = 0
+    for have, want in zip(live, tokens):
+        if have != want:
+            break
+        shared += 1
+    return shared
+
+
+def _complete_with_prefix(llm: Llama, program_text: str) -> Dict[str, Any]:
+    """
+    Complete one row, evaluating only the tokens after the shared prefix.
+
+    llama.cpp skips prompt tokens that match what is already in its context,
+    so the saved prefix state is restored whenever another prompt (or a
+    reset) has replaced it; the generation then only evaluates the per-row
+    suffix. Reused tokens are counted from the context llama.cpp will see.
+    """
+    prefix = _prefix_tokens(llm)
+    prompt = PROMPT_PREFIX + _prompt_suffix(program_text)
+    tokens = llm.tokenize(prompt.encode("utf-8"), add_bos=True, special=True)
+
+    if tokens[: len(prefix)] == prefix and _context_match(llm, prefix) < len(prefix):
+        llm.load_state(_PREFIX["state"])
+    # llama.cpp always re-evaluates the last prompt token to get its logits
+    _LLM_STATS["prompt_tokens_reused"] += min(_context_match(llm, tokens), len(tokens) - 1)
+
+    return llm.create_completion(
+        prompt=tokens,
+        temperature=0.0,
+        max_tokens=64,
+        top_p=1.0,
+        stop=["</s>"],
+        grammar=_result_grammar(),
+    )
+
+
 def _split_fallback(text: str) -> Tuple[str, str]:
     """Simple, rules-first parser if the model returns non-JSON."""
     s = re.sub(r"\s+", " ", (text or "")).strip().strip(",")
@@ -156,47 +415,29 @@ def _split_fallback(text: str) -> Tuple[str, str]:
     return prog, uni
 
 
-def _best_match(name: str, candidates: List[str], cutoff: float = 0.86) -> str | None:
-    """Fuzzy match via difflib (lightweight, Replit-friendly)."""
-    if not name or not candidates:
-        return None
-    matches = difflib.get_close_matches(name, candidates, n=1, cutoff=cutoff)
-    return matches[0] if matches else None
+def _normalizer() -> Normalizer:
+    """Compiled, memoized post-processing over the canonical lists, built on first use."""
+    global _NORMALIZER
+    if _NORMALIZER is None:
+        canon = _canon()
+        _NORMALIZER = Normalizer(
+            canon["PROG_INDEX"],
+            canon["UNI_INDEX"],
+            ABBREV_UNI,
+            (COMMON_PROG_FIXES, COMMON_UNI_FIXES),
+            cache_size=NORMALIZE_CACHE_SIZE,
+        )
+    return _NORMALIZER
 
 
 def _post_normalize_program(prog: str) -> str:
     """Apply common fixes, title case, then canonical/fuzzy mapping."""
-    p = (prog or "").strip()
-    p = COMMON_PROG_FIXES.get(p, p)
-    p = p.title()
-    if p in CANON_PROGS:
-        return p
-    match = _best_match(p, CANON_PROGS, cutoff=0.84)
-    return match or p
+    return _normalizer().program(prog)
 
 
 def _post_normalize_university(uni: str) -> str:
     """Expand abbreviations, apply common fixes, capitalization, and canonical map."""
-    u = (uni or "").strip()
-
-    # Abbreviations
-    for pat, full in ABBREV_UNI.items():
-        if re.fullmatch(pat, u):
-            u = full
-            break
-
-    # Common spelling fixes
-    u = COMMON_UNI_FIXES.get(u, u)
-
-    # Normalize 'Of' → 'of'
-    if u:
-        u = re.sub(r"\bOf\b", "of", u.title())
-
-    # Canonical or fuzzy map
-    if u in CANON_UNIS:
-        return u
-    match = _best_match(u, CANON_UNIS, cutoff=0.86)
-    return match or u or "Unknown"
+    return _normalizer().university(uni)
 
 
 def _validate_and_fix_results(
@@ -206,112 +447,105 @@ def _validate_and_fix_results(
 ) -> Tuple[str, str]:
     """
     Post-LLM validation to catch swapped fields or missing degree types.
-    
+
     Rules:
     - Program should have degree keyword (PhD, Masters, MS, MA, MBA, etc.)
     - University should NOT have degree keywords
     - If swapped, fix it
-    - Replace placeholder universities like "University of X" with "Unknown"
     - Infer degree type from original if missing
     """
-    degree_keywords = {
-        "phd",
-        "masters",
-        "master",
-        "ms",
-        "m.s.",
-        "ma",
-        "m.a.",
-        "msc",
-        "m.sc.",
-        "mba",
-        "m.b.a.",
-        "mfa",
-        "m.f.a.",
-        "meng",
-        "m.eng.",
-        "mtech",
-        "m.tech.",
-    }
+    return _normalizer().validate(prog, uni, original_text)
 
-    def has_degree_keyword(text: str) -> bool:
-        """Check if text contains a degree keyword."""
-        words = re.findall(r"\b[\w\.]+\b", text.lower())
-        return any(w in degree_keywords for w in words)
-
-    # Check current state
-    prog_has_degree = has_degree_keyword(prog)
-    uni_has_degree = has_degree_keyword(uni)
-
-    # Case 1: Fields are swapped (degree in uni, none in prog)
-    if uni_has_degree and not prog_has_degree:
-        prog, uni = uni, prog
-        prog_has_degree, uni_has_degree = True, False
-
-    # Case 2: No degree in program but original text has keywords
-    if not prog_has_degree and original_text:
-        # Try to infer degree type from original text
-        words = re.findall(r"\b[\w\.]+\b", original_text.lower())
-        for word in words:
-            if word in degree_keywords:
-                # Capitalize properly and append to prog
-                degree_str = word.replace(".", "").title()
-                if "ms" in word.lower() or "ma" in word.lower():
-                    degree_str = word.upper()
-                prog = f"{prog} {degree_str}".strip()
-                break
 
-    return prog, uni
+def _call_llm(program_text: str) -> Dict[str, Any]:
+    """
+    Return standardized fields, running the model only when rules are unsure.
+
+    Order: program-text cache, then the rules-first resolver (exact, abbreviation
+    and high-confidence fuzzy canonical matches), then llama.cpp. Results carry
+    the resolver's ``confidence`` and which path ``resolved_by`` produced them.
+    """
+    cache, resolver = _cache(), _resolver()
+    cached = cache.get(program_text)
+    if cached is not None:
+        return cached
+
+    resolution = resolver.resolve(program_text)
+    fast = resolution.confidence >= FAST_PATH_THRESHOLD
+    resolver.record(fast)
+    if fast:
+        result = _finalize_fields(resolution.program, resolution.university, program_text)
+    else:
+        result = _infer_llm(program_text)
+    result["confidence"] = round(resolution.confidence, 4)
+    result["resolved_by"] = "rules" if fast else "llm"
+
+    cache.put(program_text, result)
+    return result
 
 
-def _call_llm(program_text: str) -> Dict[str, str]:
+def _finalize_fields(std_prog: str, std_uni: str, program_text: str) -> Dict[str, Any]:
+    """Shared post-processing for rules-first and model answers."""
+    std_prog = _post_normalize_program(std_prog)
+    std_uni = _post_normalize_university(std_uni)
+
+    # Validate and fix any swapped or incorrect fields
+    std_prog, std_uni = _validate_and_fix_results(std_prog, std_uni, program_text)
+
+    return {
+        "standardized_program": std_prog,
+        "standardized_university": std_uni,
+    }
+
+
+def _infer_llm(program_text: str) -> Dict[str, str]:
     """Query the tiny LLM and return standardized fields."""
     llm = _load_llm()
 
-    messages = [{"role": "system", "content": SYSTEM_PROMPT}]
-    for x_in, x_out in FEW_SHOTS:
-        messages.append(
-            {"role": "user", "content": json.dumps(x_in, ensure_ascii=False)}
-        )
+    if PROMPT_PREFIX_CACHE:
+        out = _complete_with_prefix(llm, program_text)
+        text = (out["choices"][0]["text"] or "").strip()
+    else:
+        messages = [{"role": "system", "content": SYSTEM_PROMPT}]
+        for x_in, x_out in FEW_SHOTS:
+            messages.append(
+                {"role": "user", "content": json.dumps(x_in, ensure_ascii=False)}
+            )
+            messages.append(
+                {
+                    "role": "assistant",
+                    "content": json.dumps(x_out, ensure_ascii=False),
+                }
+            )
         messages.append(
             {
-                "role": "assistant",
-                "content": json.dumps(x_out, ensure_ascii=False),
+                "role": "user",
+                "content": json.dumps({"program": program_text}, ensure_ascii=False),
             }
         )
-    messages.append(
-        {
-            "role": "user",
-            "content": json.dumps({"program": program_text}, ensure_ascii=False),
-        }
-    )
 
-    out = llm.create_chat_completion(
-        messages=messages,
-        temperature=0.0,
-        max_tokens=64,  # Optimized for speed - JSON output is typically 50-60 tokens
-        top_p=1.0,
-    )
+        out = llm.create_chat_completion(
+            messages=messages,
+            temperature=0.0,
+            max_tokens=64,  # Optimized for speed - JSON output is typically 50-60 tokens
+            top_p=1.0,
+            grammar=_result_grammar(),
+        )
+        text = (out["choices"][0]["message"]["content"] or "").strip()
 
-    text = (out["choices"][0]["message"]["content"] or "").strip()
+    _LLM_STATS["calls"] += 1
+    _LLM_STATS["prompt_tokens"] += out["usage"]["prompt_tokens"]
+    _LLM_STATS["completion_tokens"] += out["usage"]["completion_tokens"]
     try:
         match = JSON_OBJ_RE.search(text)
         obj = json.loads(match.group(0) if match else text)
         std_prog = str(obj.get("standardized_program", "")).strip()
         std_uni = str(obj.get("standardized_university", "")).strip()
     except Exception:
+        _LLM_STATS["parse_failures"] += 1
         std_prog, std_uni = _split_fallback(program_text)
 
-    std_prog = _post_normalize_program(std_prog)
-    std_uni = _post_normalize_university(std_uni)
-    
-    # Validate and fix any swapped or incorrect fields
-    std_prog, std_uni = _validate_and_fix_results(std_prog, std_uni, program_text)
-    
-    return {
-        "standardized_program": std_prog,
-        "standardized_university": std_uni,
-    }
+    return _finalize_fields(std_prog, std_uni, program_text)
 
 
 def _normalize_input(payload: Any) -> List[Dict[str, Any]]:
@@ -323,60 +557,363 @@ def _normalize_input(payload: Any) -> List[Dict[str, Any]]:
     return []
 
 
-@app.get("/")
+# Single model-owning worker for HTTP traffic (started on the first request)
+_SCHEDULER = BatchScheduler(
+    lambda text: _call_llm(text),  # pylint: disable=unnecessary-lambda
+    max_batch=BATCH_MAX_SIZE,
+    max_wait=BATCH_MAX_WAIT_MS / 1000,
+    max_queue=BATCH_QUEUE_SIZE,
+)
+
+
 def health() -> Any:
     """Simple liveness check."""
+    from flask import jsonify  # pylint: disable=import-outside-toplevel
+
     return jsonify({"ok": True})
 
 
-@app.post("/standardize")
+def _llm_metrics() -> Dict[str, float]:
+    """Raw model counters plus parse-failure rate and mean generated tokens."""
+    stats: Dict[str, float] = dict(_LLM_STATS)
+    calls = stats["calls"]
+    stats["parse_failure_rate"] = stats["parse_failures"] / calls if calls else 0.0
+    stats["avg_completion_tokens"] = stats["completion_tokens"] / calls if calls else 0.0
+    return stats
+
+
+def metrics() -> Any:
+    """Cache, rules-first fast-path, prompt-token, batching and worker memory counters."""
+    from flask import jsonify  # pylint: disable=import-outside-toplevel
+
+    return jsonify({
+        "batching": _SCHEDULER.stats(),
+        "cache": _cache().stats(),
+        "fast_path": _resolver().stats(),
+        "llm": _llm_metrics(),
+        "memory": {"pid": os.getpid(), **smaps_rollup()},
+    })
+
+
+def _wants_stream() -> bool:
+    """Stream when asked via ?stream=1, an NDJSON body or an NDJSON Accept header."""
+    from flask import request  # pylint: disable=import-outside-toplevel
+
+    return (
+        request.args.get("stream", "").lower() in ("1", "true")
+        or request.mimetype == NDJSON_MIMETYPE
+        or NDJSON_MIMETYPE in request.headers.get("Accept", "")
+    )
+
+
+def _submit_row(row: Any) -> Future | None:
+    """Queue one streamed row (None for rows that are not JSON objects)."""
+    if not isinstance(row, dict):
+        return None
+    return _SCHEDULER.submit(row.get("program") or "")
+
+
+def _row_result(future: Future) -> Dict[str, Any]:
+    """Result of one queued row; raises FutureTimeout after LLM_TIMEOUT seconds."""
+    return future.result(timeout=LLM_TIMEOUT if LLM_TIMEOUT > 0 else None)
+
+
+def _finish_row(row: Any, future: Future | None) -> str:
+    """
+    Wait for one streamed row and render it as an NDJSON line.
+
+    FutureTimeout propagates so the stream can stop instead of waiting on a
+    stuck model once per remaining row.
+    """
+    if future is None:
+        out: Dict[str, Any] = {"error": "each row must be a JSON object", "row": row}
+    else:
+        try:
+            result = _row_result(future)
+            out = dict(
+                row,
+                **{
+                    "llm-generated-program": result["standardized_program"],
+                    "llm-generated-university": result["standardized_university"],
+                },
+            )
+        except FutureTimeout:
+            raise
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            out = dict(row, error=f"{type(e).__name__}: {e}")
+    return json.dumps(out, ensure_ascii=False) + "\n"
+
+
+def _stream_rows(
+    rows: Iterator[Any],
+    pending: Deque[Tuple[Any, Future | None]],
+) -> Iterator[str]:
+    """
+    Emit standardized rows in input order while reading the rest of the body.
+
+    At most STREAM_WINDOW rows are in flight; when the shared queue is full the
+    oldest row is drained first. If the client disconnects, or a row gets no
+    result within LLM_TIMEOUT (the stream then ends with an error line), every
+    queued row is cancelled, so the worker skips it.
+    """
+    try:
+        try:
+            for row in rows:
+                while True:
+                    try:
+                        pending.append((row, _submit_row(row)))
+                        break
+                    except QueueFullError:
+                        if not pending:
+                            time.sleep(0.01)
+                            continue
+                        yield _finish_row(*pending.popleft())
+                while len(pending) >= STREAM_WINDOW:
+                    yield _finish_row(*pending.popleft())
+        except ValueError as e:
+            while pending:
+                yield _finish_row(*pending.popleft())
+            yield json.dumps({"error": f"invalid input: {e}"}) + "\n"
+        while pending:
+            yield _finish_row(*pending.popleft())
+    except FutureTimeout:
+        yield json.dumps({"error": f"no result within {LLM_TIMEOUT:g}s; stream aborted"}) + "\n"
+    finally:
+        for _, future in pending:
+            if future is not None:
+                future.cancel()
+
+
+def _standardize_stream() -> Any:
+    """Chunked NDJSON response for an NDJSON or JSON-array body."""
+    # pylint: disable=import-outside-toplevel
+    from flask import Response, jsonify, request, stream_with_context
+
+    rows = iter_json_rows(request.stream)
+    pending: Deque[Tuple[Any, Future | None]] = deque()
+    try:
+        first = next(rows, None)
+        if first is not None:
+            pending.append((first, _submit_row(first)))
+    except ValueError as e:
+        return jsonify({"error": f"invalid input: {e}"}), 400
+    except QueueFullError as e:
+        return jsonify({"error": str(e)}), 429, {"Retry-After": "1"}
+
+    return Response(stream_with_context(_stream_rows(rows, pending)), mimetype=NDJSON_MIMETYPE)
+
+
+def _submit_window(texts: List[str]) -> List[Future]:
+    """Queue as many of ``texts`` as the shared queue has room for (at least one)."""
+    return _SCHEDULER.submit_many(texts[: max(1, _SCHEDULER.free_slots())])
+
+
 def standardize() -> Any:
-    """Standardize rows from an HTTP request and return JSON."""
+    """
+    Standardize rows from an HTTP request and return JSON (or stream NDJSON).
+
+    Rows are queued in windows that fit the free queue capacity, so a payload
+    larger than BATCH_QUEUE_SIZE is still answered; 429 means the queue was
+    already full before any row of this request got in.
+    """
+    from flask import jsonify, request  # pylint: disable=import-outside-toplevel
+
+    if _wants_stream():
+        return _standardize_stream()
+
     payload = request.get_json(force=True, silent=True)
     rows = _normalize_input(payload)
+    texts = [(row or {}).get("program") or "" for row in rows]
+
+    done = 0
+    while done < len(rows):
+        try:
+            futures = _submit_window(texts[done:])
+        except QueueFullError as e:
+            if not done:
+                return jsonify({"error": str(e)}), 429, {"Retry-After": "1"}
+            time.sleep(0.01)  # other requests took the room; wait for the worker
+            continue
+        for row, future in zip(rows[done:], futures):
+            try:
+                result = _row_result(future)
+            except FutureTimeout:
+                for pending in futures:
+                    pending.cancel()
+                return jsonify({"error": f"no result within {LLM_TIMEOUT:g}s"}), 504
+            row["llm-generated-program"] = result["standardized_program"]
+            row["llm-generated-university"] = result["standardized_university"]
+        done += len(futures)
+
+    return jsonify({"rows": rows})
+
+
+_APP: Dict[str, Any] = {"app": None}
+
+
+def _create_app() -> Any:
+    """The Flask app serving the routes above (created once, on first use)."""
+    if _APP["app"] is None:
+        from flask import Flask  # pylint: disable=import-outside-toplevel
+
+        flask_app = Flask(__name__)
+        flask_app.add_url_rule("/", view_func=health, methods=["GET"])
+        flask_app.add_url_rule("/metrics", view_func=metrics, methods=["GET"])
+        flask_app.add_url_rule("/standardize", view_func=standardize, methods=["POST"])
+        _APP["app"] = flask_app
+    return _APP["app"]
+
+
+def __getattr__(name: str) -> Any:
+    """Resolve ``app`` and the canonical lists/indexes lazily (PEP 562)."""
+    if name == "app":
+        return _create_app()
+    if name in ("CANON_UNIS", "CANON_PROGS", "UNI_INDEX", "PROG_INDEX"):
+        return _canon()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _row_key(row: Any) -> str | None:
+    """Resume key of an input row: its ``id``, else its ``url`` (None if it has neither)."""
+    if not isinstance(row, dict):
+        return None
+    key = row.get("id", row.get("url"))
+    return None if key in (None, "") else str(key)
 
-    out: List[Dict[str, Any]] = []
+
+def _done_keys(out_path: str) -> Set[str]:
+    """
+    Keys of the rows already written to a JSONL output file.
+
+    An unterminated last line (the run was killed mid-write) is cut off, so
+    appended rows start on a fresh line.
+    """
+    keys: Set[str] = set()
+    try:
+        with open(out_path, "r+b") as f:
+            good = 0
+            for line in f:
+                if not line.endswith(b"\n"):
+                    f.truncate(good)
+                    break
+                good += len(line)
+                try:
+                    key = _row_key(json.loads(line))
+                except ValueError:
+                    continue
+                if key is not None:
+                    keys.add(key)
+    except FileNotFoundError:
+        pass
+    return keys
+
+
+def _iter_input_rows(f: BinaryIO) -> Iterator[Any]:
+    """Stream rows from a JSON array, NDJSON or a ``{'rows': [...]}`` file."""
+    rows = iter_json_rows(f)
+    first = next(rows, None)
+    if isinstance(first, dict) and isinstance(first.get("rows"), list):
+        yield from first["rows"]
+        return
+    if first is not None:
+        yield first
+    yield from rows
+
+
+def _pending_rows(rows: Iterable[Any], done: Set[str]) -> Iterator[Any]:
+    """Rows whose key is not in ``done`` (which also collects the keys seen now)."""
     for row in rows:
-        program_text = (row or {}).get("program") or ""
-        result = _call_llm(program_text)
-        row["llm-generated-program"] = result["standardized_program"]
-        row["llm-generated-university"] = result["standardized_university"]
-        out.append(row)
+        key = _row_key(row)
+        if key is not None:
+            if key in done:
+                continue
+            done.add(key)
+        yield row
 
-    return jsonify({"rows": out})
 
+def _standardize_rows(rows: Iterable[Any], workers: int) -> Iterator[Tuple[Any, Dict[str, Any]]]:
+    """
+    Pair each row with its ``_call_llm`` result, in input order.
 
-def _cli_process_file(
+    With ``workers`` > 1 the rows fan out to a pool of forked model processes
+    (see worker_pool); rows that fail there take the rules-first fallback.
+    """
+    if workers <= 1:
+        for row in rows:
+            yield row, _call_llm((row or {}).get("program") or "")
+        return
+
+    try:  # worker_pool imports this module, so it is imported on use
+        from .worker_pool import iter_standardized  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        from worker_pool import iter_standardized  # pylint: disable=import-outside-toplevel
+
+    pending: Dict[int, Any] = {}
+
+    def items() -> Iterator[Tuple[int, str]]:
+        for idx, row in enumerate(rows):
+            pending[idx] = row
+            yield idx, (row or {}).get("program") or ""
+
+    for idx, result, error in iter_standardized(items(), workers):
+        row = pending.pop(idx)
+        if result is None:
+            print(f"[cli] row {idx}: {error}; using fallback", file=sys.stderr)
+            prog, uni = _split_fallback((row or {}).get("program") or "")
+            result = {"standardized_program": prog, "standardized_university": uni}
+        yield row, result
+
+
+def _cli_process_file(  # pylint: disable=too-many-arguments,too-many-positional-arguments
     in_path: str,
     out_path: str | None,
     append: bool,
     to_stdout: bool,
-) -> None:
-    """Process a JSON file and write JSONL incrementally."""
-    with open(in_path, "r", encoding="utf-8") as f:
-        rows = _normalize_input(json.load(f))
+    workers: int = 1,
+    batch_size: int = CLI_WRITE_BATCH,
+) -> int:
+    """
+    Stream a JSON/NDJSON file through the standardizer and write JSONL in batches.
 
-    sink = sys.stdout if to_stdout else None
+    With ``append`` the rows whose ``id`` (or ``url``) is already in the output
+    are skipped, so a re-run after an interruption only processes the rest.
+    Lines are written and flushed every ``batch_size`` rows (and on exit); an
+    interrupted batch is recomputed from the result cache on the next run.
+    Returns the number of rows written.
+    """
+    done: Set[str] = set()
     if not to_stdout:
         out_path = out_path or (in_path + ".jsonl")
-        mode = "a" if append else "w"
-        sink = open(out_path, mode, encoding="utf-8")
-
-    assert sink is not None  # for type-checkers
-
-    try:
-        for row in rows:
-            program_text = (row or {}).get("program") or ""
-            result = _call_llm(program_text)
-            row["llm-generated-program"] = result["standardized_program"]
-            row["llm-generated-university"] = result["standardized_university"]
-
-            json.dump(row, sink, ensure_ascii=False)
-            sink.write("\n")
-            sink.flush()
-    finally:
-        if sink is not sys.stdout:
-            sink.close()
+        if append:
+            done = _done_keys(out_path)
+            if done:
+                print(f"[cli] resuming: {len(done)} rows already in {out_path}", file=sys.stderr)
+
+    written = 0
+    with open(in_path, "rb") as f:
+        if to_stdout:
+            sink: TextIO = sys.stdout
+        else:
+            sink = open(out_path, "a" if append else "w", encoding="utf-8")
+        lines: List[str] = []
+        try:
+            for row, result in _standardize_rows(_pending_rows(_iter_input_rows(f), done), workers):
+                row["llm-generated-program"] = result["standardized_program"]
+                row["llm-generated-university"] = result["standardized_university"]
+                lines.append(json.dumps(row, ensure_ascii=False) + "\n")
+                if len(lines) >= max(1, batch_size):
+                    sink.write("".join(lines))
+                    sink.flush()
+                    written += len(lines)
+                    lines.clear()
+        finally:
+            if lines:
+                sink.write("".join(lines))
+                sink.flush()
+                written += len(lines)
+            if sink is not sys.stdout:
+                sink.close()
+    return written
 
 
 if __name__ == "__main__":
@@ -395,6 +932,13 @@ if __name__ == "__main__":
         action="store_true",
         help="Run the HTTP server instead of CLI.",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=SERVE_WORKERS,
+        help="Processes sharing the model. With --serve: HTTP workers forked after "
+        "loading it; with --file: a pool of model processes.",
+    )
     parser.add_argument(
         "--out",
         default=None,
@@ -404,7 +948,13 @@ if __name__ == "__main__":
     parser.add_argument(
         "--append",
         action="store_true",
-        help="Append to the output file instead of overwriting.",
+        help="Append to the output file, skipping rows whose id/url it already holds.",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=CLI_WRITE_BATCH,
+        help="JSONL lines written and flushed at a time.",
     )
     parser.add_argument(
         "--stdout",
@@ -415,11 +965,16 @@ if __name__ == "__main__":
 
     if args.serve or args.file is None:
         port = int(os.getenv("PORT", "8000"))
-        app.run(host="0.0.0.0", port=port, debug=False)
+        if args.workers > 1:
+            serve_prefork(_create_app(), "0.0.0.0", port, args.workers, preload=_load_llm)
+        else:
+            _create_app().run(host="0.0.0.0", port=port, debug=False)
     else:
         _cli_process_file(
             in_path=args.file,
             out_path=args.out,
             append=bool(args.append),
             to_stdout=bool(args.stdout),
+            workers=args.workers,
+            batch_size=args.batch_size,
         )
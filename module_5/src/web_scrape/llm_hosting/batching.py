@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+"""
+Request queue with coalescing: one worker thread owns the model for all HTTP clients.
+
+Jobs are grouped into batches, but a batch is not run as one batched
+inference: identical texts in a batch share a single handler call, and
+distinct texts still go through the handler one at a time.
+"""
+
+from __future__ import annotations
+
+import os
+import queue
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Deque, Dict, List, Tuple
+
+try:
+    from stats_utils import PERCENTILES, percentile
+except ImportError:  # executed as a script: python app.py (src is not on the path)
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+    from stats_utils import PERCENTILES, percentile
+
+# (program text, future, enqueue time)
+_Job = Tuple[str, Future, float]
+
+
+class QueueFullError(RuntimeError):
+    """Raised by ``submit``/``submit_many`` when the queue cannot take the work."""
+
+
+class BatchScheduler:  # pylint: disable=too-many-instance-attributes
+    """
+    Serializes model work from concurrent requests through a bounded queue.
+
+    A single daemon worker (started on first use) owns the model: it takes the
+    first queued job, then keeps collecting until ``max_batch`` jobs or
+    ``max_wait`` seconds have passed, runs ``handler`` sequentially, once per
+    distinct program text in the batch, and resolves every job's future. The
+    batch window only removes duplicate model calls; it does not batch the
+    inference itself. Submissions that do not fit in ``max_queue`` raise
+    ``QueueFullError`` so the HTTP layer can answer 429. Cancelled futures are
+    skipped before any model work.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[str], Dict[str, Any]],
+        max_batch: int = 8,
+        max_wait: float = 0.005,
+        max_queue: int = 256,
+    ) -> None:
+        self.handler = handler
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max(0.0, max_wait)
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, max_queue))
+        self._lock = threading.Lock()
+        self._worker: threading.Thread | None = None
+        self._counts = {"submitted": 0, "rejected": 0, "cancelled": 0,
+                        "batches": 0, "batched_jobs": 0, "max_queue_depth": 0}
+        self._waits: Deque[float] = deque(maxlen=1000)
+        self._latencies: Deque[float] = deque(maxlen=1000)
+
+    def start(self) -> None:
+        """Start the worker thread if it is not running yet."""
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._run, name="llm-batch-worker", daemon=True
+                )
+                self._worker.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Finish queued work, then stop the worker."""
+        if self._worker is not None:
+            self._queue.put(None)
+            self._worker.join(timeout)
+            self._worker = None
+
+    def submit(self, program_text: str) -> Future:
+        """Queue one program text; raises QueueFullError when the queue is full."""
+        return self.submit_many([program_text])[0]
+
+    def free_slots(self) -> int:
+        """Jobs the queue can take right now."""
+        return max(0, self._queue.maxsize - self._queue.qsize())
+
+    def submit_many(self, program_texts: List[str]) -> List[Future]:
+        """
+        Queue every text of one request, or none of them.
+
+        If the queue fills part-way, the futures already queued for this
+        request are cancelled (the worker drops them) and QueueFullError is
+        raised.
+        """
+        self.start()
+        futures: List[Future] = []
+        now = time.perf_counter()
+        try:
+            for text in program_texts:
+                future: Future = Future()
+                self._queue.put_nowait((text, future, now))
+                futures.append(future)
+        except queue.Full as e:
+            for future in futures:
+                future.cancel()
+            with self._lock:
+                self._counts["rejected"] += 1
+            raise QueueFullError(f"queue full ({self._queue.maxsize} pending)") from e
+
+        with self._lock:
+            self._counts["submitted"] += len(futures)
+            self._counts["max_queue_depth"] = max(
+                self._counts["max_queue_depth"], self._queue.qsize()
+            )
+        return futures
+
+    def _next_batch(self) -> List[_Job] | None:
+        """Block for one job, then gather more until the batch is full or max_wait passes."""
+        first = self._queue.get()
+        if first is None:
+            return None
+        batch = [first]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            try:
+                if remaining > 0:
+                    job = self._queue.get(timeout=remaining)
+                else:
+                    job = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if job is None:  # stop requested: finish this batch first
+                self._queue.put(None)
+                break
+            batch.append(job)
+        return batch
+
+    def _run(self) -> None:
+        """Worker loop: run batches until ``stop``."""
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            self._process(batch)
+
+    def _process(self, batch: List[_Job]) -> None:
+        """Run the handler once per distinct text, in order, and resolve the live futures."""
+        started = time.perf_counter()
+        live = [job for job in batch if job[1].set_running_or_notify_cancel()]
+
+        outcomes: Dict[str, Tuple[Dict[str, Any] | None, BaseException | None]] = {}
+        for text, _, _ in live:
+            if text not in outcomes:
+                try:
+                    outcomes[text] = (self.handler(text), None)
+                except Exception as e:  # pylint: disable=broad-exception-caught
+                    outcomes[text] = (None, e)
+
+        finished = time.perf_counter()
+        for text, future, _ in live:
+            result, error = outcomes[text]
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(dict(result))
+
+        with self._lock:
+            for _, _, enqueued in live:
+                self._waits.append((started - enqueued) * 1000)
+                self._latencies.append((finished - enqueued) * 1000)
+            self._counts["batches"] += 1
+            self._counts["batched_jobs"] += len(live)
+            self._counts["cancelled"] += len(batch) - len(live)
+
+    def stats(self) -> Dict[str, float]:
+        """Queue depth, batch sizes, rejections and wait/latency percentiles (ms)."""
+        with self._lock:
+            stats: Dict[str, float] = dict(self._counts)
+            waits, latencies = sorted(self._waits), sorted(self._latencies)
+        stats["queue_depth"] = self._queue.qsize()
+        stats["avg_batch_size"] = (
+            stats["batched_jobs"] / stats["batches"] if stats["batches"] else 0.0
+        )
+        for pct in PERCENTILES:
+            stats[f"wait_p{pct}_ms"] = percentile(waits, pct)
+            stats[f"latency_p{pct}_ms"] = percentile(latencies, pct)
+        return stats
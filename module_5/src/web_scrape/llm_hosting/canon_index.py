@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""Prebuilt canonical-name index: set lookups plus a trigram-shortlisted fuzzy match."""
+
+from __future__ import annotations
+
+import heapq
+from collections import Counter, defaultdict
+from difflib import SequenceMatcher
+from typing import Dict, Iterable, List, Tuple
+
+# Gram size and the padding character (never present in real names)
+Q = 3
+_PAD = "\x00" * (Q - 1)
+# Slack so float rounding at the cutoff never drops a candidate difflib keeps
+_EPS = 1e-9
+
+
+def _grams(text: str) -> Counter:
+    """Multiset of padded character trigrams."""
+    padded = f"{_PAD}{text}{_PAD}"
+    return Counter(padded[i:i + Q] for i in range(len(padded) - Q + 1))
+
+
+def _min_shared_grams(len_a: int, len_b: int, cutoff: float) -> float:
+    """
+    Lower bound on padded trigrams two strings must share to reach ``cutoff``.
+
+    ``SequenceMatcher.ratio()`` is ``2*M / (len_a + len_b)`` for ``M`` matched
+    characters in non-crossing blocks. Each unmatched character of ``a`` can
+    spoil at most ``Q`` of its grams and each gap in the match on the ``b`` side
+    at most ``Q - 1``, so at least ``len_a + Q - 1 - Q*(len_a - M) -
+    (Q - 1)*(len_b - M)`` grams of ``a`` survive; the bound holds from either
+    side, so the larger of the two is used.
+    """
+    matched = cutoff * (len_a + len_b) / 2
+    from_a = len_a + Q - 1 - Q * (len_a - matched) - (Q - 1) * (len_b - matched)
+    from_b = len_b + Q - 1 - Q * (len_b - matched) - (Q - 1) * (len_a - matched)
+    return max(from_a, from_b)
+
+
+class CanonIndex:
+    """
+    Canonical names with O(1) exact lookups and shortlisted fuzzy matching.
+
+    ``close_matches`` returns exactly what ``difflib.get_close_matches`` returns
+    over the same list, but instead of scoring every candidate it first drops
+    those whose length or shared-trigram count rules out reaching ``cutoff``
+    (see ``_min_shared_grams``); only the survivors go through the usual
+    real_quick/quick/full ratio checks.
+    """
+
+    def __init__(self, names: Iterable[str]) -> None:
+        self.names: List[str] = list(names)
+        self._exact = frozenset(self.names)
+        self._gram_sets = [frozenset(_grams(name)) for name in self.names]
+        self._by_length: Dict[int, List[int]] = defaultdict(list)
+        self._postings: Dict[str, List[int]] = defaultdict(list)
+        for idx, name in enumerate(self.names):
+            self._by_length[len(name)].append(idx)
+            for gram in self._gram_sets[idx]:
+                self._postings[gram].append(idx)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._exact
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _requirements(self, word: str, cutoff: float) -> Dict[int, float]:
+        """Shared grams needed per candidate length that passes the length filter."""
+        needs: Dict[int, float] = {}
+        for length in self._by_length:
+            # Length filter: same bound as SequenceMatcher.real_quick_ratio()
+            total = length + len(word)
+            if total and 2 * min(length, len(word)) < cutoff * total - _EPS:
+                continue
+            needs[length] = _min_shared_grams(len(word), length, cutoff) - _EPS
+        return needs
+
+    def _shortlist(self, word: str, cutoff: float) -> List[int]:
+        """Candidate positions (in list order) that could reach ``cutoff``."""
+        needs = self._requirements(word, cutoff)
+        keep = [idx for length, need in needs.items() if need <= 0
+                for idx in self._by_length[length]]
+
+        strict = [need for need in needs.values() if need > 0]
+        if strict:
+            query = _grams(word)
+            # Prefix filter: probe the rarest grams until the remaining ones
+            # cannot reach the smallest requirement on their own, so every
+            # qualifying candidate appears in at least one probed posting list.
+            remaining = sum(query.values())
+            seen = set()
+            for gram in sorted(query, key=lambda g: len(self._postings.get(g, ()))):
+                if remaining < min(strict):
+                    break
+                remaining -= query[gram]
+                seen.update(self._postings.get(gram, ()))
+
+            # Shared grams are at most the distinct overlap plus the query's
+            # repeated grams, which keeps the check a C-level set intersection
+            repeats = sum(query.values()) - len(query)
+            for idx in seen:
+                need = needs.get(len(self.names[idx]), 0.0)
+                if 0 < need <= len(query.keys() & self._gram_sets[idx]) + repeats:
+                    keep.append(idx)
+        keep.sort()
+        return keep
+
+    def close_matches(self, word: str, n: int = 3, cutoff: float = 0.6) -> List[str]:
+        """Drop-in equivalent of ``difflib.get_close_matches(word, names, n, cutoff)``."""
+        if n <= 0:
+            raise ValueError(f"n must be > 0: {n!r}")
+        if not 0.0 <= cutoff <= 1.0:
+            raise ValueError(f"cutoff must be in [0.0, 1.0]: {cutoff!r}")
+        return [name for _, name in self.scored_matches(word, n, cutoff)]
+
+    def scored_matches(self, word: str, n: int = 3, cutoff: float = 0.6) -> List[Tuple[float, str]]:
+        """Like ``close_matches`` but returns ``(ratio, name)`` pairs, best first."""
+        result = []
+        s = SequenceMatcher()
+        s.set_seq2(word)
+        for idx in self._shortlist(word, cutoff):
+            s.set_seq1(self.names[idx])
+            if (s.real_quick_ratio() >= cutoff
+                    and s.quick_ratio() >= cutoff
+                    and s.ratio() >= cutoff):
+                result.append((s.ratio(), self.names[idx]))
+        return heapq.nlargest(n, result)
+
+    def best_match(self, word: str, cutoff: float) -> Tuple[str | None, float]:
+        """Best fuzzy match at ``cutoff`` with its similarity ratio, or (None, 0.0)."""
+        if not word or not self.names:
+            return None, 0.0
+        top = self.scored_matches(word, 1, cutoff)
+        return (top[0][1], top[0][0]) if top else (None, 0.0)
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""Incremental reader for NDJSON or JSON-array request bodies."""
+
+from __future__ import annotations
+
+import codecs
+import json
+from typing import Any, BinaryIO, Iterator
+
+_DECODER = json.JSONDecoder()
+_SKIP = " \t\r\n,"
+
+
+def iter_json_rows(stream: BinaryIO, chunk_size: int = 64 * 1024) -> Iterator[Any]:
+    """
+    Yield rows from ``stream`` as soon as each one has been fully received.
+
+    Accepts a JSON array (``[{...}, {...}]``) or newline-delimited JSON
+    (``{...}\\n{...}``). Only the unparsed tail of the body is kept in memory.
+
+    :raises ValueError: If the body is not valid JSON of either shape.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    buf, pos, eof = "", 0, False
+    array: bool | None = None
+
+    while True:
+        while pos < len(buf) and buf[pos] in _SKIP:
+            pos += 1
+        if pos < len(buf):
+            if array is None:
+                array = buf[pos] == "["
+                pos += int(array)
+                continue
+            if array and buf[pos] == "]":
+                return
+            try:
+                row, end = _DECODER.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            else:
+                # A number cut at the chunk edge still decodes; wait for its end
+                if end < len(buf) or eof:
+                    yield row
+                    buf, pos = buf[end:], 0
+                    continue
+        elif eof:
+            if array:
+                raise ValueError("unterminated JSON array")
+            return
+
+        chunk = stream.read(chunk_size)
+        eof = not chunk
+        buf = buf[pos:] + decoder.decode(chunk or b"", final=eof)
+        pos = 0
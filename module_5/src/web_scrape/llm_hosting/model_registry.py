@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+"""Offline-first GGUF registry: local lookup by name or checksum, verified once, hub on opt-in."""
+
+from __future__ import annotations
+
+import glob
+import hashlib
+import json
+import os
+import threading
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
+
+# A git-lfs pointer stands in for the real file in checkouts without LFS; it is
+# never loadable, but its oid/size say which artifact we expect.
+LFS_POINTER_PREFIX = b"version https://git-lfs.github.com/spec/"
+LFS_POINTER_MAX_BYTES = 1024
+SIDECAR_SUFFIX = ".verified.json"
+_HASH_CHUNK = 1 << 20
+
+
+class ModelNotFoundError(FileNotFoundError):
+    """No verified local copy exists and hub downloads are not allowed."""
+
+
+def sha256_file(path: str) -> str:
+    """Hex SHA-256 of a file, read in 1 MiB chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def read_lfs_pointer(path: str) -> Dict[str, object] | None:
+    """``{"sha256", "size"}`` from a git-lfs pointer file, or None for anything else."""
+    try:
+        if os.path.getsize(path) > LFS_POINTER_MAX_BYTES:
+            return None
+        with open(path, "rb") as f:
+            head = f.read(LFS_POINTER_MAX_BYTES)
+    except OSError:
+        return None
+    if not head.startswith(LFS_POINTER_PREFIX):
+        return None
+    fields = dict(
+        line.split(" ", 1) for line in head.decode("utf-8", "replace").splitlines() if " " in line
+    )
+    oid, size = fields.get("oid", ""), fields.get("size", "")
+    if not oid.startswith("sha256:") or not size.isdigit():
+        return None
+    return {"sha256": oid[len("sha256:"):], "size": int(size)}
+
+
+def hub_download(repo_id: str, filename: str, local_dir: str) -> str:
+    """Fetch one file from the Hugging Face Hub (imported only when downloads are allowed)."""
+    from huggingface_hub import hf_hub_download  # pylint: disable=import-outside-toplevel
+
+    return hf_hub_download(repo_id=repo_id, filename=filename, local_dir=local_dir)
+
+
+class ModelRegistry:  # pylint: disable=too-many-instance-attributes
+    """
+    Resolves a GGUF file from configured directories without touching the network.
+
+    Candidates are an explicit ``model_path``, then ``<dir>/<model_file>`` for
+    each search directory, then (when the expected checksum is known) any other
+    ``*.gguf`` in those directories with that checksum. The expected SHA-256
+    and size come from ``expected_sha256`` or from a git-lfs pointer found in
+    place of the file. A candidate is hashed once: the result is stored in a
+    ``<file>.verified.json`` sidecar keyed on size and mtime, so later starts
+    only ``stat`` the file. The hub is contacted only when ``allow_download``.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self,
+        search_dirs: Iterable[str],
+        model_path: str = "",
+        expected_sha256: str = "",
+        allow_download: bool = False,
+        download_dir: str = "models",
+        download: Callable[[str, str, str], str] = hub_download,
+    ) -> None:
+        self.search_dirs = [d for d in search_dirs if d]
+        self.model_path = model_path
+        self.expected_sha256 = expected_sha256.lower()
+        self.allow_download = allow_download
+        self.download_dir = download_dir
+        self.download = download
+        self._lock = threading.Lock()
+        self._resolved: Dict[str, str] = {}
+
+    def _named(self, model_file: str) -> List[str]:
+        """Explicit path first, then the file name in each search directory."""
+        paths = [self.model_path] if self.model_path else []
+        paths += [os.path.join(d, model_file) for d in self.search_dirs]
+        return list(dict.fromkeys(os.path.abspath(p) for p in paths))
+
+    def _expected(self, named: List[str]) -> Tuple[str, int | None]:
+        """Expected (sha256, size): configured checksum, else the first LFS pointer."""
+        for path in named:
+            pointer = read_lfs_pointer(path)
+            if pointer is not None:
+                if self.expected_sha256 and self.expected_sha256 != pointer["sha256"]:
+                    return self.expected_sha256, None
+                return str(pointer["sha256"]), int(pointer["size"])  # type: ignore[arg-type]
+        return self.expected_sha256, None
+
+    def _by_checksum(self, named: List[str]) -> Iterator[str]:
+        """Other ``*.gguf`` files in the search directories (renamed copies)."""
+        for directory in self.search_dirs:
+            for path in sorted(glob.glob(os.path.join(directory, "*.gguf"))):
+                path = os.path.abspath(path)
+                if path not in named:
+                    yield path
+
+    def file_sha256(self, path: str) -> str:
+        """SHA-256 of ``path``, reusing its sidecar while size and mtime are unchanged."""
+        st = os.stat(path)
+        sidecar = path + SIDECAR_SUFFIX
+        try:
+            with open(sidecar, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+            if cached.get("size") == st.st_size and cached.get("mtime_ns") == st.st_mtime_ns:
+                return str(cached["sha256"])
+        except (OSError, ValueError, KeyError, AttributeError):
+            pass
+
+        digest = sha256_file(path)
+        record = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": digest}
+        try:
+            with open(sidecar, "w", encoding="utf-8") as f:
+                json.dump(record, f)
+        except OSError:  # read-only model directory: verify again next start
+            pass
+        return digest
+
+    def verify(self, path: str, sha256: str = "", size: int | None = None) -> bool:
+        """True if ``path`` is a real model file matching the expected size and checksum."""
+        try:
+            actual_size = os.path.getsize(path)
+        except OSError:
+            return False
+        if size is not None and actual_size != size:
+            return False  # also rejects LFS pointers without hashing anything
+        if read_lfs_pointer(path) is not None:
+            return False
+        digest = self.file_sha256(path)
+        return not sha256 or digest == sha256
+
+    def resolve(self, model_file: str, repo_id: str = "") -> str:
+        """
+        Path of a verified local copy of ``model_file``, downloading it only if allowed.
+
+        Resolved paths are memoized, so reloading the model in the same process
+        costs nothing.
+        """
+        with self._lock:
+            if model_file in self._resolved:
+                return self._resolved[model_file]
+
+            named = self._named(model_file)
+            sha256, size = self._expected(named)
+            for path in named:
+                if self.verify(path, sha256, size):
+                    self._resolved[model_file] = path
+                    return path
+            if sha256:
+                for path in self._by_checksum(named):
+                    if self.verify(path, sha256, size):
+                        self._resolved[model_file] = path
+                        return path
+
+            if not self.allow_download:
+                raise ModelNotFoundError(
+                    f"{model_file} not found (or failed verification) in "
+                    f"{', '.join(named) or 'no search paths'}; set MODEL_ALLOW_DOWNLOAD=1 "
+                    "to fetch it from the hub"
+                )
+            path = os.path.abspath(self.download(repo_id, model_file, self.download_dir))
+            if not self.verify(path, sha256, size):
+                raise ModelNotFoundError(f"downloaded {path} does not match sha256 {sha256}")
+            self._resolved[model_file] = path
+            return path
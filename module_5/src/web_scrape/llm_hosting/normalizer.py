@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""Compiled, memoized post-processing of standardized program/university names."""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, Mapping, Tuple
+
+try:
+    from .canon_index import CanonIndex
+except ImportError:  # executed as a script: python app.py
+    from canon_index import CanonIndex
+
+# Degree keywords ``_validate_and_fix_results`` looks for, as whole tokens
+DEGREE_KEYWORDS = frozenset({
+    "phd", "masters", "master", "ms", "m.s.", "ma", "m.a.", "msc", "m.sc.",
+    "mba", "m.b.a.", "mfa", "m.f.a.", "meng", "m.eng.", "mtech", "m.tech.",
+})
+
+OF_RE = re.compile(r"\bOf\b")
+_GLOBAL_FLAGS_RE = re.compile(r"^\(\?([aiLmsux]+)\)")
+
+
+def compile_keywords(keywords: Iterable[str]) -> re.Pattern[str]:
+    """
+    One regex matching any keyword that forms a whole token of lowercased text.
+
+    A token is a run of ``[\\w.]`` with its leading and trailing dots dropped,
+    the same tokens ``re.findall(r"\\b[\\w\\.]+\\b", text)`` yields, so group 1
+    of the first match is the first keyword token. Keywords that end in a dot
+    can never equal such a token and are left out.
+    """
+    words = sorted((k for k in keywords if not k.endswith(".")), key=len, reverse=True)
+    alternation = "|".join(re.escape(k) for k in words) or "(?!)"
+    return re.compile(rf"(?<![\w.])\.*({alternation})\.*(?![\w.])")
+
+
+class AbbreviationMatcher:  # pylint: disable=too-few-public-methods
+    """
+    Full-match a name against many abbreviation patterns with a single regex.
+
+    The patterns are joined into one alternation of named groups (leading
+    global flags such as ``(?i)`` become scoped groups), so the first pattern
+    in ``abbreviations`` order that matches wins, as with a loop over them.
+    """
+
+    def __init__(self, abbreviations: Mapping[str, str]) -> None:
+        self._full: Dict[str, str] = {}
+        branches = []
+        for i, (pattern, full) in enumerate(abbreviations.items()):
+            flags = _GLOBAL_FLAGS_RE.match(pattern)
+            body = pattern[flags.end():] if flags else pattern
+            scoped = f"(?{flags.group(1)}:{body})" if flags else f"(?:{body})"
+            branches.append(f"(?P<a{i}>{scoped})")
+            self._full[f"a{i}"] = full
+        self._regex = re.compile("|".join(branches) or "(?!)")
+
+    def expand(self, text: str) -> str | None:
+        """The full name for ``text``, or None when no pattern matches it whole."""
+        match = self._regex.fullmatch(text)
+        return self._full[match.lastgroup] if match and match.lastgroup else None
+
+
+class Normalizer:  # pylint: disable=too-many-instance-attributes
+    """
+    Post-processing shared by rules-first and model answers.
+
+    Everything is built once: the canonical indexes, one combined abbreviation
+    regex and one degree-keyword regex. ``program``, ``university`` and
+    ``validate`` are pure functions of their arguments, so each keeps an LRU
+    memo of ``cache_size`` recent inputs; repeated names (most of a scrape)
+    skip the fuzzy canonical match entirely.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self,
+        programs: CanonIndex,
+        universities: CanonIndex,
+        abbreviations: Mapping[str, str],
+        fixes: Tuple[Mapping[str, str], Mapping[str, str]],
+        cache_size: int = 4096,
+        keywords: Iterable[str] = DEGREE_KEYWORDS,
+    ) -> None:
+        self.programs = programs
+        self.universities = universities
+        self.abbreviations = AbbreviationMatcher(abbreviations)
+        self.prog_fixes, self.uni_fixes = fixes
+        self.keywords = compile_keywords(keywords)
+        self.program = lru_cache(maxsize=cache_size)(self._program)
+        self.university = lru_cache(maxsize=cache_size)(self._university)
+        self.validate = lru_cache(maxsize=cache_size)(self._validate)
+
+    def _program(self, prog: str) -> str:
+        """Apply common fixes, title case, then canonical/fuzzy mapping."""
+        p = (prog or "").strip()
+        p = self.prog_fixes.get(p, p).title()
+        if p in self.programs:
+            return p
+        return self.programs.best_match(p, 0.84)[0] or p
+
+    def _university(self, uni: str) -> str:
+        """Expand abbreviations, apply common fixes, capitalization, and canonical map."""
+        u = (uni or "").strip()
+        u = self.abbreviations.expand(u) or u
+        u = self.uni_fixes.get(u, u)
+        if u:
+            u = OF_RE.sub("of", u.title())
+        if u in self.universities:
+            return u
+        return self.universities.best_match(u, 0.86)[0] or u or "Unknown"
+
+    def degree_keyword(self, text: str) -> str | None:
+        """The first degree keyword token in ``text`` (lowercased), if any."""
+        match = self.keywords.search(text.lower())
+        return match.group(1) if match else None
+
+    def _validate(self, prog: str, uni: str, original_text: str = "") -> Tuple[str, str]:
+        """Swap fields when only the university names a degree; infer a missing degree."""
+        prog_has_degree = self.degree_keyword(prog) is not None
+        if not prog_has_degree and self.degree_keyword(uni) is not None:
+            prog, uni = uni, prog
+            prog_has_degree = True
+
+        if not prog_has_degree and original_text:
+            word = self.degree_keyword(original_text)
+            if word is not None:
+                degree_str = word.replace(".", "").title()
+                if "ms" in word or "ma" in word:
+                    degree_str = word.upper()
+                prog = f"{prog} {degree_str}".strip()
+
+        return prog, uni
+
+    def cache_info(self) -> Dict[str, Dict[str, int]]:
+        """LRU hit/miss counters of each memoized step."""
+        return {
+            name: getattr(self, name).cache_info()._asdict()
+            for name in ("program", "university", "validate")
+        }
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""Pre-fork HTTP serving: N worker processes sharing one copy of the model weights."""
+
+from __future__ import annotations
+
+import gc
+import os
+import signal
+import socket
+import sys
+from typing import Any, Callable, Dict, Iterable, List
+
+# smaps_rollup fields reported per worker (kB in the file, MiB in the report)
+SMAPS_FIELDS = ("Rss", "Pss", "Shared_Clean", "Shared_Dirty", "Private_Clean",
+                "Private_Dirty", "Anonymous", "Locked")
+
+
+def smaps_rollup(pid: int | str = "self") -> Dict[str, float]:
+    """
+    Memory of one process from ``/proc/<pid>/smaps_rollup`` in MiB (Linux 4.14+).
+
+    ``Pss`` splits every shared page between the processes mapping it, so the
+    sum of ``Pss`` over the workers is what they really cost together; ``Rss``
+    counts the shared model weights in full for every worker. Returns {} where
+    the file does not exist.
+    """
+    report: Dict[str, float] = {}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup", "r", encoding="ascii") as f:
+            for line in f:
+                name, _, value = line.partition(":")
+                if name in SMAPS_FIELDS:
+                    report[name] = round(int(value.split()[0]) / 1024, 1)
+    except (OSError, ValueError, IndexError):
+        return {}
+    return report
+
+
+def memory_report(pids: Iterable[int]) -> Dict[str, Any]:
+    """Per-worker smaps_rollup plus the summed RSS and PSS of all workers."""
+    workers = {str(pid): smaps_rollup(pid) for pid in pids}
+    return {
+        "workers": workers,
+        "total_rss_mb": round(sum(w.get("Rss", 0.0) for w in workers.values()), 1),
+        "total_pss_mb": round(sum(w.get("Pss", 0.0) for w in workers.values()), 1),
+    }
+
+
+def _serve_worker(sock: socket.socket, app: Any, host: str, port: int) -> None:
+    """Child process: serve requests from the inherited listening socket until killed."""
+    from werkzeug.serving import make_server  # pylint: disable=import-outside-toplevel
+
+    signal.signal(signal.SIGTERM, lambda *args: sys.exit(0))
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    server = make_server(host, port, app, threaded=True, fd=sock.fileno())
+    server.serve_forever()
+
+
+def serve_prefork(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    app: Any,
+    host: str,
+    port: int,
+    workers: int,
+    preload: Callable[[], Any],
+    log: Callable[[str], None] = print,
+) -> None:
+    """
+    Load the model once, then fork ``workers`` processes that share it.
+
+    ``preload`` runs in the parent before any fork. With ``use_mmap`` the GGUF
+    weights are file-backed pages in the page cache; without it they are
+    anonymous memory inherited copy-on-write. Either way the weights are never
+    written, so every worker maps the same physical pages and N workers cost
+    about one model's worth of PSS. The parent only loads the weights (no
+    evaluation), so no llama.cpp/OpenMP thread pools exist at fork time, and
+    ``gc.freeze`` keeps the collector from dirtying inherited objects. Memory
+    locks (``use_mlock``) are not inherited across ``fork``; the parent keeps
+    its lock, which pins the shared pages for all workers.
+
+    Workers accept connections from one shared listening socket, so the kernel
+    balances them. SIGINT/SIGTERM stop every worker.
+    """
+    preload()
+    gc.collect()
+    gc.freeze()
+
+    sock = socket.create_server((host, port))
+    sock.set_inheritable(True)
+    pids: List[int] = []
+    for _ in range(max(1, workers)):
+        pid = os.fork()
+        if pid == 0:  # pragma: no cover - child process
+            code = 0
+            try:
+                _serve_worker(sock, app, host, port)
+            except SystemExit as e:
+                code = e.code if isinstance(e.code, int) else 0
+            except BaseException:  # pylint: disable=broad-exception-caught
+                code = 1
+            os._exit(code)  # pylint: disable=protected-access
+        pids.append(pid)
+    sock.close()
+
+    log(f"[serve] {len(pids)} workers on {host}:{port}, model loaded before fork")
+    log(f"[serve] memory: {memory_report(pids)}")
+
+    def _stop(signum: int, frame: Any) -> None:  # pylint: disable=unused-argument
+        for child in pids:
+            try:
+                os.kill(child, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, _stop)
+    signal.signal(signal.SIGINT, _stop)
+    alive = set(pids)
+    while alive:
+        try:
+            pid, _ = os.wait()
+        except ChildProcessError:
+            break
+        alive.discard(pid)
+        if alive:
+            _stop(signal.SIGTERM, None)  # one worker died: shut the rest down
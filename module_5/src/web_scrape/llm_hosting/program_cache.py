@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""Two-level memo for standardized program text: bounded LRU + on-disk SQLite."""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict
+
+
+def normalize_key(program_text: str) -> str:
+    """Collapse whitespace and case so trivially different inputs share an entry."""
+    return " ".join((program_text or "").split()).casefold()
+
+
+class ProgramCache:
+    """
+    Memoizes ``_call_llm`` results keyed on normalized program text.
+
+    Lookups hit a bounded in-memory LRU first, then a SQLite table that persists
+    across runs and is shared by every process pointing at the same file (the
+    ``main.py`` batch run, the ``/standardize`` server and the ``--file`` CLI).
+    Entries are namespaced (by model file, fast-path threshold and rules data)
+    so changing any of them never serves stale answers. Pass ``path=None`` for a memory-only cache.
+    """
+
+    def __init__(self, path: str | None, capacity: int = 4096, namespace: str = "") -> None:
+        self.path = path
+        self.capacity = max(0, capacity)
+        self.namespace = namespace
+        self._lru: OrderedDict[str, Dict[str, str]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: sqlite3.Connection | None = None
+        self._counts = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+
+    def _connect(self) -> sqlite3.Connection | None:
+        """Open the SQLite store on first use (WAL so readers never block writers)."""
+        if self._db is None and self.path:
+            self._db = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS program_cache ("
+                " namespace TEXT NOT NULL, program TEXT NOT NULL, result TEXT NOT NULL,"
+                " PRIMARY KEY (namespace, program))"
+            )
+            self._db.commit()
+        return self._db
+
+    def _remember(self, key: str, result: Dict[str, str]) -> None:
+        """Insert into the LRU, evicting the least recently used entry if full."""
+        if not self.capacity:
+            return
+        self._lru[key] = result
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.capacity:
+            self._lru.popitem(last=False)
+
+    def get(self, program_text: str) -> Dict[str, str] | None:
+        """Return a copy of the cached result for ``program_text`` or None."""
+        key = normalize_key(program_text)
+        with self._lock:
+            if key in self._lru:
+                self._lru.move_to_end(key)
+                self._counts["memory_hits"] += 1
+                return dict(self._lru[key])
+
+            db = self._connect()
+            row = None
+            if db is not None:
+                row = db.execute(
+                    "SELECT result FROM program_cache WHERE namespace = ? AND program = ?",
+                    (self.namespace, key),
+                ).fetchone()
+            if row is None:
+                self._counts["misses"] += 1
+                return None
+
+            result = json.loads(row[0])
+            self._remember(key, result)
+            self._counts["disk_hits"] += 1
+            return dict(result)
+
+    def put(self, program_text: str, result: Dict[str, str]) -> None:
+        """Store ``result`` for ``program_text`` in memory and on disk."""
+        key = normalize_key(program_text)
+        with self._lock:
+            self._remember(key, dict(result))
+            db = self._connect()
+            if db is not None:
+                db.execute(
+                    "INSERT OR REPLACE INTO program_cache (namespace, program, result)"
+                    " VALUES (?, ?, ?)",
+                    (self.namespace, key, json.dumps(result, ensure_ascii=False)),
+                )
+                db.commit()
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and current LRU size."""
+        with self._lock:
+            return dict(self._counts, memory_entries=len(self._lru))
+
+    def close(self) -> None:
+        """Close the SQLite handle (the in-memory LRU is kept)."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
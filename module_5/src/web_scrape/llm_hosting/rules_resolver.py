@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""Deterministic, rules-first pre-resolver that lets ``_call_llm`` skip the model."""
+
+from __future__ import annotations
+
+import re
+import threading
+from typing import Dict, Iterable, NamedTuple, Tuple
+
+try:
+    from .canon_index import CanonIndex
+    from .normalizer import AbbreviationMatcher
+except ImportError:  # executed as a script: python app.py
+    from canon_index import CanonIndex
+    from normalizer import AbbreviationMatcher
+
+# Degree tokens stripped from the program part before canonical matching
+DEGREE_TOKENS = frozenset({
+    "phd", "masters", "master", "ms", "m.s.", "ma", "m.a.", "msc", "m.sc.",
+    "mba", "m.b.a.", "mfa", "m.f.a.", "meng", "m.eng.", "mtech", "m.tech.", "psyd",
+})
+
+# Same separators as ``_split_fallback`` in app.py
+_SPLIT_RE = re.compile(r",| at | @ ")
+_OF_RE = re.compile(r"\bOf\b")
+
+class Resolution(NamedTuple):
+    """Rules-first candidate fields and how confident the resolver is in them."""
+
+    program: str
+    university: str
+    confidence: float
+
+
+class RulesResolver:
+    """
+    Resolve program text from the canonical lists alone.
+
+    The text is split into program and university parts the same way the
+    fallback parser does. The field of study (degree tokens removed) and the
+    university are each matched exactly, through an abbreviation pattern, or by
+    fuzzy similarity; the per-field score is 1.0 for exact/abbreviation hits and
+    the similarity ratio for fuzzy hits. The overall confidence is the lower of
+    the two. Callers send inputs below their threshold to the LLM.
+    """
+
+    def __init__(
+        self,
+        canon_programs: CanonIndex | Iterable[str],
+        canon_universities: CanonIndex | Iterable[str],
+        abbreviations: Dict[str, str],
+        fixes: Tuple[Dict[str, str], Dict[str, str]] = ({}, {}),
+        fuzzy_cutoff: float = 0.8,
+    ) -> None:
+        # Accept the app's prebuilt indexes so they are not built twice
+        self.programs = (canon_programs if isinstance(canon_programs, CanonIndex)
+                         else CanonIndex(canon_programs))
+        self.universities = (canon_universities if isinstance(canon_universities, CanonIndex)
+                             else CanonIndex(canon_universities))
+        self._abbreviations = AbbreviationMatcher(abbreviations)
+        self._fixes = fixes
+        self.fuzzy_cutoff = fuzzy_cutoff
+        self._lock = threading.Lock()
+        self._counts = {"hits": 0, "misses": 0}
+
+    def _match_program(self, text: str) -> Tuple[str, str, float]:
+        """Return (field, degree suffix, score) for the program part."""
+        words = text.split()
+        field = " ".join(w for w in words if w.lower() not in DEGREE_TOKENS)
+        degree = " ".join(w for w in words if w.lower() in DEGREE_TOKENS)
+        field = self._fixes[0].get(field, field).title()
+        if not field:
+            return "", degree, 0.0
+        if field in self.programs:
+            return field, degree, 1.0
+        match, score = self.programs.best_match(field, self.fuzzy_cutoff)
+        return (match, degree, score) if match else (field, degree, 0.0)
+
+    def _match_university(self, text: str) -> Tuple[str, float]:
+        """Return (university, score) for the university part."""
+        if not text:
+            return "Unknown", 1.0
+        full = self._abbreviations.expand(text)
+        if full is not None:
+            return full, 1.0
+        uni = self._fixes[1].get(text, text)
+        if uni in self.universities:
+            return uni, 1.0
+        uni = _OF_RE.sub("of", uni.title())
+        if uni in self.universities:
+            return uni, 1.0
+        match, score = self.universities.best_match(uni, self.fuzzy_cutoff)
+        return (match, score) if match else (uni, 0.0)
+
+    def resolve(self, program_text: str) -> Resolution:
+        """Score the best rules-only answer for ``program_text``."""
+        s = re.sub(r"\s+", " ", (program_text or "")).strip().strip(",")
+        parts = [p.strip() for p in _SPLIT_RE.split(s) if p.strip()]
+        if not parts or len(parts) > 2:
+            return Resolution("", "Unknown", 0.0)
+
+        field, degree, prog_score = self._match_program(parts[0])
+        uni, uni_score = self._match_university(parts[1] if len(parts) > 1 else "")
+        program = f"{field} {degree}".strip()
+        return Resolution(program, uni, min(prog_score, uni_score))
+
+    def record(self, hit: bool) -> None:
+        """Count one fast-path hit or miss."""
+        with self._lock:
+            self._counts["hits" if hit else "misses"] += 1
+
+    def stats(self) -> Dict[str, float]:
+        """Hits, misses and hit rate of the fast path so far."""
+        with self._lock:
+            total = self._counts["hits"] + self._counts["misses"]
+            rate = self._counts["hits"] / total if total else 0.0
+            return dict(self._counts, hit_rate=rate)
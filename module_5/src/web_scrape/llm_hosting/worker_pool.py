@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""Multi-process standardization: K model processes with N_THREADS/K threads each."""
+# pylint: disable=protected-access
+
+from __future__ import annotations
+
+import multiprocessing as mp
+import signal
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+try:
+    from . import app as llm_app
+except ImportError:  # executed as a script: python app.py
+    import app as llm_app
+
+# (row index, program text) in; (row index, result or None, error or None) out
+Item = Tuple[int, str]
+Outcome = Tuple[int, Dict[str, Any] | None, str | None]
+
+# Per-call deadline inside this worker process (0 = none)
+_DEADLINE = {"seconds": 0.0}
+
+
+class CallTimeout(Exception):
+    """A row exceeded the per-call deadline; its error string starts with this name."""
+
+
+def _on_alarm(signum, frame):  # pylint: disable=unused-argument
+    """SIGALRM handler that interrupts the running generation."""
+    raise CallTimeout(f"LLM call exceeded {_DEADLINE['seconds']:g}s")
+
+
+def _init_worker(n_threads: int, timeout: float = 0.0) -> None:
+    """Load this process's own model and cache handle; leave Ctrl-C to the parent."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    if timeout > 0:
+        signal.signal(signal.SIGALRM, _on_alarm)
+        _DEADLINE["seconds"] = timeout
+    llm_app.N_THREADS = n_threads
+    llm_app._LLM = None
+    # Never reuse a SQLite handle inherited across fork; reopen under the same
+    # namespace as the single-process paths
+    llm_app._CACHE = None
+    llm_app._cache()
+    llm_app._load_llm()
+
+
+def _standardize_chunk(chunk: List[Item]) -> List[Outcome]:
+    """Run one chunk through ``_call_llm``, reporting failures per row."""
+    outcomes: List[Outcome] = []
+    for idx, program_text in chunk:
+        try:
+            if _DEADLINE["seconds"]:
+                signal.setitimer(signal.ITIMER_REAL, _DEADLINE["seconds"])
+            try:
+                outcomes.append((idx, llm_app._call_llm(program_text), None))
+            finally:
+                signal.setitimer(signal.ITIMER_REAL, 0)
+        except CallTimeout as e:
+            # The generation was interrupted mid-way: start the next row clean
+            if llm_app._LLM is not None:
+                llm_app._LLM.reset()
+            outcomes.append((idx, None, f"{type(e).__name__}: {e}"))
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            outcomes.append((idx, None, f"{type(e).__name__}: {e}"))
+    return outcomes
+
+
+def _chunks(items: Iterable[Item], size: int) -> Iterator[List[Item]]:
+    """Consecutive lists of at most ``size`` items."""
+    chunk: List[Item] = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def iter_standardized(
+    items: Iterable[Item],
+    processes: int,
+    threads_per_process: int | None = None,
+    chunk_size: int = 16,
+    timeout: float = 0.0,
+) -> Iterator[Outcome]:
+    """
+    Standardize ``items`` across ``processes`` model processes, in input order.
+
+    Each worker loads its own llama.cpp model with ``threads_per_process``
+    threads (default ``N_THREADS // processes``) and receives rows in chunks of
+    ``chunk_size``; outcomes are yielded in the original order so the caller
+    can merge results and write checkpoints centrally. Workers are forked, so
+    no module is re-imported and nothing is pickled but the rows themselves.
+    With ``timeout`` > 0 each call gets a SIGALRM deadline inside its worker;
+    rows that miss it come back with a ``CallTimeout: ...`` error. Closing the
+    generator early terminates the workers.
+    """
+    threads = threads_per_process or max(1, llm_app.N_THREADS // max(1, processes))
+    pool = mp.get_context("fork").Pool(
+        processes, initializer=_init_worker, initargs=(threads, timeout)
+    )
+    try:
+        for outcomes in pool.imap(_standardize_chunk, _chunks(items, max(1, chunk_size))):
+            yield from outcomes
+        pool.close()
+    finally:
+        pool.terminate()
+        pool.join()
@@ -1,27 +1,50 @@
 """
-This module manages scraping, cleaning, structuring data, and LLM-based processing.
+This module is the command-line entry point for scraping, cleaning and LLM-based processing.
 
-This orchestrator prepares the data that is eventually passed to the database
-loading modules. It ensures data consistency and structural integrity before 
-secure insertion via psycopg SQL composition and parameter binding (Step 2).
-It also follows Step 3 requirements by managing local file-based checkpoints 
-safely within the configured data directories.
+It is a thin wrapper around ``pipeline.Pipeline``: it picks the raw entry
+source (the saved ``raw.json`` or a live scrape, which is written to
+``raw.json`` as entries arrive), wires the clean, LLM standardize and load
+stages together, and reports the outcome. The data it
+produces is eventually passed to the database loading modules, which insert it
+via psycopg SQL composition and parameter binding (Step 2). It also follows
+Step 3 requirements by keeping its results journal and output files safely
+within the configured data directories.
+
+Run from ``src`` with ``python -m web_scrape.main [--scrape] [--load-db] [--snapshot PATH]``.
 """
+import argparse
 import json
 import os
 import sys
-import gc
 import time
+import signal
 from datetime import datetime
-from .scrape import scrape_data, save_data
-from .clean import load_data
-from .llm_hosting.app import _call_llm, _load_llm, _split_fallback
+from .scrape import RawDataWriter, iter_entries
+from .clean import clean_entry
+from .journal import replay_journal
+from .llm_hosting.app import _call_llm, _load_llm, _split_fallback, _unload_llm
+from .pipeline import LLMStandardizer, Pipeline, PipelineError, TimeoutException, open_sink
+from .memory import rss_mb
+from .progress import PipelineMetrics
 
 # Configuration for CPU+LLM processing
-SKIP_SCRAPING = True
-CHECKPOINT_INTERVAL = 50  # Save progress every N entries
-MODEL_RELOAD_INTERVAL = 750
-LLM_TIMEOUT = 60  # Timeout per LLM call in seconds
+CHECKPOINT_INTERVAL = 50  # fsync the results journal every N entries
+# Reload the model once RSS has grown this much since the last load (0 = never)
+MEMORY_GROWTH_MB = float(os.getenv("MEMORY_GROWTH_MB", "512"))
+MEMORY_CHECK_INTERVAL = int(os.getenv("MEMORY_CHECK_INTERVAL", "50"))  # Rows between RSS samples
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "60"))  # Timeout per LLM call in seconds (0 = none)
+LLM_WORKERS = int(os.getenv("LLM_WORKERS", "1"))  # >1: K model processes, N_THREADS/K threads each
+LLM_CHUNK_SIZE = int(os.getenv("LLM_CHUNK_SIZE", "16"))  # Rows dispatched to a worker at a time
+PIPELINE_QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE", "64"))  # Rows buffered between stages
+PROGRESS_INTERVAL = float(os.getenv("PROGRESS_INTERVAL", "30"))  # Seconds between progress reports
+PROGRESS_WINDOW = float(os.getenv("PROGRESS_WINDOW", "60"))  # Seconds behind moving-window rates
+METRICS_TEXTFILE = os.getenv("METRICS_TEXTFILE", "")  # Prometheus textfile path (empty = off)
+
+RAW_JSON_PATH = "raw_data/raw.json"
+OUTPUT_DIR = "raw_data"
+OUTPUT_PATH = f"{OUTPUT_DIR}/llm_extended_applicant_data.json"
+JOURNAL_PATH = f"{OUTPUT_DIR}/.llm_journal.jsonl"
+
 
 def log(msg: str):
     """
@@ -34,13 +57,6 @@ def log(msg: str):
     print(f"[{timestamp}] {msg}")
     sys.stdout.flush()
 
-class TimeoutException(Exception):
-    """
-    Custom exception raised when an LLM call exceeds the allowed timeout.
-
-    :param Exception: Base exception class.
-    :type Exception: Exception
-    """
 
 def timeout_handler(signum, frame):
     """
@@ -52,173 +68,215 @@ def timeout_handler(signum, frame):
     """
     raise TimeoutException("LLM call timed out")
 
-# Check if raw.json already exists to skip scraping
-RAW_JSON_PATH = "raw_data/raw.json"
-if not os.path.exists(RAW_JSON_PATH):
-    if SKIP_SCRAPING:
-        log("[ERROR] raw.json doesn't exist and SKIP_SCRAPING is True!")
-        log("Either set SKIP_SCRAPING=False or run scraping first")
-        sys.exit(1)
-    else:
-        log("[START] Web scraping phase (~1-2 min per page)...")
-        scrape_start = time.time()
-        scraped_data = scrape_data()
-        save_data(scraped_data)
-        scrape_time = time.time() - scrape_start
-        log(f"[OK] Scraped {len(scraped_data)} entries in {scrape_time/60:.1f} minutes")
-else:
-    log("[OK] Found existing raw.json - skipping scrape")
-
-# Load and clean data
-try:
-    log("[START] Cleaning and parsing data...")
-    clean_start = time.time()
-    cleaned_data = load_data()
-    clean_time = time.time() - clean_start
-    log(f"[OK] Cleaned {len(cleaned_data)} entries in {clean_time:.1f} seconds")
-except (FileNotFoundError, json.JSONDecodeError) as e:
-    log(f"[ERROR] {e}")
-    log("Run scraping first or check that raw_data/raw.json exists")
-    sys.exit(1)
-
-# Create output directory
-OUTPUT_DIR = "raw_data"
-os.makedirs(OUTPUT_DIR, exist_ok=True)
 
-OUTPUT_PATH = f"{OUTPUT_DIR}/llm_extended_applicant_data.json"
-CHECKPOINT_PATH = f"{OUTPUT_DIR}/.llm_checkpoint.json"
+def emit_json(line: str):
+    """
+    Write one structured JSON log line to stdout and flush it.
+
+    :param line: A serialized JSON object.
+    :type line: str
+    """
+    print(line)
+    sys.stdout.flush()
 
-# Check for checkpoint to resume processing
-start_index = 0
-if os.path.exists(CHECKPOINT_PATH):
+
+def read_raw_entries(path, metrics=None):
+    """
+    Yield the entries of a saved ``raw.json`` in file order.
+
+    :param path: Path of the raw JSON file written by ``scrape.save_data``.
+    :type path: str
+    :param metrics: Told the entry count so every stage can report an ETA.
+    :type metrics: PipelineMetrics or None
+    :return: Iterator over raw entry dictionaries.
+    :rtype: Iterator[dict]
+    """
+    with open(path, "r", encoding="utf-8") as file:
+        entries = json.load(file)
+    if metrics is not None:
+        metrics.set_total(len(entries))
+    yield from entries.values()
+
+
+def save_entries(entries, writer):
+    """
+    Yield scraped entries, recording each in ``raw.json`` before it moves on.
+
+    An interrupted scrape thus leaves a ``raw.json`` whose order matches the
+    results journal, and running again without ``--scrape`` resumes it.
+
+    :param entries: Entries from ``scrape.iter_entries``.
+    :type entries: Iterable[dict]
+    :param writer: Writer of the raw JSON file; closed when the entries end.
+    :type writer: RawDataWriter
+    :return: Iterator over the same entries.
+    :rtype: Iterator[dict]
+    """
     try:
-        with open(CHECKPOINT_PATH, "r", encoding="utf-8") as f:
-            checkpoint = json.load(f)
-            start_index = checkpoint.get("last_index", 0)
-            # Restore previously processed data
-            for i in range(start_index):
-                if i < len(cleaned_data):
-                    for key in ["LLM Program Name", "LLM University Name"]:
-                        if key in checkpoint.get(str(i), {}):
-                            cleaned_data[i][key] = checkpoint[str(i)][key]
-            log(f"[RESUME] Resuming from checkpoint at entry {start_index}...")
-    except (json.JSONDecodeError, OSError) as e:
-        log(f"[WARNING] Could not load checkpoint: {e}")
-        start_index = 0
-
-# Load LLM model once
-log("[START] Loading LLM model (TinyLlama 1.1B, ~2GB)...")
-llm_load_start = time.time()
-try:
-    llm = _load_llm()
-    llm_load_time = time.time() - llm_load_start
-    log(f"[OK] LLM loaded in {llm_load_time:.1f}s. Starting LLM phase...")
-except RuntimeError as e:
-    log(f"[ERROR] Failed to load LLM: {e}")
-    sys.exit(1)
-
-# Track failures and successes
-llm_failures = 0
-LLM_TIMEOUTS = 0
-llm_successes = 0
-checkpoint_data = {}
-last_checkpoint_time = time.time()
-processing_start = time.time()
-
-log(f"[START] Processing {len(cleaned_data)} entries...")
-
-try:
-    for i in range(start_index, len(cleaned_data)):
-        row = cleaned_data[i]
-        program_text = row.get("Program Name", "")
-        university = row.get("University", "Unknown")
-
-        if i > start_index and (i) % 10 == 0:
-            elapsed = time.time() - processing_start
-            rate = i / elapsed if elapsed > 0 else 0
-            log(f"[TICK] {i:6d}/{len(cleaned_data)} @ {rate:.1f} entries/sec")
-
-        if (i) % CHECKPOINT_INTERVAL == 0 and i > start_index:
-            percent = int(i / len(cleaned_data) * 100)
-            elapsed = time.time() - processing_start
-            if i > 0:
-                est_rem = (elapsed * len(cleaned_data) / i) - elapsed
-                TIME_STR = f"{int(est_rem / 3600)}h {int((est_rem % 3600) / 60)}m"
-            else:
-                TIME_STR = "calculating..."
-            log(f"[PROGRESS] {i}/{len(cleaned_data)} ({percent}%) | Est. {TIME_STR} left")
-
-        if i > 0 and i % MODEL_RELOAD_INTERVAL == 0:
-            log(f"[MEMORY] Reloading model at entry {i}...")
-            del llm
-            gc.collect()
-            time.sleep(1)
-            try:
-                llm = _load_llm()
-                log("[OK] Model reloaded successfully")
-            except RuntimeError as e:
-                log(f"[WARNING] Failed to reload model: {e}")
-
-        if not program_text:
-            row["LLM Program Name"] = ""
-            row["LLM University Name"] = university
-            checkpoint_data[str(i)] = {"LLM Program Name": "", "LLM University Name": university}
-            continue
-
-        try:
-            llm_result = _call_llm(program_text)
-            row["LLM Program Name"] = llm_result.get("standardized_program", "")
-            row["LLM University Name"] = university
-            checkpoint_data[str(i)] = {
-                "LLM Program Name": row["LLM Program Name"],
-                "LLM University Name": row["LLM University Name"]
-            }
-            llm_successes += 1
-        except (TimeoutException, RuntimeError, ValueError) as e:
-            llm_failures += 1
-            prog = _split_fallback(program_text)[0]
-            row["LLM Program Name"] = prog
-            row["LLM University Name"] = university
-            checkpoint_data[str(i)] = {
-                "LLM Program Name": prog,
-                "LLM University Name": university
-            }
-            if llm_failures <= 5:
-                log(f"[FALLBACK] Row {i}: {type(e).__name__}: {str(e)[:80]}")
-
-        if (i + 1) % CHECKPOINT_INTERVAL == 0:
-            try:
-                checkpoint = {
-                    "last_index": i + 1,
-                    "total_entries": len(cleaned_data),
-                    "successes": llm_successes,
-                    "failures": llm_failures
-                }
-                checkpoint.update(checkpoint_data)
-                with open(CHECKPOINT_PATH, "w", encoding="utf-8") as f:
-                    json.dump(checkpoint, f)
-                checkpoint_data = {}
-                gc.collect()
-                last_checkpoint_time = time.time()
-                sys.stdout.flush()
-            except OSError as e:
-                log(f"[WARNING] Could not save checkpoint: {e}")
-
-except KeyboardInterrupt:
-    log(f"\n[WARNING] Interrupted at row {i+1}. Saving checkpoint...")
-
-log(f"\n[START] Saving final output to {OUTPUT_PATH}...")
-try:
-    with open(OUTPUT_PATH, "w", encoding="utf-8") as file:
-        json.dump(cleaned_data, file, indent=4, ensure_ascii=False)
-
-    if os.path.exists(CHECKPOINT_PATH):
-        os.remove(CHECKPOINT_PATH)
-
-    total_time = time.time() - processing_start
-    log(f"[OK] Complete! Saved {len(cleaned_data)} entries to {OUTPUT_PATH}")
-    log(f"[OK] Summary: {llm_successes} successes, {llm_failures} failures")
+        for entry in entries:
+            writer.write(entry)
+            yield entry
+    finally:
+        writer.close()
+
+
+def _db_loader():
+    """Import the database batch loader only when ``--load-db`` is used."""
+    try:
+        from .. import load_data  # pylint: disable=import-outside-toplevel
+    except (ImportError, ValueError):  # run from src: web_scrape is the top-level package
+        import load_data  # pylint: disable=import-outside-toplevel
+    return load_data.insert_rows
+
+
+def _snapshot_writer(path):
+    """Columnar snapshot of the output rows, only when ``--snapshot`` is used."""
+    from .snapshot import LLM_FIELDS, SnapshotWriter  # pylint: disable=import-outside-toplevel
+    return SnapshotWriter(path, LLM_FIELDS)
+
+
+def build_parser():
+    """
+    Build the command-line interface.
+
+    :return: The argument parser.
+    :rtype: argparse.ArgumentParser
+    """
+    parser = argparse.ArgumentParser(description="Scrape, clean, standardize and load applicants.")
+    parser.add_argument("--scrape", action="store_true",
+                        help="scrape live pages instead of reading raw.json")
+    parser.add_argument("--start-page", type=int, default=1)
+    parser.add_argument("--end-page", type=int, default=2500)
+    parser.add_argument("--load-db", action="store_true",
+                        help="also insert standardized rows into PostgreSQL")
+    parser.add_argument("--output", default=OUTPUT_PATH)
+    parser.add_argument("--snapshot", default=None,
+                        help="also write the output as a columnar snapshot (parquet or npy)")
+    parser.add_argument("--journal", default=JOURNAL_PATH)
+    return parser
+
+
+def _open_source(args, metrics):
+    """
+    Pick the raw entry source: a live scrape saved to raw.json, or raw.json itself.
+
+    :param args: Parsed arguments from ``build_parser``.
+    :type args: argparse.Namespace
+    :param metrics: Told the entry count when raw.json is read.
+    :type metrics: PipelineMetrics
+    :return: ``(source, raw_writer)`` with ``raw_writer`` None unless scraping,
+        or None when the run cannot start.
+    :rtype: tuple or None
+    """
+    if args.scrape:
+        if os.path.exists(args.journal):
+            # Journal indices refer to the order of the current raw.json; a new
+            # scrape would renumber the entries
+            log(f"[ERROR] {args.journal} holds results of an unfinished run.")
+            log("Run again without --scrape to resume it, or delete the journal first")
+            return None
+        log(f"[START] Scraping pages {args.start_page}-{args.end_page} as a pipeline stage...")
+        raw_writer = RawDataWriter(RAW_JSON_PATH)
+        return (lambda: save_entries(iter_entries(args.start_page, args.end_page), raw_writer),
+                raw_writer)
+    if os.path.exists(RAW_JSON_PATH):
+        log("[OK] Found existing raw.json - skipping scrape")
+        return lambda: read_raw_entries(RAW_JSON_PATH, metrics), None
+    log("[ERROR] raw.json doesn't exist!")
+    log("Either pass --scrape or run scraping first")
+    return None
+
+
+def run(args):
+    """
+    Run the pipeline for parsed command-line arguments.
+
+    :param args: Parsed arguments from ``build_parser``.
+    :type args: argparse.Namespace
+    :return: Process exit code.
+    :rtype: int
+    """
+    metrics = PipelineMetrics(interval=PROGRESS_INTERVAL, textfile=METRICS_TEXTFILE or None,
+                              emit=emit_json, window=PROGRESS_WINDOW,
+                              gauges=lambda: {"rss_mb": round(rss_mb(), 1)})
+    opened = _open_source(args, metrics)
+    if opened is None:
+        return 1
+    source, raw_writer = opened
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    try:
+        done = replay_journal(args.journal)
+    except OSError as e:
+        log(f"[WARNING] Could not read journal: {e}")
+        done = {}
+    if done:
+        log(f"[RESUME] Replayed {len(done)} journaled rows; they skip the model")
+
+    # Enforce LLM_TIMEOUT per call on this (main) thread; SIGALRM interrupts the
+    # generation between tokens and the row takes the fallback path
+    if LLM_WORKERS <= 1 and LLM_TIMEOUT > 0:
+        signal.signal(signal.SIGALRM, timeout_handler)
+
+    standardizer = LLMStandardizer(
+        {"load": _load_llm, "call": _call_llm, "unload": _unload_llm, "fallback": _split_fallback},
+        done,
+        {"timeout": LLM_TIMEOUT, "workers": LLM_WORKERS, "chunk_size": LLM_CHUNK_SIZE,
+         "memory_growth_mb": MEMORY_GROWTH_MB, "memory_check_interval": MEMORY_CHECK_INTERVAL},
+        log=log,
+        metrics=metrics.stage("llm"),
+    )
+    processing_start = time.time()
+    sink = open_sink(args.journal, args.output, done, fsync_every=CHECKPOINT_INTERVAL,
+                     db_loader=_db_loader() if args.load_db else None,
+                     snapshot=_snapshot_writer(args.snapshot) if args.snapshot else None)
+    pipeline = Pipeline(source, clean_entry, standardizer, sink,
+                        queue_size=PIPELINE_QUEUE_SIZE, metrics=metrics)
+
+    log("[START] Running scrape/clean/standardize/load pipeline...")
+    complete = False
+    try:
+        pipeline.run()
+        complete = True
+    except KeyboardInterrupt:
+        log(f"\n[WARNING] Interrupted after {pipeline.counts['loaded']} rows. Journal synced.")
+    except PipelineError as e:
+        log(f"[ERROR] {e}")
+    if raw_writer is not None:
+        # The scrape thread may still be blocked on a page; keep what it saved
+        log(f"[OK] Saved {raw_writer.close()} scraped entries to {RAW_JSON_PATH}")
+
+    # Keep the journal after an interrupted run so the next one resumes from it
+    if complete and os.path.exists(args.journal):
+        os.remove(args.journal)
+
+    counts, total_time = standardizer.counts, time.time() - processing_start
+    log(f"[OK] Saved {pipeline.counts['loaded']} entries to {args.output}")
+    if args.snapshot and complete:
+        log(f"[OK] Wrote columnar snapshot to {args.snapshot}")
+    elif args.snapshot:
+        log(f"[WARNING] Run incomplete; left any previous snapshot at {args.snapshot} untouched")
+    if args.load_db:
+        log(f"[OK] {sink.inserted} new rows inserted into the database")
+    log(f"[OK] Summary: {counts['successes']} successes, {counts['failures']} failures "
+        f"({counts['timeouts']} timeouts, {counts['resumed']} resumed)")
+    log(f"[OK] Memory: peak RSS {standardizer.memory.peak_mb:.0f} MiB, "
+        f"{counts['model_reloads']} model reloads")
     log(f"[OK] Total processing time: {int(total_time / 3600)}h {int((total_time % 3600) / 60)}m")
-except OSError as e:
-    log(f"[ERROR] Failed to save output: {e}")
-    sys.exit(1)
+    return 0 if complete else 1
+
+
+def main(argv=None):
+    """
+    Command-line entry point.
+
+    :param argv: Arguments (defaults to ``sys.argv[1:]``).
+    :type argv: list[str] or None
+    :return: Process exit code.
+    :rtype: int
+    """
+    return run(build_parser().parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+"""
+This module samples process memory so the LLM phase can recycle the model on demand.
+
+Instead of reloading the model every fixed number of rows, ``main.py`` records
+the resident set size (RSS) after each load and reloads only once the process
+has grown past a configured threshold.
+"""
+import os
+import resource
+import sys
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def rss_mb():
+    """
+    Return the current resident set size of this process in MiB.
+
+    Reads ``/proc/self/statm`` (Linux); elsewhere falls back to the peak RSS
+    reported by ``getrusage``, which can only grow.
+
+    :return: Resident memory in MiB.
+    :rtype: float
+    """
+    try:
+        with open("/proc/self/statm", "r", encoding="ascii") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is bytes on macOS and KiB on Linux
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class MemoryWatch:
+    """
+    Tracks RSS growth since the last model (re)load.
+
+    :param growth_limit_mb: Growth above the baseline that triggers a reload
+        (0 disables recycling).
+    :type growth_limit_mb: float
+    """
+
+    def __init__(self, growth_limit_mb):
+        self.growth_limit_mb = growth_limit_mb
+        self.baseline_mb = rss_mb()
+        self.peak_mb = self.baseline_mb
+
+    def rebase(self):
+        """
+        Take the current RSS as the new baseline (call right after a model load).
+
+        :return: The new baseline in MiB.
+        :rtype: float
+        """
+        self.baseline_mb = rss_mb()
+        self.peak_mb = max(self.peak_mb, self.baseline_mb)
+        return self.baseline_mb
+
+    def sample(self):
+        """
+        Sample RSS and report whether growth since the baseline passed the limit.
+
+        :return: Current RSS in MiB, growth since the baseline in MiB, and
+            whether the model should be recycled.
+        :rtype: tuple[float, float, bool]
+        """
+        current = rss_mb()
+        self.peak_mb = max(self.peak_mb, current)
+        growth = current - self.baseline_mb
+        return current, growth, 0 < self.growth_limit_mb < growth
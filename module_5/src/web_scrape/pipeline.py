@@ -0,0 +1,464 @@
+"""
+This module runs the scrape -> clean -> standardize -> load flow as overlapping stages.
+
+Each stage runs on its own thread and hands rows to the next through a bounded
+queue, so pages are fetched, entries cleaned, programs standardized and rows
+loaded at the same time instead of one phase after another. Standardization
+runs on the calling (main) thread so the per-call SIGALRM deadline keeps
+working; with several LLM workers it fans out to the process pool instead.
+A full queue blocks its producer, which keeps memory bounded by
+``queue_size`` rows per stage.
+"""
+import queue
+import signal
+import threading
+import time
+from collections import deque
+
+from .journal import JsonArrayWriter, RowJournal
+from .memory import MemoryWatch
+from .progress import PipelineMetrics, StageMetrics
+from .llm_hosting.worker_pool import CallTimeout, iter_standardized
+
+# End-of-stream marker passed down every queue, and the load stage's marker
+# for a run that stopped early (stage error or interrupt)
+_DONE = object()
+_ABORTED = object()
+_POLL_SECONDS = 0.1
+
+
+class TimeoutException(Exception):
+    """
+    Custom exception raised when an LLM call exceeds the allowed timeout.
+
+    :param Exception: Base exception class.
+    :type Exception: Exception
+    """
+
+
+class PipelineError(RuntimeError):
+    """
+    Raised by ``Pipeline.run`` when a stage fails; chained to the stage's exception.
+
+    :param RuntimeError: Base exception class.
+    :type RuntimeError: RuntimeError
+    """
+
+
+class Pipeline:  # pylint: disable=too-many-instance-attributes,too-few-public-methods
+    """
+    Wires the four stages together with bounded queues.
+
+    :param source: Callable returning an iterable of raw entries (scrape stage).
+    :type source: Callable[[], Iterable[dict]]
+    :param clean: Maps one raw entry to a cleaned row (clean stage).
+    :type clean: Callable[[dict], dict]
+    :param standardize: Maps an iterable of ``(index, row)`` to an iterable of
+        ``(index, row, fields)`` in the same order (standardize stage).
+    :type standardize: Callable[[Iterable[tuple]], Iterable[tuple]]
+    :param sink: Load stage; ``write(index, row, fields)`` per row, then
+        ``close(complete)`` with whether every row made it through.
+    :type sink: object
+    :param queue_size: Capacity of each queue between stages.
+    :type queue_size: int
+    :param metrics: Receives scrape, clean and load timings and reports while
+        running; the standardize stage records its own ``llm`` metrics.
+    :type metrics: PipelineMetrics or None
+    """
+
+    def __init__(self, source, clean, standardize, sink, queue_size=64,  # pylint: disable=too-many-arguments,too-many-positional-arguments
+                 metrics=None):
+        self.source = source
+        self.clean = clean
+        self.standardize = standardize
+        self.sink = sink
+        self.queue_size = max(1, queue_size)
+        self.metrics = metrics or PipelineMetrics(interval=0, emit=lambda line: None)
+        self.counts = {"scraped": 0, "cleaned": 0, "standardized": 0, "loaded": 0}
+        self._stop = threading.Event()
+        self._errors = []
+
+    def _put(self, q, item, alive):
+        """Block until ``item`` is queued, giving up once ``alive()`` turns false."""
+        while alive():
+            try:
+                q.put(item, timeout=_POLL_SECONDS)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _drain(self, q):
+        """Yield items from ``q`` until the end marker, or until the pipeline stops."""
+        while True:
+            try:
+                item = q.get(timeout=_POLL_SECONDS)
+            except queue.Empty:
+                if self._stop.is_set():
+                    return
+                continue
+            if item is _DONE:
+                return
+            yield item
+
+    def _stage(self, name, body, downstream, alive):
+        """Thread target: run ``body`` and always pass the end marker downstream."""
+        try:
+            body()
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            self._errors.append((name, e))
+            self._stop.set()
+        finally:
+            if downstream is not None:
+                self._put(downstream, _DONE, alive)
+
+    def run(self):  # pylint: disable=too-many-locals
+        """
+        Run every stage to completion and return per-stage row counts.
+
+        On ``KeyboardInterrupt`` the upstream stages stop, rows already
+        standardized are still loaded and the sink is closed before the
+        interrupt propagates.
+
+        :return: Rows that passed through each stage.
+        :rtype: dict[str, int]
+        :raises PipelineError: If any stage raised.
+        """
+        raw_q = queue.Queue(self.queue_size)
+        clean_q = queue.Queue(self.queue_size)
+        out_q = queue.Queue(self.queue_size)
+
+        def running():
+            return not self._stop.is_set()
+
+        def scrape():
+            stage, entries = self.metrics.stage("scrape"), iter(self.source())
+            while True:
+                start = time.perf_counter()
+                entry = next(entries, _DONE)
+                if entry is _DONE:
+                    return
+                stage.observe(time.perf_counter() - start)
+                if not self._put(raw_q, entry, running):
+                    return
+                self.counts["scraped"] += 1
+
+        def clean():
+            stage = self.metrics.stage("clean")
+            for index, entry in enumerate(self._drain(raw_q)):
+                start = time.perf_counter()
+                row = self.clean(entry)
+                stage.observe(time.perf_counter() - start)
+                if not self._put(clean_q, (index, row), running):
+                    return
+                self.counts["cleaned"] += 1
+
+        def load():
+            stage, complete = self.metrics.stage("load"), False
+            try:
+                while True:
+                    item = out_q.get()
+                    if item is _DONE or item is _ABORTED:
+                        complete = item is _DONE
+                        return
+                    start = time.perf_counter()
+                    self.sink.write(*item)
+                    stage.observe(time.perf_counter() - start)
+                    self.counts["loaded"] += 1
+            finally:
+                self.sink.close(complete)
+
+        loader = threading.Thread(
+            target=self._stage, args=("load", load, None, None), name="pipeline-load"
+        )
+        producers = [
+            threading.Thread(target=self._stage, args=("scrape", scrape, raw_q, running),
+                             name="pipeline-scrape", daemon=True),
+            threading.Thread(target=self._stage, args=("clean", clean, clean_q, running),
+                             name="pipeline-clean", daemon=True),
+        ]
+        self.metrics.start()
+        for thread in [loader] + producers:
+            thread.start()
+
+        complete = False
+        try:
+            for item in self.standardize(self._drain(clean_q)):
+                if not self._put(out_q, item, loader.is_alive):
+                    break
+                self.counts["standardized"] += 1
+            # Stage errors are recorded before the stop that ends the drain
+            complete = not self._errors
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            self._errors.append(("standardize", e))
+        finally:
+            self._stop.set()
+            self._put(out_q, _DONE if complete else _ABORTED, loader.is_alive)
+            loader.join()
+            for thread in producers:
+                thread.join(timeout=1.0)
+            self.metrics.stop()
+
+        if self._errors:
+            name, error = self._errors[0]
+            raise PipelineError(f"{name} stage failed: {error}") from error
+        return dict(self.counts)
+
+
+class LLMStandardizer:  # pylint: disable=too-many-instance-attributes,too-few-public-methods
+    """
+    Standardize stage: adds ``LLM Program Name``/``LLM University Name`` to each row.
+
+    Rows recorded in ``done`` (replayed from the journal) pass through without
+    a model call. In single-process mode every call runs under a SIGALRM
+    deadline (the CLI installs the handler) and the model is recycled when RSS
+    grows past the limit; with ``workers`` > 1 rows go through the worker pool.
+
+    :param llm: ``load``, ``call``, ``unload`` and ``fallback`` callables from the LLM app.
+    :type llm: dict
+    :param done: Row index mapped to fields already journaled.
+    :type done: dict[int, dict]
+    :param settings: ``timeout``, ``workers``, ``chunk_size``, ``memory_growth_mb``
+        and ``memory_check_interval``.
+    :type settings: dict
+    :param log: Logger for progress and fallback messages.
+    :type log: Callable[[str], None]
+    :param metrics: Receives per-row latency and success/fallback/timeout/resumed/empty
+        outcomes (typically ``PipelineMetrics.stage("llm")``).
+    :type metrics: StageMetrics or None
+    """
+
+    def __init__(self, llm, done, settings, log=print, metrics=None):  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self.llm = llm
+        self.done = done
+        self.timeout = settings.get("timeout", 0.0)
+        self.workers = settings.get("workers", 1)
+        self.chunk_size = settings.get("chunk_size", 16)
+        self.memory_check_interval = max(1, settings.get("memory_check_interval", 50))
+        self.memory = MemoryWatch(settings.get("memory_growth_mb", 0))
+        self.log = log
+        self.metrics = metrics or StageMetrics("llm")
+        self.counts = {"successes": 0, "failures": 0, "timeouts": 0,
+                       "resumed": 0, "model_reloads": 0}
+
+    def __call__(self, rows):
+        if self.workers > 1:
+            return self._pooled(rows)
+        return self._single(rows)
+
+    def _fields(self, program, university):
+        """Result fields stored for a row."""
+        return {"LLM Program Name": program, "LLM University Name": university}
+
+    def _passed_through(self, index, row):
+        """Fields for a row that needs no model call (journaled or empty program)."""
+        if index in self.done:
+            self.counts["resumed"] += 1
+            self.metrics.observe(outcome="resumed", in_rate=False)
+            return self.done[index]
+        self.metrics.observe(outcome="empty")
+        return self._fields("", row.get("University", "Unknown"))
+
+    def _success(self, row, result, seconds):
+        """Record a successful call and return its fields."""
+        self.counts["successes"] += 1
+        self.metrics.observe(seconds, "success")
+        return self._fields(result.get("standardized_program", ""),
+                            row.get("University", "Unknown"))
+
+    def _fallback(self, index, row, error, seconds=None):
+        """Record a failed call and return the split-based fallback fields."""
+        self.counts["failures"] += 1
+        if isinstance(error, TimeoutException):
+            self.counts["timeouts"] += 1
+        self.metrics.observe(seconds, "timeout" if isinstance(error, TimeoutException)
+                             else "fallback")
+        if self.counts["failures"] <= 5:
+            self.log(f"[FALLBACK] Row {index}: {type(error).__name__}: {str(error)[:80]}")
+        program = self.llm["fallback"](row.get("Program Name", ""))[0]
+        return self._fields(program, row.get("University", "Unknown"))
+
+    def _recycle(self, index):
+        """Reload the model if RSS grew past the limit since the last load."""
+        rss, growth, reload_needed = self.memory.sample()
+        if not reload_needed:
+            return
+        self.log(f"[MEMORY] RSS {rss:.0f} MiB (+{growth:.0f} MiB) at entry {index}; "
+                 "reloading model...")
+        reload_start = time.time()
+        self.llm["unload"]()
+        freed = rss - self.memory.rebase()
+        self.llm["load"]()
+        self.counts["model_reloads"] += 1
+        self.log(f"[OK] Model reloaded in {time.time() - reload_start:.1f}s "
+                 f"(freed {freed:.0f} MiB, RSS now {self.memory.rebase():.0f} MiB)")
+
+    def _single(self, rows):
+        """Standardize on this thread with one model."""
+        self.log("[START] Loading LLM model (TinyLlama 1.1B, ~2GB)...")
+        load_start = time.time()
+        self.llm["load"]()
+        self.log(f"[OK] LLM loaded in {time.time() - load_start:.1f}s. Starting LLM phase...")
+        self.memory.rebase()
+
+        calls = 0
+        for index, row in rows:
+            program_text = row.get("Program Name", "")
+            if index in self.done or not program_text:
+                yield index, row, self._passed_through(index, row)
+                continue
+
+            calls += 1
+            if calls % self.memory_check_interval == 0:
+                self._recycle(index)
+            start = time.perf_counter()
+            try:
+                if self.timeout > 0:
+                    signal.setitimer(signal.ITIMER_REAL, self.timeout)
+                try:
+                    result = self.llm["call"](program_text)
+                finally:
+                    signal.setitimer(signal.ITIMER_REAL, 0)
+                fields = self._success(row, result, time.perf_counter() - start)
+            except (TimeoutException, RuntimeError, ValueError) as e:
+                if isinstance(e, TimeoutException):
+                    self.llm["load"]().reset()  # drop the interrupted generation's context
+                fields = self._fallback(index, row, e, time.perf_counter() - start)
+            yield index, row, fields
+
+    def _pooled(self, rows):
+        """Standardize across worker processes; outcomes come back in row order."""
+        self.log(f"[START] Starting {self.workers} LLM worker processes...")
+        pending = deque()
+
+        def model_items():
+            for index, row in rows:
+                pending.append((index, row))
+                if index not in self.done and row.get("Program Name", ""):
+                    yield index, row["Program Name"]
+
+        def passed_through():
+            # Rows ahead of the next model outcome that need no model call
+            while pending and (pending[0][0] in self.done
+                               or not pending[0][1].get("Program Name", "")):
+                index, row = pending.popleft()
+                yield index, row, self._passed_through(index, row)
+
+        outcomes = iter_standardized(model_items(), processes=self.workers,
+                                     chunk_size=self.chunk_size, timeout=self.timeout)
+        try:
+            # Per-row latency here is the gap between pool outcomes
+            last = time.perf_counter()
+            for _, result, error in outcomes:
+                now = time.perf_counter()
+                seconds, last = now - last, now
+                yield from passed_through()
+                index, row = pending.popleft()
+                if error:
+                    exc_type = TimeoutException if error.startswith(CallTimeout.__name__) \
+                        else RuntimeError
+                    yield index, row, self._fallback(index, row, exc_type(error), seconds)
+                    continue
+                yield index, row, self._success(row, result, seconds)
+            yield from passed_through()
+        finally:
+            outcomes.close()
+
+
+class ResultSink:  # pylint: disable=too-many-instance-attributes
+    """
+    Load stage: journals new results, streams merged rows to the output file
+    and optionally batches them into the database.
+
+    :param journal: Journal receiving newly standardized rows.
+    :type journal: RowJournal
+    :param writer: Streaming writer of the final JSON array.
+    :type writer: JsonArrayWriter
+    :param done: Rows already journaled (replayed on resume); not re-appended.
+    :type done: dict[int, dict]
+    :param db_loader: Optional ``insert_rows``-style callable taking a list of rows.
+    :type db_loader: Callable[[list[dict]], int] or None
+    :param db_batch: Rows per database batch.
+    :type db_batch: int
+    :param snapshot: Optional ``SnapshotWriter`` receiving every merged row.
+    :type snapshot: snapshot.SnapshotWriter or None
+    """
+
+    def __init__(self, journal, writer, done, db_loader=None, db_batch=500, snapshot=None):  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self.journal = journal
+        self.writer = writer
+        self.done = done
+        self.db_loader = db_loader
+        self.db_batch = max(1, db_batch)
+        self.snapshot = snapshot
+        self.inserted = 0
+        self._batch = []
+
+    def write(self, index, row, fields):
+        """
+        Record and emit one standardized row.
+
+        :param index: Row index in source order.
+        :type index: int
+        :param row: The cleaned row.
+        :type row: dict
+        :param fields: LLM fields for the row.
+        :type fields: dict
+        """
+        if index not in self.done:
+            self.journal.append(index, fields)
+        merged = {**row, **fields}
+        self.writer.write(merged)
+        if self.snapshot is not None:
+            self.snapshot.write(merged)
+        if self.db_loader is not None:
+            self._batch.append(merged)
+            if len(self._batch) >= self.db_batch:
+                self._flush_db()
+
+    def _flush_db(self):
+        """Insert the pending database batch."""
+        if self._batch:
+            self.inserted += self.db_loader(self._batch)
+            self._batch = []
+
+    def close(self, complete=True):
+        """
+        Flush the last database batch, sync the journal and finish the output files.
+
+        :param complete: Whether the run finished; a partial run discards the
+            snapshot so the previous complete one stays in place.
+        :type complete: bool
+        """
+        try:
+            if self.db_loader is not None:
+                self._flush_db()
+        finally:
+            self.journal.close()
+            self.writer.close()
+            if self.snapshot is not None:
+                if complete:
+                    self.snapshot.close()
+                else:
+                    self.snapshot.discard()
+
+
+def open_sink(journal_path, output_path, done, fsync_every=50, **options):
+    """
+    Build the default load stage for the CLI.
+
+    :param journal_path: Path of the results journal.
+    :type journal_path: str
+    :param output_path: Path of the final JSON array.
+    :type output_path: str
+    :param done: Rows already journaled.
+    :type done: dict[int, dict]
+    :param fsync_every: Journal rows between fsyncs.
+    :type fsync_every: int
+    :param options: ``db_loader``, ``db_batch`` and ``snapshot`` for ``ResultSink``.
+    :type options: dict
+    :return: The sink.
+    :rtype: ResultSink
+    """
+    return ResultSink(RowJournal(journal_path, fsync_every=fsync_every),
+                      JsonArrayWriter(output_path), done, **options)
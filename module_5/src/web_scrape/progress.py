@@ -0,0 +1,263 @@
+"""
+This module tracks per-stage progress for the ingestion pipeline.
+
+Every stage (scrape, clean, llm, load) records finished items in a
+``StageMetrics``: outcome counters (success, fallback, timeout, ...), a
+moving-window rate, an ETA when the total is known, and per-item latency
+percentiles. ``PipelineMetrics`` groups the stages and periodically emits one
+structured JSON log line per stage and, optionally, a Prometheus text file
+for the node_exporter textfile collector.
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+from stats_utils import PERCENTILES, percentile
+
+STAGES = ("scrape", "clean", "llm", "load")
+
+
+class StageMetrics:  # pylint: disable=too-many-instance-attributes
+    """
+    Counters, moving-window rate, ETA and latency percentiles for one stage.
+
+    :param name: Stage name used in logs and metric labels.
+    :type name: str
+    :param total: Items the stage is expected to finish, if known.
+    :type total: int or None
+    :param window: Seconds of history used for the rate and ETA.
+    :type window: float
+    :param clock: Monotonic clock (seconds); replaceable in tests.
+    :type clock: Callable[[], float]
+    """
+
+    def __init__(self, name, total=None, window=60.0, clock=time.monotonic):
+        self.name = name
+        self.total = total
+        self.window = window
+        self.clock = clock
+        self.counters = {}
+        self._lock = threading.Lock()
+        self._finished = deque()
+        self._latencies = deque(maxlen=1000)
+        self._first = None
+
+    def observe(self, seconds=None, outcome="success", in_rate=True):
+        """
+        Record one finished item.
+
+        :param seconds: Time spent on the item, if measured.
+        :type seconds: float or None
+        :param outcome: Counter to increment (``success``, ``fallback``, ``timeout``, ...).
+        :type outcome: str
+        :param in_rate: Whether the item counts toward the moving-window rate;
+            rows replayed from the journal are counted but finish instantly.
+        :type in_rate: bool
+        """
+        now = self.clock()
+        with self._lock:
+            self.counters[outcome] = self.counters.get(outcome, 0) + 1
+            if seconds is not None:
+                self._latencies.append(seconds)
+            if in_rate:
+                if self._first is None:
+                    # The first item's own latency is part of the measured span
+                    self._first = now - (seconds or 0.0)
+                self._finished.append(now)
+
+    @property
+    def count(self):
+        """
+        Items finished so far, across all outcomes.
+
+        :return: Item count.
+        :rtype: int
+        """
+        with self._lock:
+            return sum(self.counters.values())
+
+    def rate(self):
+        """
+        Items per second over the last ``window`` seconds.
+
+        :return: Moving-window rate (0.0 before the first item).
+        :rtype: float
+        """
+        now = self.clock()
+        with self._lock:
+            while self._finished and self._finished[0] < now - self.window:
+                self._finished.popleft()
+            if self._first is None:
+                return 0.0
+            span = min(self.window, now - self._first)
+            return len(self._finished) / span if span > 0 else 0.0
+
+    def eta(self):
+        """
+        Seconds until ``total`` items are finished at the current rate.
+
+        :return: Estimated seconds remaining, or None when unknown.
+        :rtype: float or None
+        """
+        rate = self.rate()
+        if self.total is None or rate <= 0:
+            return None
+        return max(0, self.total - self.count) / rate
+
+    def snapshot(self):
+        """
+        Current values as a JSON-serializable dictionary.
+
+        :return: Stage name, count, total, rate, ETA, latency percentiles (ms) and counters.
+        :rtype: dict
+        """
+        rate, eta = self.rate(), self.eta()
+        with self._lock:
+            latencies = sorted(self._latencies)
+            counters = dict(self.counters)
+        snap = {
+            "stage": self.name,
+            "count": sum(counters.values()),
+            "total": self.total,
+            "rate_per_s": round(rate, 3),
+            "eta_s": None if eta is None else round(eta, 1),
+        }
+        for pct in PERCENTILES:
+            snap[f"latency_p{pct}_ms"] = round(percentile(latencies, pct) * 1000, 2)
+        snap["counters"] = counters
+        return snap
+
+
+def _label(value):
+    """Escape a Prometheus label value."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class PipelineMetrics:  # pylint: disable=too-many-instance-attributes
+    """
+    Groups the stage metrics and reports them periodically.
+
+    :param interval: Seconds between reports while running (0 = only on ``stop``).
+    :type interval: float
+    :param textfile: Prometheus text file rewritten on each report, if set.
+    :type textfile: str or None
+    :param emit: Receives one JSON line per stage per report.
+    :type emit: Callable[[str], None]
+    :param window: Seconds of history used for rates and ETAs.
+    :type window: float
+    :param gauges: Returns process-wide values (e.g. ``{"rss_mb": ...}``) added to each report.
+    :type gauges: Callable[[], dict] or None
+    """
+
+    def __init__(self, interval=30.0, textfile=None, emit=print, window=60.0,  # pylint: disable=too-many-arguments,too-many-positional-arguments
+                 gauges=None):
+        self.interval = interval
+        self.textfile = textfile
+        self.emit = emit
+        self.gauges = gauges
+        self.window = window
+        self.stages = {name: StageMetrics(name, window=window) for name in STAGES}
+        self._stop = threading.Event()
+        self._reporter = None
+
+    def stage(self, name):
+        """
+        Metrics for one stage, created on first use.
+
+        :param name: Stage name.
+        :type name: str
+        :return: The stage's metrics.
+        :rtype: StageMetrics
+        """
+        if name not in self.stages:
+            self.stages[name] = StageMetrics(name, window=self.window)
+        return self.stages[name]
+
+    def set_total(self, total):
+        """
+        Set the expected item count for every stage (once the source knows it).
+
+        :param total: Number of rows the run will process.
+        :type total: int
+        """
+        for stage in self.stages.values():
+            stage.total = total
+
+    def report(self):
+        """Emit one JSON line per stage and rewrite the Prometheus text file."""
+        timestamp = datetime.now().isoformat(timespec="seconds")
+        snapshots = [stage.snapshot() for stage in self.stages.values()]
+        for snap in snapshots:
+            self.emit(json.dumps({"ts": timestamp, "event": "stage_progress", **snap}))
+        gauges = self.gauges() if self.gauges else {}
+        if gauges:
+            self.emit(json.dumps({"ts": timestamp, "event": "process", **gauges}))
+        if self.textfile:
+            self.write_textfile(self.textfile, snapshots, gauges)
+
+    @staticmethod
+    def write_textfile(path, snapshots, gauges=None):
+        """
+        Atomically write stage snapshots in the Prometheus text exposition format.
+
+        :param path: Destination ``.prom`` file.
+        :type path: str
+        :param snapshots: Results of ``StageMetrics.snapshot``.
+        :type snapshots: list[dict]
+        :param gauges: Process-wide values, written as ``pipeline_<name>`` gauges.
+        :type gauges: dict or None
+        """
+        lines = [
+            "# HELP pipeline_items_total Items finished per stage and outcome.",
+            "# TYPE pipeline_items_total counter",
+        ]
+        for snap in snapshots:
+            for outcome, value in sorted(snap["counters"].items()):
+                lines.append(f'pipeline_items_total{{stage="{_label(snap["stage"])}",'
+                             f'outcome="{_label(outcome)}"}} {value}')
+        lines += ["# HELP pipeline_rate_items_per_second Moving-window throughput.",
+                  "# TYPE pipeline_rate_items_per_second gauge"]
+        lines += [f'pipeline_rate_items_per_second{{stage="{_label(snap["stage"])}"}} '
+                  f'{snap["rate_per_s"]}' for snap in snapshots]
+        lines += ["# HELP pipeline_eta_seconds Estimated seconds until the stage finishes.",
+                  "# TYPE pipeline_eta_seconds gauge"]
+        lines += [f'pipeline_eta_seconds{{stage="{_label(snap["stage"])}"}} {snap["eta_s"]}'
+                  for snap in snapshots if snap["eta_s"] is not None]
+        lines += ["# HELP pipeline_item_latency_seconds Per-item latency percentiles.",
+                  "# TYPE pipeline_item_latency_seconds gauge"]
+        for snap in snapshots:
+            for pct in PERCENTILES:
+                seconds = snap[f"latency_p{pct}_ms"] / 1000
+                lines.append(f'pipeline_item_latency_seconds{{stage="{_label(snap["stage"])}",'
+                             f'quantile="{pct / 100:g}"}} {seconds:g}')
+        for name, value in sorted((gauges or {}).items()):
+            lines += [f"# TYPE pipeline_{name} gauge", f"pipeline_{name} {value}"]
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            file.write("\n".join(lines) + "\n")
+        os.replace(tmp_path, path)
+
+    def start(self):
+        """Start the periodic reporter thread (no-op when ``interval`` is 0)."""
+        if self.interval > 0 and self._reporter is None:
+            self._stop.clear()
+            self._reporter = threading.Thread(target=self._run, name="pipeline-metrics",
+                                              daemon=True)
+            self._reporter.start()
+
+    def _run(self):
+        """Reporter loop: report every ``interval`` seconds until stopped."""
+        while not self._stop.wait(self.interval):
+            self.report()
+
+    def stop(self):
+        """Stop the reporter and emit a final report."""
+        if self._reporter is not None:
+            self._stop.set()
+            self._reporter.join()
+            self._reporter = None
+        self.report()
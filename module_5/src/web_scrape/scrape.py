@@ -8,8 +8,9 @@ Step 3 requirements by externalizing data collection from the application core.
 """
 import json
 import os
-from urllib import parse, request, error
-from bs4 import BeautifulSoup
+import textwrap
+import threading
+from urllib import parse
 
 URL = "https://www.thegradcafe.com/survey/"
 
@@ -57,19 +58,24 @@ def _parse_row_content(row, results, current_index):
     return data, j
 
 
-def scrape_data(start_page=1, end_page=2500):
+def iter_entries(start_page=1, end_page=2500):
     """
-    Scrapes survey data from The GradCafe website for a range of pages.
+    Yields scraped survey entries one at a time, page by page.
+
+    Lets downstream stages start cleaning while later pages are still being
+    fetched.
 
     :param start_page: The first page to start scraping from.
     :type start_page: int
     :param end_page: The last page to scrape.
     :type end_page: int
-    :return: Dictionary containing all scraped entries keyed by entry ID.
-    :rtype: dict
+    :return: Iterator over entry dictionaries in page order.
+    :rtype: Iterator[dict]
     """
-    raw_entries = {}
-    entry_id = 0
+    # Imported here so that loading JSON (load_data, the web app) never pays
+    # for BeautifulSoup or the HTTP/SSL stack
+    from urllib import request, error  # pylint: disable=import-outside-toplevel
+    from bs4 import BeautifulSoup  # pylint: disable=import-outside-toplevel
 
     for page_num in range(start_page, end_page + 1):
         page_url = parse.urljoin(URL, f"?page={page_num}")
@@ -87,15 +93,26 @@ def scrape_data(start_page=1, end_page=2500):
             while idx < len(results):
                 row_data, next_idx = _parse_row_content(results[idx], results, idx)
                 if row_data:
-                    entry_id += 1
                     row_data.update({"page": page_num, "url": page_url})
-                    raw_entries[entry_id] = row_data
+                    yield row_data
                 idx = next_idx
 
         except error.HTTPError as err:
             print(f"HTTP Error {err.code} on page {page_num}: {err.reason}")
 
-    return raw_entries
+
+def scrape_data(start_page=1, end_page=2500):
+    """
+    Scrapes survey data from The GradCafe website for a range of pages.
+
+    :param start_page: The first page to start scraping from.
+    :type start_page: int
+    :param end_page: The last page to scrape.
+    :type end_page: int
+    :return: Dictionary containing all scraped entries keyed by entry ID.
+    :rtype: dict
+    """
+    return dict(enumerate(iter_entries(start_page, end_page), start=1))
 
 
 def save_data(data, filename="raw_data/raw.json"):
@@ -117,6 +134,58 @@ def save_data(data, filename="raw_data/raw.json"):
         json.dump(data, file, indent=2, ensure_ascii=False)
 
 
+class RawDataWriter:
+    """
+    Streams scraped entries into a raw JSON file as they arrive.
+
+    The layout matches ``save_data`` on the output of ``scrape_data`` (entries
+    keyed ``"1"``, ``"2"``, ...). Entries go to ``<filename>.tmp``, which
+    replaces ``filename`` on ``close``; an interrupted scrape therefore still
+    leaves a valid file holding every entry seen so far. ``write`` and
+    ``close`` may be called from different threads.
+
+    :param filename: Destination JSON file.
+    :type filename: str
+    """
+
+    def __init__(self, filename="raw_data/raw.json"):
+        os.makedirs(os.path.dirname(filename) or ".", exist_ok=True)
+        self.filename = filename
+        self.tmp_path = f"{filename}.tmp"
+        self.count = 0
+        self._lock = threading.Lock()
+        self._file = open(self.tmp_path, "w", encoding="utf-8")  # pylint: disable=consider-using-with
+
+    def write(self, entry):
+        """
+        Append one entry; ignored once the writer is closed.
+
+        :param entry: Scraped entry dictionary.
+        :type entry: dict
+        """
+        item = textwrap.indent(json.dumps(entry, indent=2, ensure_ascii=False), "  ")
+        with self._lock:
+            if self._file.closed:
+                return
+            self.count += 1
+            prefix = "{\n" if self.count == 1 else ",\n"
+            self._file.write(f'{prefix}  "{self.count}": {item.lstrip()}')
+
+    def close(self):
+        """
+        Terminate the object and move the file into place.
+
+        :return: Number of entries written.
+        :rtype: int
+        """
+        with self._lock:
+            if not self._file.closed:
+                self._file.write("\n}" if self.count else "{}")
+                self._file.close()
+                os.replace(self.tmp_path, self.filename)
+        return self.count
+
+
 if __name__ == "__main__":
     scraped_results = scrape_data(start_page=1, end_page=5)
     save_data(scraped_results)
\ No newline at end of file
@@ -0,0 +1,378 @@
+"""
+This module writes and reads columnar snapshots of cleaned applicant rows.
+
+The JSON artifacts (``applicant_data.json``, ``llm_extended_applicant_data.json``)
+must be parsed whole to read even one field. A snapshot stores every field as
+its own column instead, so a reader loads only the columns it asks for, mapped
+from disk rather than parsed. Two formats are supported:
+
+* ``parquet`` -- one Parquet file written with pyarrow (dictionary-encoded
+  text, compressed pages). Used by default when pyarrow is installed.
+* ``npy`` -- a directory with ``schema.json`` and one ``.npy`` array per
+  column part. Scores are float64 with NaN for missing values. Text is
+  dictionary-encoded: int32 codes (-1 for missing) into the distinct values,
+  stored as one UTF-8 byte blob plus int64 offsets. Every array is opened
+  with ``mmap_mode="r"``.
+
+Snapshots are written to ``<path>.tmp`` and moved into place on ``close``;
+``discard`` drops an unfinished one and leaves the previous snapshot alone.
+"""
+import json
+import math
+import os
+import shutil
+from array import array
+import numpy as np
+
+# Cleaned fields in clean_entry order, and the fields added by the LLM stage
+CLEAN_FIELDS = (
+    "Program Name", "University", "Comments", "date_added", "URL", "Applicant Status",
+    "Decision Date", "Program Start Date", "Citizenship", "GRE Score", "GRE V Score",
+    "Degree Program", "GPA", "GRE AW"
+)
+LLM_FIELDS = CLEAN_FIELDS + ("LLM Program Name", "LLM University Name")
+FLOAT_FIELDS = frozenset(["GPA", "GRE Score", "GRE V Score", "GRE AW"])
+
+SCHEMA_FILE = "schema.json"
+FORMAT_VERSION = 1
+
+
+def _pyarrow():
+    """Return ``(pyarrow, pyarrow.parquet)``, or None when pyarrow is not installed."""
+    try:
+        import pyarrow  # pylint: disable=import-outside-toplevel
+        import pyarrow.parquet  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        return None
+    return pyarrow, pyarrow.parquet
+
+
+def default_format():
+    """
+    Returns the format used when none is requested.
+
+    :return: ``"parquet"`` if pyarrow is importable, otherwise ``"npy"``.
+    :rtype: str
+    """
+    return "parquet" if _pyarrow() else "npy"
+
+
+def _score(value):
+    """Float value of a score, NaN when missing or unparseable."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def _replace(tmp_path, path):
+    """Move a finished file or directory over ``path``."""
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+    os.replace(tmp_path, path)
+
+
+class _TextColumn:  # pylint: disable=too-few-public-methods
+    """Dictionary encoder for one text column."""
+
+    def __init__(self):
+        self.codes = array("i")
+        self.values = []
+        self._index = {}
+
+    def append(self, value):
+        """Encode one value (None is stored as code -1)."""
+        if value is None:
+            self.codes.append(-1)
+            return
+        value = str(value)
+        code = self._index.get(value)
+        if code is None:
+            code = self._index[value] = len(self.values)
+            self.values.append(value)
+        self.codes.append(code)
+
+
+class SnapshotWriter:
+    """
+    Buffers rows column by column and writes them as a snapshot on ``close``.
+
+    Text is dictionary-encoded while rows arrive, so the buffer holds integer
+    codes and one copy of each distinct value rather than the row dicts.
+
+    :param out_path: Destination file (parquet) or directory (npy).
+    :type out_path: str
+    :param fields: Row keys to store, in column order.
+    :type fields: Sequence[str]
+    :param fmt: ``"parquet"``, ``"npy"`` or None for ``default_format()``.
+    :type fmt: str or None
+    :raises ValueError: If the format is unknown or parquet is requested without pyarrow.
+    """
+
+    def __init__(self, out_path, fields=LLM_FIELDS, fmt=None):
+        fmt = fmt or default_format()
+        if fmt not in ("parquet", "npy"):
+            raise ValueError(f"unknown snapshot format: {fmt}")
+        if fmt == "parquet" and _pyarrow() is None:
+            raise ValueError("the parquet snapshot format needs pyarrow")
+        self.out_path = out_path
+        self.tmp_path = f"{out_path}.tmp"
+        self.format = fmt
+        self.fields = tuple(fields)
+        self.count = 0
+        self._columns = {
+            name: array("d") if name in FLOAT_FIELDS else _TextColumn() for name in self.fields
+        }
+        self._closed = False
+
+    def write(self, row):
+        """
+        Append one row; missing keys are stored as missing values.
+
+        :param row: Cleaned (optionally LLM-extended) row.
+        :type row: dict
+        """
+        for name, column in self._columns.items():
+            value = row.get(name)
+            column.append(_score(value) if name in FLOAT_FIELDS else value)
+        self.count += 1
+
+    def close(self):
+        """
+        Write the snapshot and move it into place.
+
+        :return: Number of rows written.
+        :rtype: int
+        """
+        if not self._closed:
+            if self.format == "parquet":
+                self._write_parquet()
+            else:
+                self._write_npy()
+            _replace(self.tmp_path, self.out_path)
+            self._closed = True
+        return self.count
+
+    def discard(self):
+        """Drop the buffered rows and any leftover ``<path>.tmp``, keeping ``out_path`` as is."""
+        if not self._closed:
+            if os.path.isdir(self.tmp_path):
+                shutil.rmtree(self.tmp_path)
+            elif os.path.exists(self.tmp_path):
+                os.remove(self.tmp_path)
+            self._columns = {}
+            self._closed = True
+
+    def _write_parquet(self):
+        """Write one Parquet file with dictionary-encoded text columns."""
+        pa, pq = _pyarrow()
+        arrays = []
+        for name in self.fields:
+            column = self._columns[name]
+            if name in FLOAT_FIELDS:
+                values = np.frombuffer(column, dtype=np.float64)
+                arrays.append(pa.array(values, mask=np.isnan(values)))
+            else:
+                codes = np.frombuffer(column.codes, dtype=np.int32)
+                indices = pa.array(codes, type=pa.int32(), mask=codes < 0)
+                arrays.append(pa.DictionaryArray.from_arrays(
+                    indices, pa.array(column.values, type=pa.string())))
+        pq.write_table(pa.Table.from_arrays(arrays, names=list(self.fields)), self.tmp_path)
+
+    def _write_npy(self):
+        """Write one directory of ``.npy`` arrays plus ``schema.json``."""
+        if os.path.isdir(self.tmp_path):
+            shutil.rmtree(self.tmp_path)
+        os.makedirs(self.tmp_path)
+        columns = []
+        for i, name in enumerate(self.fields):
+            column, stem = self._columns[name], os.path.join(self.tmp_path, f"c{i}")
+            if name in FLOAT_FIELDS:
+                np.save(f"{stem}.npy", np.frombuffer(column, dtype=np.float64))
+                columns.append({"name": name, "kind": "float", "file": f"c{i}"})
+                continue
+            encoded = [v.encode("utf-8") for v in column.values]
+            offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+            np.cumsum(np.fromiter(map(len, encoded), np.int64, len(encoded)), out=offsets[1:])
+            np.save(f"{stem}.codes.npy", np.frombuffer(column.codes, dtype=np.int32))
+            np.save(f"{stem}.blob.npy", np.frombuffer(b"".join(encoded), dtype=np.uint8))
+            np.save(f"{stem}.offsets.npy", offsets)
+            columns.append({"name": name, "kind": "text", "file": f"c{i}"})
+        schema = {"format": "npy", "version": FORMAT_VERSION, "rows": self.count,
+                  "columns": columns}
+        with open(os.path.join(self.tmp_path, SCHEMA_FILE), "w", encoding="utf-8") as f:
+            json.dump(schema, f, indent=4)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+
+def write_snapshot(rows, out_path, fields=LLM_FIELDS, fmt=None):
+    """
+    Write ``rows`` as a snapshot.
+
+    :param rows: Cleaned (optionally LLM-extended) rows.
+    :type rows: Iterable[dict]
+    :param out_path: Destination file (parquet) or directory (npy).
+    :type out_path: str
+    :param fields: Row keys to store, in column order.
+    :type fields: Sequence[str]
+    :param fmt: ``"parquet"``, ``"npy"`` or None for ``default_format()``.
+    :type fmt: str or None
+    :return: Number of rows written.
+    :rtype: int
+    """
+    writer = SnapshotWriter(out_path, fields, fmt)
+    for row in rows:
+        writer.write(row)
+    return writer.close()
+
+
+class Snapshot:
+    """
+    A snapshot opened for reading, restricted to the projected columns.
+
+    Use ``read_snapshot`` to open one. Float columns come back as float64
+    arrays with NaN for missing values; text columns as ``(codes, values)``
+    where ``codes`` is an int32 array (-1 for missing) into ``values``.
+    """
+
+    def __init__(self, path, fmt, num_rows, kinds, loaders):  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self.path = path
+        self.format = fmt
+        self.num_rows = num_rows
+        self.kinds = kinds
+        self._loaders = loaders
+        self._loaded = {}
+
+    def __len__(self):
+        return self.num_rows
+
+    @property
+    def columns(self):
+        """Projected column names, in file order."""
+        return list(self.kinds)
+
+    def _load(self, name):
+        """Column data, loaded on first access."""
+        if name not in self.kinds:
+            raise KeyError(f"column not in snapshot projection: {name}")
+        if name not in self._loaded:
+            self._loaded[name] = self._loaders[name]()
+        return self._loaded[name]
+
+    def floats(self, name):
+        """
+        Float column as a (memory-mapped, for npy) float64 array.
+
+        :param name: Column name.
+        :type name: str
+        :return: Values with NaN for missing.
+        :rtype: numpy.ndarray
+        """
+        return self._load(name)
+
+    def dictionary(self, name):
+        """
+        Dictionary-encoded text column.
+
+        :param name: Column name.
+        :type name: str
+        :return: ``(codes, values)``; code -1 marks a missing value.
+        :rtype: tuple[numpy.ndarray, list[str]]
+        """
+        return self._load(name)
+
+    def rows(self):
+        """
+        Rebuild row dicts over the projected columns (None for missing values).
+
+        :return: Iterator of rows in file order.
+        :rtype: Iterator[dict]
+        """
+        columns = []
+        for name, kind in self.kinds.items():
+            if kind == "float":
+                values = self.floats(name)
+                columns.append([None if math.isnan(v) else v for v in values.tolist()])
+            else:
+                codes, values = self.dictionary(name)
+                lookup = values + [None]  # code -1 picks the trailing None
+                columns.append([lookup[c] for c in codes.tolist()])
+        names = list(self.kinds)
+        for values in zip(*columns):
+            yield dict(zip(names, values))
+
+
+def _open_npy(path, columns):
+    """Open an npy snapshot directory; every array is memory-mapped."""
+    with open(os.path.join(path, SCHEMA_FILE), "r", encoding="utf-8") as f:
+        schema = json.load(f)
+    entries = {c["name"]: c for c in schema["columns"]}
+
+    def load(entry):
+        stem = os.path.join(path, entry["file"])
+        if entry["kind"] == "float":
+            return np.load(f"{stem}.npy", mmap_mode="r")
+        blob = np.load(f"{stem}.blob.npy", mmap_mode="r")
+        offsets = np.load(f"{stem}.offsets.npy", mmap_mode="r").tolist()
+        data = blob.tobytes()
+        values = [data[offsets[i]:offsets[i + 1]].decode("utf-8")
+                  for i in range(len(offsets) - 1)]
+        return np.load(f"{stem}.codes.npy", mmap_mode="r"), values
+
+    names = [n for n in entries if columns is None or n in columns]
+    return Snapshot(path, "npy", schema["rows"],
+                    {n: entries[n]["kind"] for n in names},
+                    {n: (lambda e=entries[n]: load(e)) for n in names})
+
+
+def _open_parquet(path, columns):
+    """Open a Parquet snapshot memory-mapped, reading only the projected columns."""
+    modules = _pyarrow()
+    if modules is None:
+        raise ValueError(f"{path} is a parquet snapshot; reading it needs pyarrow")
+    pa, pq = modules
+    schema = pq.read_schema(path)
+    names = [n for n in schema.names if columns is None or n in columns]
+    table = pq.read_table(path, columns=names, memory_map=True)
+
+    def load(name):
+        column = table.column(name)
+        if pa.types.is_floating(column.type):
+            return column.fill_null(math.nan).to_numpy()
+        column = column.combine_chunks()
+        if not pa.types.is_dictionary(column.type):
+            column = column.dictionary_encode()
+        codes = column.indices.fill_null(-1).to_numpy(zero_copy_only=False).astype(np.int32)
+        return codes, column.dictionary.to_pylist()
+
+    kinds = {n: "float" if pa.types.is_floating(schema.field(n).type) else "text" for n in names}
+    return Snapshot(path, "parquet", table.num_rows, kinds,
+                    {n: (lambda n=n: load(n)) for n in names})
+
+
+def read_snapshot(path, columns=None):
+    """
+    Open a snapshot, reading only ``columns``.
+
+    :param path: Snapshot file (parquet) or directory (npy).
+    :type path: str
+    :param columns: Column names to project; None reads every column. Names
+        the snapshot does not have are ignored.
+    :type columns: Iterable[str] or None
+    :return: The opened snapshot.
+    :rtype: Snapshot
+    :raises ValueError: If the snapshot is parquet and pyarrow is missing.
+    :raises OSError: If the snapshot cannot be read.
+    """
+    columns = None if columns is None else set(columns)
+    if os.path.isdir(path):
+        return _open_npy(path, columns)
+    return _open_parquet(path, columns)
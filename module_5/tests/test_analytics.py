@@ -0,0 +1,199 @@
+import pytest
+from contextlib import contextmanager
+from datetime import date
+from decimal import Decimal
+
+np = pytest.importorskip("numpy")
+
+import analytics
+import src.query_data as query_data
+from analytics import ApplicantSnapshot
+from config import Config
+
+JSON_PATH = "src/web_scrape/raw_data/applicant_data.json"
+
+
+def row(p_id, program, status, term, citizenship, degree, gpa=None, gre=None,
+        added=date(2026, 2, 1), llm=("", "")):
+    """One snapshot row tuple in SNAPSHOT_COLUMNS order."""
+    return (p_id, added, program, status, term, citizenship, degree, llm[0], llm[1],
+            gpa, gre, None, None)
+
+
+ROWS = [
+    row(1, "Stanford University - Computer Science", "Accepted", "Fall 2026", "American", "PhD",
+        gpa=3.9, gre=330, llm=("Computer Science", "Stanford University")),
+    row(2, "MIT - Computer Science", "Accepted", "Fall 2026", "International", "PhD",
+        gpa=3.8, llm=("Computer Science", "Unknown")),
+    row(3, "Johns Hopkins University - Computer Science", "Rejected", "Fall 2025", "American",
+        "Masters"),
+    row(4, "Stanford University - Economics", "Accepted", "Fall 2025", "International", "PhD",
+        gpa=3.5, added=date(2025, 12, 1)),
+    row(5, "Computer Science", "Accepted", "Fall 2026", None, None, gpa=3.7),
+]
+
+
+def test_metrics_on_known_rows():
+    """
+    Verifies every analysis metric on a handful of rows, including NULL
+    handling, ILIKE-style matching, half-up rounding and the top university.
+
+
+    :return: None.
+    :rtype: None
+    """
+    snapshot = ApplicantSnapshot()
+    assert snapshot.append(ROWS) == 5 and snapshot.last_id == 5
+
+    results = snapshot.metrics()
+
+    assert results["fall_2026_app_count"] == 3
+    assert results["percent_international"] == Decimal("40.00")
+    assert results["avg_gpa"] == Decimal("3.73")  # 3.725 rounds half up, unlike round()
+    assert results["avg_gre"] == Decimal("330.00")
+    assert results["avg_gre_v"] is None
+    assert results["avg_gpa_american_fall_2026"] == Decimal("3.90")
+    assert results["percent_accepted_fall_2025"] == Decimal("50.00")
+    assert results["avg_gpa_fall_2026_acceptances"] == Decimal("3.80")
+    assert results["jhu_cs_masters_count"] == 1
+    assert results["num_entries_phd_cs_specified_schools"] == 2
+    assert results["llm_variance"] == 1
+    assert results["rejected_missing_gpa"] == 1
+    assert (results["top_university"], results["top_count"]) == ("Stanford University", 2)
+
+
+def test_empty_snapshot_matches_sql_nulls():
+    """
+    Verifies that an empty snapshot reports zero counts and NULL averages
+    and percentages, as the SQL aggregates do on an empty table.
+
+
+    :return: None.
+    :rtype: None
+    """
+    results = ApplicantSnapshot().metrics()
+    assert results["fall_2026_app_count"] == 0
+    assert results["percent_international"] is None
+    assert results["avg_gpa"] is None
+    assert (results["top_university"], results["top_count"]) == (None, 0)
+
+
+def test_from_json_maps_entries_like_load_data():
+    """
+    Verifies that a cleaned JSON file is loaded with load_data's column
+    mapping, skipping duplicate URLs, and agrees with a row-by-row count.
+
+
+    :return: None.
+    :rtype: None
+    """
+    snapshot = ApplicantSnapshot.from_json(JSON_PATH)
+    results = snapshot.metrics()
+
+    codes = snapshot.text["term"].codes
+    assert len(snapshot) == len(codes) == snapshot.last_id
+    terms = [snapshot.text["term"].values[c] for c in codes]
+    assert results["fall_2026_app_count"] == terms.count("Fall 2026")
+    gpas = snapshot.scores["gpa"]
+    assert results["avg_gpa"] == analytics._round2(float(np.nanmean(gpas)))
+
+
+def test_refresh_fetches_only_new_rows(monkeypatch):
+    """
+    Verifies that refresh asks for rows above the last loaded p_id and appends
+    them, so dictionary codes of earlier rows are unchanged.
+
+
+    :param monkeypatch: Pytest fixture for replacing the connection pool.
+    :type monkeypatch: _pytest.monkeypatch.MonkeyPatch
+    :return: None.
+    :rtype: None
+    """
+    table = list(ROWS[:3])
+    seen = []
+
+    class Cursor:
+        rowcount = 0
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *args):
+            return False
+
+        def execute(self, stmt, params=None, prepare=None):
+            seen.append(params)
+            self.rows = [r for r in table if r[0] > params[0]]
+
+        def fetchall(self):
+            return self.rows
+
+    class Connection:
+        def cursor(self):
+            return Cursor()
+
+    @contextmanager
+    def pooled_connection():
+        yield Connection()
+
+    monkeypatch.setattr(analytics, "pooled_connection", pooled_connection)
+    snapshot = ApplicantSnapshot()
+    assert snapshot.refresh() == 3
+    codes = snapshot.text["program"].codes.copy()
+
+    table.extend(ROWS[3:])
+    assert snapshot.refresh() == 2
+    assert snapshot.refresh() == 0
+    assert seen == [(0,), (3,), (5,)]
+    assert (snapshot.text["program"].codes[:3] == codes).all()
+    assert snapshot.metrics()["fall_2026_app_count"] == 3
+
+
+@pytest.mark.web
+def test_analysis_page_uses_numpy_backend(client, monkeypatch):
+    """
+    Verifies that ANALYTICS_BACKEND=numpy routes the analysis page to the
+    snapshot metrics instead of the SQL statements.
+
+
+    :param client: Flask test client.
+    :type client: flask.testing.FlaskClient
+    :param monkeypatch: Pytest fixture for selecting the backend.
+    :type monkeypatch: _pytest.monkeypatch.MonkeyPatch
+    :return: None.
+    :rtype: None
+    """
+    snapshot = ApplicantSnapshot()
+    snapshot.append(ROWS)
+    monkeypatch.setattr(Config, "ANALYTICS_BACKEND", "numpy")
+    monkeypatch.setattr(analytics, "run_queries", snapshot.metrics)
+    monkeypatch.setattr("src.web_app.app.views.run_queries",
+                        lambda: pytest.fail("SQL backend used"))
+
+    response = client.get("/analysis")
+    assert response.status_code == 200
+    assert b"Stanford University" in response.data
+
+
+@pytest.mark.db
+def test_numpy_backend_matches_sql():
+    """
+    Verifies parity of every analysis metric between the SQL statements and
+    a snapshot loaded from the same database.
+
+
+    :return: None.
+    :rtype: None
+    """
+    expected = query_data.run_queries()
+    snapshot = ApplicantSnapshot()
+    snapshot.refresh()
+    results = snapshot.metrics()
+
+    # Ties for the top university are ordered arbitrarily by PostgreSQL
+    assert results.pop("top_count") == expected.pop("top_count")
+    top_sql, top_np = expected.pop("top_university"), results.pop("top_university")
+    if top_sql != top_np:
+        assert top_np is not None and top_sql is not None
+    for name, value in expected.items():
+        assert results[name] == value, name
@@ -0,0 +1,201 @@
+import json
+import sys
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+# Keep the heavy llama.cpp / Hugging Face imports out of the unit tests
+sys.modules.setdefault("llama_cpp", MagicMock())
+sys.modules.setdefault("huggingface_hub", MagicMock())
+
+import src.web_scrape.llm_hosting.app as llm_app
+from src.web_scrape.llm_hosting.batching import BatchScheduler, QueueFullError
+
+
+class GatedHandler:
+    """Handler that blocks until released and records every call."""
+
+    def __init__(self):
+        self.calls = []
+        self.release = threading.Event()
+
+    def __call__(self, text):
+        self.release.wait(5)
+        if text == "boom":
+            raise ValueError("model failed")
+        self.calls.append(text)
+        return {"standardized_program": text.upper()}
+
+
+@pytest.fixture
+def gated():
+    """
+    Yields a scheduler whose handler waits for release, then stops it.
+
+
+    :return: Scheduler and its handler.
+    :rtype: tuple
+    """
+    handler = GatedHandler()
+    scheduler = BatchScheduler(handler, max_batch=4, max_wait=0.05, max_queue=6)
+    yield scheduler, handler
+    handler.release.set()
+    scheduler.stop(timeout=5)
+
+
+def test_batches_dedupe_and_resolve_futures(gated):
+    """
+    Verifies that queued jobs are grouped into batches, identical texts run the
+    handler once, and handler errors reach only their own futures.
+
+
+    :param gated: Scheduler with a gated handler.
+    :type gated: tuple
+    :return: None.
+    :rtype: None
+    """
+    scheduler, handler = gated
+    first = scheduler.submit("warmup")  # occupies the worker until released
+    futures = scheduler.submit_many(["econ", "econ", "boom", "cs"])
+    handler.release.set()
+
+    assert first.result(5) == {"standardized_program": "WARMUP"}
+    assert [f.result(5)["standardized_program"] for f in (futures[0], futures[1], futures[3])] == [
+        "ECON", "ECON", "CS"
+    ]
+    with pytest.raises(ValueError):
+        futures[2].result(5)
+    assert handler.calls.count("econ") == 1
+
+    scheduler.stop(timeout=5)
+    stats = scheduler.stats()
+    assert stats["submitted"] == 5
+    assert stats["batched_jobs"] == 5
+    assert stats["batches"] < 5
+    assert stats["latency_p50_ms"] > 0
+
+
+def test_full_queue_rejects_whole_request_and_skips_cancelled(gated):
+    """
+    Verifies backpressure: a request that does not fit is rejected as a whole,
+    its partially queued jobs are cancelled and never reach the handler.
+
+
+    :param gated: Scheduler with a gated handler.
+    :type gated: tuple
+    :return: None.
+    :rtype: None
+    """
+    scheduler, handler = gated
+    scheduler.submit("warmup")
+    while scheduler.stats()["queue_depth"]:  # worker holds "warmup"
+        pass
+    kept = scheduler.submit_many(["a", "b"])
+
+    with pytest.raises(QueueFullError):
+        scheduler.submit_many([f"x{i}" for i in range(10)])
+
+    handler.release.set()
+    assert [f.result(5)["standardized_program"] for f in kept] == ["A", "B"]
+    scheduler.stop(timeout=5)
+    assert not any(call.startswith("x") for call in handler.calls)
+    assert scheduler.stats()["rejected"] == 1
+    assert scheduler.stats()["cancelled"] == 4
+
+
+def test_standardize_route_uses_scheduler_and_returns_429(gated, monkeypatch):
+    """
+    Verifies that /standardize answers through the batching scheduler and
+    returns 429 with Retry-After only when the queue is already full.
+
+
+    :param gated: Scheduler with a gated handler.
+    :type gated: tuple
+    :param monkeypatch: Pytest fixture for swapping the scheduler.
+    :type monkeypatch: _pytest.monkeypatch.MonkeyPatch
+    :return: None.
+    :rtype: None
+    """
+    scheduler = BatchScheduler(
+        lambda text: {"standardized_program": text.title(), "standardized_university": "Unknown"},
+        max_queue=2,
+    )
+    monkeypatch.setattr(llm_app, "_SCHEDULER", scheduler)
+    client = llm_app.app.test_client()
+
+    response = client.post("/standardize", json=[{"program": "economics"}])
+    assert response.status_code == 200
+    assert response.get_json()["rows"][0]["llm-generated-program"] == "Economics"
+    scheduler.stop(timeout=5)
+
+    full, handler = gated
+    full.submit("warmup")
+    while full.stats()["queue_depth"]:  # worker holds "warmup"
+        pass
+    kept = full.submit_many([f"q{i}" for i in range(6)])
+    monkeypatch.setattr(llm_app, "_SCHEDULER", full)
+
+    response = client.post("/standardize", json=[{"program": "economics"}])
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "1"
+    assert client.get("/metrics").get_json()["batching"]["rejected"] == 1
+
+    handler.release.set()
+    assert len([f.result(5) for f in kept]) == 6
+
+
+def test_standardize_accepts_payload_larger_than_queue(monkeypatch):
+    """
+    Verifies that a request with more rows than BATCH_QUEUE_SIZE is queued in
+    windows and answered in full, in input order, instead of getting 429.
+
+
+    :param monkeypatch: Pytest fixture for swapping the scheduler.
+    :type monkeypatch: _pytest.monkeypatch.MonkeyPatch
+    :return: None.
+    :rtype: None
+    """
+    scheduler = BatchScheduler(
+        lambda text: {"standardized_program": text, "standardized_university": "Unknown"},
+        max_queue=llm_app.BATCH_QUEUE_SIZE,
+    )
+    monkeypatch.setattr(llm_app, "_SCHEDULER", scheduler)
+    client = llm_app.app.test_client()
+    rows = [{"program": f"p{i}"} for i in range(llm_app.BATCH_QUEUE_SIZE + 44)]
+
+    response = client.post("/standardize", json=rows)
+    scheduler.stop(timeout=5)
+
+    assert response.status_code == 200
+    out = response.get_json()["rows"]
+    assert [row["llm-generated-program"] for row in out] == [row["program"] for row in rows]
+    assert scheduler.stats()["rejected"] == 0
+
+
+def test_stuck_handler_times_out_with_504(gated, monkeypatch):
+    """
+    Verifies that /standardize stops waiting after LLM_TIMEOUT with a 504, and
+    that a streaming request ends with an error line instead of waiting on
+    every remaining row.
+
+
+    :param gated: Scheduler with a gated handler that is never released.
+    :type gated: tuple
+    :param monkeypatch: Pytest fixture for swapping the scheduler and timeout.
+    :type monkeypatch: _pytest.monkeypatch.MonkeyPatch
+    :return: None.
+    :rtype: None
+    """
+    scheduler, _ = gated
+    monkeypatch.setattr(llm_app, "_SCHEDULER", scheduler)
+    monkeypatch.setattr(llm_app, "LLM_TIMEOUT", 0.05)
+    client = llm_app.app.test_client()
+
+    response = client.post("/standardize", json=[{"program": "econ"}])
+    assert response.status_code == 504
+    assert "no result within 0.05s" in response.get_json()["error"]
+
+    response = client.post("/standardize?stream=1", json=[{"program": "a"}, {"program": "b"}])
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert lines == [{"error": "no result within 0.05s; stream aborted"}]
@@ -0,0 +1,81 @@
+import difflib
+import os
+import random
+
+import pytest
+
+from src.web_scrape.llm_hosting.canon_index import CanonIndex
+
+LLM_DIR = os.path.join(os.path.dirname(__file__), "..", "src", "web_scrape", "llm_hosting")
+
+
+def read_canon(name):
+    """Canonical names shipped next to the LLM app."""
+    with open(os.path.join(LLM_DIR, name), encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def mutate(rng, text):
+    """Apply a few random character deletions, insertions and substitutions."""
+    chars = list(text)
+    for _ in range(rng.randint(0, 4)):
+        pos = rng.randrange(len(chars) + 1)
+        op = rng.random()
+        if op < 0.33 and chars:
+            chars.pop(min(pos, len(chars) - 1))
+        elif op < 0.66:
+            chars.insert(pos, rng.choice("abcdefghijklmnopqrstuvwxyz "))
+        elif chars:
+            chars[min(pos, len(chars) - 1)] = rng.choice("aeiou")
+    return "".join(chars)
+
+
+@pytest.mark.parametrize("canon_file", ["canon_universities.txt", "canon_programs.txt"])
+@pytest.mark.parametrize("cutoff", [0.6, 0.84, 0.86, 1.0])
+def test_matches_difflib_get_close_matches(canon_file, cutoff):
+    """
+    Verifies that the trigram-shortlisted index returns exactly what
+    difflib.get_close_matches returns, including order and tie-breaking.
+
+
+    :param canon_file: Canonical list to index.
+    :type canon_file: str
+    :param cutoff: Similarity cutoff passed to both matchers.
+    :type cutoff: float
+    :return: None.
+    :rtype: None
+    """
+    names = read_canon(canon_file)
+    index = CanonIndex(names)
+    rng = random.Random(cutoff)
+    queries = [mutate(rng, rng.choice(names)) for _ in range(40)] + ["", "MIT", "Of"]
+
+    for query in queries:
+        assert index.close_matches(query, 3, cutoff) == difflib.get_close_matches(
+            query, names, 3, cutoff
+        )
+
+
+def test_exact_lookup_and_best_match():
+    """
+    Verifies set membership, the scored best match and argument validation.
+
+
+    :return: None.
+    :rtype: None
+    """
+    index = CanonIndex(["Computer Science", "Economics"])
+
+    assert "Economics" in index
+    assert "economics" not in index
+    assert len(index) == 2
+    match, score = index.best_match("Computr Science", 0.84)
+    assert match == "Computer Science"
+    assert score == difflib.SequenceMatcher(None, match, "Computr Science").ratio()
+    assert index.best_match("Zoology", 0.84) == (None, 0.0)
+    assert index.best_match("", 0.84) == (None, 0.0)
+
+    with pytest.raises(ValueError):
+        index.close_matches("Economics", n=0)
+    with pytest.raises(ValueError):
+        index.close_matches("Economics", cutoff=1.5)
@@ -0,0 +1,121 @@
+import sys
+from unittest.mock import MagicMock
+
+# Keep the heavy llama.cpp / Hugging Face imports out of the unit tests
+sys.modules.setdefault("llama_cpp", MagicMock())
+sys.modules.setdefault("huggingface_hub", MagicMock())
+
+import json
+
+import src.web_scrape.llm_hosting.app as llm_app
+from src.web_scrape.llm_hosting import worker_pool
+
+
+def fake_call(calls):
+    """_call_llm stand-in that records the program texts it is given."""
+    def call(text):
+        calls.append(text)
+        return {"standardized_program": text.upper(), "standardized_university": "U"}
+    return call
+
+
+def read_jsonl(path):
+    """Rows of a JSONL file."""
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_append_resumes_after_rows_already_written(tmp_path, monkeypatch):
+    """
+    Verifies that --append skips rows whose id or url is already in the
+    output, drops a torn last line, and writes the remaining rows in batches.
+
+
+    :param tmp_path: Pytest fixture providing a temporary directory.
+    :type tmp_path: pathlib.Path
+    :param monkeypatch: Pytest fixture for replacing the model call.
+    :type monkeypatch: _pytest.monkeypatch.MonkeyPatch
+    :return: None.
+    :rtype: None
+    """
+    calls = []
+    monkeypatch.setattr(llm_app, "_call_llm", fake_call(calls))
+    rows = [{"id": 1, "program": "a"}, {"url": "u/2", "program": "b"},
+            {"id": 3, "program": "c"}, {"url": "u/4", "program": "d"}, {"id": 3, "program": "c"}]
+    src = tmp_path / "in.ndjson"
+    src.write_text("\n".join(json.dumps(r) for r in rows) + "\n", encoding="utf-8")
+    out = tmp_path / "out.jsonl"
+    out.write_text('{"id": 1, "program": "a"}\n{"url": "u/2", "program": "b"}\n{"id": 3, "pro',
+                   encoding="utf-8")
+
+    written = llm_app._cli_process_file(str(src), str(out), append=True, to_stdout=False,
+                                        batch_size=1)
+
+    assert written == 2 and calls == ["c", "d"]
+    result = read_jsonl(out)
+    assert [r.get("id", r.get("url")) for r in result] == [1, "u/2", 3, "u/4"]
+    assert result[3]["llm-generated-program"] == "D"
+
+
+def test_rows_wrapper_is_streamed_and_overwritten(tmp_path, monkeypatch):
+    """
+    Verifies that a ``{"rows": [...]}`` file is accepted and that without
+    --append the output is rewritten from scratch.
+
+
+    :param tmp_path: Pytest fixture providing a temporary directory.
+    :type tmp_path: pathlib.Path
+    :param monkeypatch: Pytest fixture for replacing the model call.
+    :type monkeypatch: _pytest.monkeypatch.MonkeyPatch
+    :return: None.
+    :rtype: None
+    """
+    calls = []
+    monkeypatch.setattr(llm_app, "_call_llm", fake_call(calls))
+    src = tmp_path / "in.json"
+    src.write_text(json.dumps({"rows": [{"id": 1, "program": "a"}, {"program": "b"}]}),
+                   encoding="utf-8")
+    out = tmp_path / "in.json.jsonl"
+    out.write_text('{"id": 1}\n', encoding="utf-8")
+
+    assert llm_app._cli_process_file(str(src), None, append=False, to_stdout=False) == 2
+    assert calls == ["a", "b"]
+    assert [r["llm-generated-program"] for r in read_jsonl(out)] == ["A", "B"]
+
+
+def test_workers_fan_out_and_fall_back_on_errors(tmp_path, monkeypatch):
+    """
+    Verifies that with several workers rows go through the worker pool in
+    order and failed rows take the rules-first fallback.
+
+
+    :param tmp_path: Pytest fixture providing a temporary directory.
+    :type tmp_path: pathlib.Path
+    :param monkeypatch: Pytest fixture for replacing the worker pool.
+    :type monkeypatch: _pytest.monkeypatch.MonkeyPatch
+    :return: None.
+    :rtype: None
+    """
+    seen = {}
+
+    def fake_pool(items, processes, **kwargs):
+        seen["processes"] = processes
+        for idx, text in items:
+            if text.startswith("boom"):
+                yield idx, None, "CallTimeout: LLM call exceeded 1s"
+            else:
+                yield idx, {"standardized_program": text.upper(),
+                            "standardized_university": "U"}, None
+
+    monkeypatch.setattr(worker_pool, "iter_standardized", fake_pool)
+    src = tmp_path / "in.json"
+    src.write_text(json.dumps([{"id": 1, "program": "a"}, {"id": 2, "program": "boom, McGill"}]),
+                   encoding="utf-8")
+    out = tmp_path / "out.jsonl"
+
+    llm_app._cli_process_file(str(src), str(out), append=False, to_stdout=False, workers=3)
+
+    result = read_jsonl(out)
+    assert seen["processes"] == 3
+    fallback = llm_app._split_fallback("boom, McGill")
+    assert [r["llm-generated-program"] for r in result] == ["A", fallback[0]]
+    assert result[1]["llm-generated-university"] == fallback[1]
@@ -0,0 +1,84 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY = ("llama_cpp", "huggingface_hub", "bs4")
+
+# (module, modules it must not import, cumulative import budget in ms).
+# Budgets are loose ceilings for slow CI machines; the heavy-module checks are
+# what catch a regression.
+STARTUP_CASES = [
+    ("src.web_app.app", HEAVY, 2500),  # web app
+    ("load_data", HEAVY + ("flask",), 2000),  # JSON loader CLI
+    ("web_scrape.main", HEAVY + ("flask",), 1000),  # pipeline CLI
+    ("web_scrape.llm_hosting.app", HEAVY + ("flask",), 1000),
+    ("tests.conftest", HEAVY, 3000),  # test suite startup
+]
+
+
+def import_times(statement):
+    """
+    Runs a statement under ``python -X importtime`` and parses the report.
+
+
+    :param statement: Python code to run in a fresh interpreter.
+    :type statement: str
+    :return: Cumulative import time in microseconds per imported module.
+    :rtype: dict
+    """
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([os.path.join(ROOT, "src"), ROOT]))
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", statement],
+                            cwd=ROOT, env=env, capture_output=True, text=True, check=False)
+    assert result.returncode == 0, result.stderr[-2000:]
+    times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line.split("|")
+            if cumulative.strip().isdigit():
+                times[name.strip()] = int(cumulative)
+    return times
+
+
+@pytest.mark.parametrize("module, forbidden, budget_ms", STARTUP_CASES)
+def test_startup_avoids_heavy_imports(module, forbidden, budget_ms):
+    """
+    Verifies that importing an entry point pulls in none of the heavy optional
+    dependencies and stays within its startup budget.
+
+
+    :param module: Module imported in a fresh interpreter.
+    :type module: str
+    :param forbidden: Top-level packages that must not be imported.
+    :type forbidden: tuple[str]
+    :param budget_ms: Maximum cumulative import time in milliseconds.
+    :type budget_ms: int
+    :return: None.
+    :rtype: None
+    """
+    import_times(f"import {module}")  # warm the bytecode cache first
+    times = import_times(f"import {module}")
+
+    loaded = {name.split(".")[0] for name in times}
+    assert not loaded & set(forbidden)
+    assert times[module] / 1000 < budget_ms
+
+
+def test_llm_app_reads_canonical_lists_on_first_use():
+    """
+    Verifies that the canonical lists, result cache, resolver and Flask app of
+    the LLM service are only built when first used.
+
+
+    :return: None.
+    :rtype: None
+    """
+    import_times(
+        "import sys\n"
+        "import web_scrape.llm_hosting.app as llm_app\n"
+        "assert not llm_app._CANON and llm_app._CACHE is None and llm_app._RESOLVER is None\n"
+        "assert isinstance(llm_app.CANON_UNIS, list) and 'flask' not in sys.modules\n"
+        "assert llm_app.app is llm_app.app and 'flask' in sys.modules\n"
+    )
@@ -32,4 +32,28 @@ def test_init_db_calls_loader(monkeypatch):
     init_db.run_init()
 
     # Assertions
-    assert called_with_path == "Web_Scrape/raw_data/llm_extended_applicant_data.json"
\ No newline at end of file
+    assert called_with_path == "Web_Scrape/raw_data/llm_extended_applicant_data.json"
+
+def test_setup_counters_creates_table_triggers_and_backfill():
+    """
+    Verifies that setup_counters issues the counters DDL, installs the row and
+    truncate triggers, and rebuilds the counters from applicantdata.
+
+
+    :return: None.
+    :rtype: None
+    """
+    executed = []
+
+    class RecordingCursor:
+        def execute(self, stmt):
+            executed.append(stmt.as_string(None))
+
+    init_db.setup_counters(RecordingCursor())
+    script = "\n".join(executed)
+
+    assert 'CREATE TABLE IF NOT EXISTS "applicant_counters"' in script
+    assert "FOR EACH ROW EXECUTE FUNCTION" in script
+    assert "AFTER TRUNCATE" in script
+    assert "SECURITY DEFINER" in script
+    assert executed[-1].strip().startswith('INSERT INTO "applicant_counters"')
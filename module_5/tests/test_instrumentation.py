@@ -0,0 +1,188 @@
+import logging
+import pytest
+import psycopg
+from contextlib import contextmanager
+from psycopg import sql
+import instrumentation
+from instrumentation import (
+    timed_execute,
+    record_query,
+    get_query_metrics,
+    reset_query_metrics
+)
+
+
+class PlanCursor:
+    """Cursor stand-in used both for the statement and for its EXPLAIN."""
+
+    def __init__(self, connection, rowcount=3):
+        self.connection = connection
+        self.rowcount = rowcount
+        self.executed = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def execute(self, stmt, params=None, prepare=None):
+        self.executed.append((stmt.as_string(None), params))
+
+    def fetchall(self):
+        return [("Seq Scan on applicantdata",), ("Buffers: shared hit=4",)]
+
+
+class FailingCursor(PlanCursor):
+    """Cursor stand-in whose EXPLAIN is rejected by the server."""
+
+    def execute(self, stmt, params=None, prepare=None):
+        raise psycopg.errors.SyntaxError("cannot explain")
+
+
+class PlanConnection:
+    """Connection stand-in that hands out recording cursors and savepoints."""
+
+    def __init__(self, autocommit=True, fail_explain=False):
+        self.autocommit = autocommit
+        self.fail_explain = fail_explain
+        self.cursors = []
+        self.savepoints = []
+
+    def cursor(self):
+        failing = self.fail_explain and self.cursors
+        cur = (FailingCursor if failing else PlanCursor)(self)
+        self.cursors.append(cur)
+        return cur
+
+    @contextmanager
+    def transaction(self):
+        try:
+            yield
+        except BaseException as e:
+            self.savepoints.append(type(e).__name__)
+            raise
+        self.savepoints.append("released")
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    """
+    Resets the module-level metrics around each test.
+
+
+    :return: None.
+    :rtype: None
+    """
+    reset_query_metrics()
+    yield
+    reset_query_metrics()
+
+
+def test_percentiles_and_counters():
+    """
+    Verifies call/row counters and nearest-rank percentiles over recorded timings.
+
+
+    :return: None.
+    :rtype: None
+    """
+    for ms in range(1, 101):
+        record_query("q", float(ms), 2)
+
+    metrics = get_query_metrics(["never_ran"])
+    assert metrics["q"]["calls"] == 100
+    assert metrics["q"]["rows"] == 200
+    assert metrics["q"]["p50_ms"] == 50.0
+    assert metrics["q"]["p99_ms"] == 99.0
+    assert metrics["q"]["max_ms"] == 100.0
+    assert metrics["never_ran"]["calls"] == 0
+    assert metrics["never_ran"]["p90_ms"] == 0.0
+
+
+def test_slow_select_is_logged_with_analyze_plan_once(monkeypatch, caplog):
+    """
+    Verifies that a statement over the threshold is logged and explained on a
+    separate cursor, with ANALYZE/BUFFERS only on its first slow run.
+
+
+    :param monkeypatch: Pytest fixture for lowering the slow-query threshold.
+    :type monkeypatch: _pytest.monkeypatch.MonkeyPatch
+    :param caplog: Pytest fixture to capture log records.
+    :type caplog: _pytest.logging.LogCaptureFixture
+    :return: None.
+    :rtype: None
+    """
+    monkeypatch.setattr(instrumentation.Config, "SLOW_QUERY_MS", 0.0)
+
+    conn = PlanConnection()
+    stmt = sql.SQL("SELECT 1 WHERE %s")
+    with caplog.at_level(logging.WARNING, logger="instrumentation"):
+        timed_execute(conn.cursor(), "slow_select", stmt, (True,))
+        timed_execute(conn.cursor(), "slow_select", stmt, (True,))
+
+    assert "[SLOW QUERY] slow_select" in caplog.text
+    assert "Seq Scan on applicantdata" in caplog.text
+    plan_sql, plan_params = conn.cursors[1].executed[0]
+    assert plan_sql.startswith("EXPLAIN (ANALYZE, BUFFERS) SELECT")
+    assert plan_params == (True,)
+    assert conn.cursors[3].executed[0][0] == "EXPLAIN SELECT 1 WHERE %s"
+    assert conn.savepoints == []
+    assert get_query_metrics()["slow_select"]["slow_calls"] == 2
+
+
+def test_slow_write_is_not_executed_twice(monkeypatch):
+    """
+    Verifies that non-SELECT statements are explained without ANALYZE.
+
+
+    :param monkeypatch: Pytest fixture for lowering the slow-query threshold.
+    :type monkeypatch: _pytest.monkeypatch.MonkeyPatch
+    :return: None.
+    :rtype: None
+    """
+    monkeypatch.setattr(instrumentation.Config, "SLOW_QUERY_MS", 0.0)
+
+    conn = PlanConnection()
+    timed_execute(conn.cursor(), "insert", sql.SQL("INSERT INTO t VALUES (%s)"), (1,))
+    assert conn.cursors[1].executed[0][0] == "EXPLAIN INSERT INTO t VALUES (%s)"
+
+
+def test_failed_explain_is_contained_in_savepoint(monkeypatch, caplog):
+    """
+    Verifies that on a connection inside a transaction the EXPLAIN runs in a
+    savepoint, so a failing plan is rolled back and reported as unavailable.
+
+
+    :param monkeypatch: Pytest fixture for lowering the slow-query threshold.
+    :type monkeypatch: _pytest.monkeypatch.MonkeyPatch
+    :param caplog: Pytest fixture to capture log records.
+    :type caplog: _pytest.logging.LogCaptureFixture
+    :return: None.
+    :rtype: None
+    """
+    monkeypatch.setattr(instrumentation.Config, "SLOW_QUERY_MS", 0.0)
+
+    conn = PlanConnection(autocommit=False, fail_explain=True)
+    with caplog.at_level(logging.WARNING, logger="instrumentation"):
+        timed_execute(conn.cursor(), "insert", sql.SQL("INSERT INTO t VALUES (%s)"), (1,))
+
+    assert conn.savepoints == ["SyntaxError"]
+    assert "plan unavailable: cannot explain" in caplog.text
+
+
+@pytest.mark.web
+def test_metrics_endpoint(client):
+    """
+    Verifies that the Flask metrics endpoint exposes recorded statement metrics.
+
+
+    :param client: Flask test client.
+    :type client: flask.testing.FlaskClient
+    :return: None.
+    :rtype: None
+    """
+    record_query("fall_2026_apps_count", 4.0, 1)
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.get_json()["fall_2026_apps_count"]["p50_ms"] == 4.0
@@ -0,0 +1,86 @@
+import json
+
+from src.web_scrape.journal import JsonArrayWriter, RowJournal, replay_journal
+
+
+def fields(program, university="Unknown"):
+    """Result fields as main.py journals them."""
+    return {"LLM Program Name": program, "LLM University Name": university}
+
+
+def test_journal_appends_and_replays_in_one_pass(tmp_path):
+    """
+    Verifies that journaled rows replay by index, later entries win, and
+    entries are synced to disk every ``fsync_every`` rows.
+
+
+    :param tmp_path: Pytest fixture providing a temporary directory.
+    :type tmp_path: pathlib.Path
+    :return: None.
+    :rtype: None
+    """
+    path = tmp_path / "journal.jsonl"
+    journal = RowJournal(str(path), fsync_every=2)
+    journal.append(0, fields("Computer Science"))
+    journal.append(1, fields("Économie", "McGill University"))
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 2
+
+    journal.append(1, fields("Economics", "McGill University"))
+    journal.close()
+    journal.close()
+
+    assert replay_journal(str(path)) == {
+        0: fields("Computer Science"),
+        1: fields("Economics", "McGill University"),
+    }
+    assert replay_journal(str(tmp_path / "missing.jsonl")) == {}
+
+
+def test_replay_drops_torn_tail_and_resumes_appending(tmp_path):
+    """
+    Verifies that a partially written last line is discarded and truncated so
+    the next run's appends produce a valid journal.
+
+
+    :param tmp_path: Pytest fixture providing a temporary directory.
+    :type tmp_path: pathlib.Path
+    :return: None.
+    :rtype: None
+    """
+    path = tmp_path / "journal.jsonl"
+    path.write_text('{"i": 0, "LLM Program Name": "Physics"}\n{"i": 1, "LLM Prog',
+                    encoding="utf-8")
+
+    assert replay_journal(str(path)) == {0: {"LLM Program Name": "Physics"}}
+    with RowJournal(str(path)) as journal:
+        journal.append(1, {"LLM Program Name": "Chemistry"})
+
+    assert sorted(replay_journal(str(path))) == [0, 1]
+
+
+def test_json_array_writer_matches_json_dump(tmp_path):
+    """
+    Verifies that streaming merged rows writes the same file as ``json.dump``
+    of the rows, including the empty case.
+
+
+    :param tmp_path: Pytest fixture providing a temporary directory.
+    :type tmp_path: pathlib.Path
+    :return: None.
+    :rtype: None
+    """
+    rows = [{"Program Name": "CS", "Tags": [], "Meta": {"gpa": 3.9}},
+            {"Program Name": "", "University": "Université Laval"}]
+    results = {0: fields("Computer Science"), 1: fields("", "Université Laval")}
+    expected = [{**row, **results[i]} for i, row in enumerate(rows)]
+    out = tmp_path / "out.json"
+
+    writer = JsonArrayWriter(str(out))
+    for row in expected:
+        writer.write(row)
+    assert writer.close() == 2
+    assert out.read_text(encoding="utf-8") == json.dumps(expected, indent=4, ensure_ascii=False)
+    assert not (tmp_path / "out.json.tmp").exists()
+
+    assert JsonArrayWriter(str(out)).close() == 0
+    assert json.loads(out.read_text(encoding="utf-8")) == []
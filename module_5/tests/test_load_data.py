@@ -1,7 +1,9 @@
 import pytest
 import json
 import os
-from src.load_data import get_latest_entry_text, load_json_to_db, scrape_and_update_db
+from src.load_data import (
+    _entry_params, get_latest_entry_text, load_json_to_db, scrape_and_update_db
+)
 
 @pytest.mark.db
 def test_get_latest_entry_text_variations(tmp_path):
@@ -28,6 +30,23 @@ def test_get_latest_entry_text_variations(tmp_path):
     assert get_latest_entry_text(str(valid_file)) == "Specific Text"
 
 
+
+def test_entry_params_missing_llm_default():
+    """
+    Verifies that one helper builds the insert parameters for every load path:
+    missing LLM fields stay NULL by default and become "Unknown" on request.
+
+
+    :return: None.
+    :rtype: None
+    """
+    entry = {"University": "JHU", "Program Name": "CS", "URL": "u1"}
+    assert _entry_params(entry)[0] == "JHU - CS"
+    assert _entry_params(entry)[-2:] == (None, None)
+    assert _entry_params(entry, missing_llm="Unknown")[-2:] == ("Unknown", "Unknown")
+    entry["LLM Program Name"] = "Computer Science"
+    assert _entry_params(entry, missing_llm="Unknown")[-2:] == ("Computer Science", "Unknown")
+
 @pytest.mark.db
 def test_load_json_to_db_scenarios(db, tmp_path):
     """
@@ -0,0 +1,68 @@
+import sys
+from unittest.mock import MagicMock
+
+# Keep the heavy llama.cpp / Hugging Face imports out of the unit tests
+sys.modules.setdefault("llama_cpp", MagicMock())
+sys.modules.setdefault("huggingface_hub", MagicMock())
+
+import src.web_scrape.llm_hosting.app as llm_app
+import src.web_scrape.memory as memory
+
+
+def test_rss_mb_reports_current_process():
+    """
+    Verifies that the RSS sample is a positive number of MiB.
+
+
+    :return: None.
+    :rtype: None
+    """
+    assert memory.rss_mb() > 0
+
+
+def test_memory_watch_flags_growth_past_limit(monkeypatch):
+    """
+    Verifies that a reload is requested only after growth passes the limit,
+    that rebase resets the baseline, and that a zero limit never reloads.
+
+
+    :param monkeypatch: Pytest fixture for mocking the RSS sampler.
+    :type monkeypatch: _pytest.monkeypatch.MonkeyPatch
+    :return: None.
+    :rtype: None
+    """
+    samples = iter([1000.0, 1200.0, 1600.0, 1100.0, 1150.0])
+    monkeypatch.setattr(memory, "rss_mb", lambda: next(samples))
+
+    watch = memory.MemoryWatch(growth_limit_mb=500)
+    assert watch.sample() == (1200.0, 200.0, False)
+    assert watch.sample() == (1600.0, 600.0, True)
+    assert watch.rebase() == 1100.0
+    assert watch.sample() == (1150.0, 50.0, False)
+    assert watch.peak_mb == 1600.0
+
+    monkeypatch.setattr(memory, "rss_mb", lambda: 9000.0)
+    assert memory.MemoryWatch(growth_limit_mb=0).sample()[2] is False
+
+
+def test_unload_llm_closes_model_and_drops_prefix(monkeypatch):
+    """
+    Verifies that _unload_llm closes the cached model, clears the global and
+    forgets the saved prompt-prefix state so the next load starts clean.
+
+
+    :param monkeypatch: Pytest fixture for swapping the cached model.
+    :type monkeypatch: _pytest.monkeypatch.MonkeyPatch
+    :return: None.
+    :rtype: None
+    """
+    model = MagicMock()
+    monkeypatch.setattr(llm_app, "_LLM", model)
+    llm_app._PREFIX.update(tokens=[1, 2], state=object())
+
+    llm_app._unload_llm()
+
+    model.close.assert_called_once()
+    assert llm_app._LLM is None
+    assert llm_app._PREFIX == {"tokens": None, "state": None}
+    llm_app._unload_llm()  # nothing loaded: no-op
@@ -0,0 +1,117 @@
+import hashlib
+
+import pytest
+
+from src.web_scrape.llm_hosting import model_registry
+from src.web_scrape.llm_hosting.model_registry import ModelNotFoundError, ModelRegistry
+
+WEIGHTS = b"GGUF" + bytes(range(256)) * 16
+SHA = hashlib.sha256(WEIGHTS).hexdigest()
+
+
+def lfs_pointer(sha, size):
+    """Contents of a git-lfs pointer file."""
+    return (f"version https://git-lfs.github.com/spec/v1\n"
+            f"oid sha256:{sha}\nsize {size}\n").encode()
+
+
+def count_hashes(monkeypatch):
+    """Counts full-file hashes done by the registry."""
+    hashed = []
+    real = model_registry.sha256_file
+
+    def counting(path):
+        hashed.append(path)
+        return real(path)
+
+    monkeypatch.setattr(model_registry, "sha256_file", counting)
+    return hashed
+
+
+def test_resolve_hashes_once_and_reuses_sidecar(tmp_path, monkeypatch):
+    """
+    Verifies that a local model is resolved without downloading, hashed once
+    per file version, and re-hashed after the file changes.
+
+
+    :param tmp_path: Pytest fixture providing a temporary directory.
+    :type tmp_path: pathlib.Path
+    :param monkeypatch: Pytest fixture for counting hash calls.
+    :type monkeypatch: _pytest.monkeypatch.MonkeyPatch
+    :return: None.
+    :rtype: None
+    """
+    hashed = count_hashes(monkeypatch)
+    model = tmp_path / "tiny.gguf"
+    model.write_bytes(WEIGHTS)
+    download = lambda *args: pytest.fail("hub contacted")
+
+    registry = ModelRegistry([str(tmp_path / "missing"), str(tmp_path)], expected_sha256=SHA,
+                             download=download)
+    assert registry.resolve("tiny.gguf") == str(model)
+    assert registry.resolve("tiny.gguf") == str(model)  # memoized
+    assert ModelRegistry([str(tmp_path)], expected_sha256=SHA).resolve("tiny.gguf") == str(model)
+    assert len(hashed) == 1
+
+    model.write_bytes(WEIGHTS + b"!")
+    with pytest.raises(ModelNotFoundError, match="MODEL_ALLOW_DOWNLOAD"):
+        ModelRegistry([str(tmp_path)], expected_sha256=SHA).resolve("tiny.gguf")
+    assert len(hashed) == 2
+
+
+def test_lfs_pointer_supplies_checksum_for_renamed_copy(tmp_path):
+    """
+    Verifies that a git-lfs pointer is never returned as the model but its
+    checksum finds a renamed copy in another search directory.
+
+
+    :param tmp_path: Pytest fixture providing a temporary directory.
+    :type tmp_path: pathlib.Path
+    :return: None.
+    :rtype: None
+    """
+    checkout, cache = tmp_path / "checkout", tmp_path / "cache"
+    checkout.mkdir()
+    cache.mkdir()
+    (checkout / "tiny.gguf").write_bytes(lfs_pointer(SHA, len(WEIGHTS)))
+    (cache / "other.gguf").write_bytes(b"GGUF not this one")
+    (cache / "tiny-copy.gguf").write_bytes(WEIGHTS)
+
+    registry = ModelRegistry([str(checkout), str(cache)])
+
+    assert registry.resolve("tiny.gguf") == str(cache / "tiny-copy.gguf")
+
+
+def test_download_only_when_allowed(tmp_path):
+    """
+    Verifies that the hub is only used when downloads are allowed and that
+    the downloaded file is verified before use.
+
+
+    :param tmp_path: Pytest fixture providing a temporary directory.
+    :type tmp_path: pathlib.Path
+    :return: None.
+    :rtype: None
+    """
+    calls = []
+
+    def download(repo_id, filename, local_dir):
+        calls.append((repo_id, filename))
+        path = tmp_path / local_dir / filename
+        path.parent.mkdir(exist_ok=True)
+        path.write_bytes(WEIGHTS)
+        return str(path)
+
+    with pytest.raises(ModelNotFoundError):
+        ModelRegistry([str(tmp_path)], download=download).resolve("tiny.gguf", "org/repo")
+    assert not calls
+
+    registry = ModelRegistry([], expected_sha256=SHA, allow_download=True,
+                             download_dir="dl", download=download)
+    assert registry.resolve("tiny.gguf", "org/repo") == str(tmp_path / "dl" / "tiny.gguf")
+    assert calls == [("org/repo", "tiny.gguf")]
+
+    bad = ModelRegistry([], expected_sha256="0" * 64, allow_download=True,
+                        download_dir="dl", download=download)
+    with pytest.raises(ModelNotFoundError, match="does not match"):
+        bad.resolve("tiny.gguf", "org/repo")
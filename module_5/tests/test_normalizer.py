@@ -0,0 +1,107 @@
+import json
+import os
+import re
+
+from src.web_scrape.llm_hosting.canon_index import CanonIndex
+from src.web_scrape.llm_hosting.normalizer import (
+    DEGREE_KEYWORDS, AbbreviationMatcher, Normalizer,
+)
+
+LLM_DIR = os.path.join(os.path.dirname(__file__), "..", "src", "web_scrape", "llm_hosting")
+CORPUS = os.path.join(LLM_DIR, "..", "raw_data", "applicant_data.json")
+ABBREV = {
+    r"(?i)^mcg(\.|ill)?$": "McGill University",
+    r"(?i)^(ubc|u\.?b\.?c\.?)$": "University of British Columbia",
+    r"(?i)^uoft$": "University of Toronto",
+}
+FIXES = ({"Mathematic": "Mathematics"}, {"Mcgill University": "McGill University"})
+
+
+def read_canon(name):
+    """Canonical names shipped next to the LLM app."""
+    with open(os.path.join(LLM_DIR, name), encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def loop_validate(prog, uni, original_text=""):
+    """The per-call tokenize-and-scan validation the normalizer replaces."""
+    def keywords(text):
+        return [w for w in re.findall(r"\b[\w\.]+\b", text.lower()) if w in DEGREE_KEYWORDS]
+
+    if keywords(uni) and not keywords(prog):
+        prog, uni = uni, prog
+    elif not keywords(prog) and original_text and keywords(original_text):
+        word = keywords(original_text)[0]
+        degree = word.upper() if "ms" in word or "ma" in word else word.replace(".", "").title()
+        prog = f"{prog} {degree}".strip()
+    return prog, uni
+
+
+def test_abbreviations_match_whole_name_in_pattern_order():
+    """
+    Verifies that the combined abbreviation regex keeps per-pattern flags and
+    anchors and that the first matching pattern wins.
+
+
+    :return: None.
+    :rtype: None
+    """
+    matcher = AbbreviationMatcher({**ABBREV, r"McMaster": "McMaster University",
+                                   r"^mc.*$": "Other Mc"})
+
+    assert matcher.expand("MCGILL") == "McGill University"
+    assert matcher.expand("u.b.c.") == "University of British Columbia"
+    assert matcher.expand("McMaster") == "McMaster University"
+    assert matcher.expand("mcmaster") == "Other Mc"  # no (?i) on the McMaster pattern
+    assert matcher.expand("mcgill") == "McGill University"
+    assert matcher.expand("mcgill x") == "Other Mc"
+    assert matcher.expand("UofT Mississauga") is None
+    assert AbbreviationMatcher({}).expand("anything") is None
+
+
+def test_validate_matches_token_scan_on_corpus():
+    """
+    Verifies that the compiled keyword matcher swaps fields and infers degrees
+    exactly like tokenizing with re.findall, over the scraped corpus and
+    dotted/edge-case spellings.
+
+
+    :return: None.
+    :rtype: None
+    """
+    normalizer = Normalizer(CanonIndex([]), CanonIndex([]), ABBREV, FIXES)
+    with open(CORPUS, encoding="utf-8") as f:
+        rows = json.load(f)
+    cases = [(r.get("Program Name") or "", r.get("University") or "",
+              f"{r.get('Program Name') or ''} {r.get('Degree Program') or ''}") for r in rows]
+    cases += [
+        ("Economics", "PhD", ""), ("Physics", "MIT", "physics M.S. at MIT"),
+        ("Physics", "MIT", "physics m.sc program"), ("Art", "RISD", "mfa..., risd"),
+        ("Law", "Yale", "j.d. / ma"), ("Math", "U", "mastery of maths"), ("", "", "MBA"),
+    ]
+
+    for prog, uni, original in cases:
+        assert normalizer.validate(prog, uni, original) == loop_validate(prog, uni, original)
+
+
+def test_normalizer_maps_to_canon_and_memoizes():
+    """
+    Verifies canonical/fuzzy mapping, abbreviation expansion and 'of'
+    casing, and that repeated inputs are served from the memo.
+
+
+    :return: None.
+    :rtype: None
+    """
+    normalizer = Normalizer(CanonIndex(read_canon("canon_programs.txt")),
+                            CanonIndex(read_canon("canon_universities.txt")), ABBREV, FIXES)
+
+    assert normalizer.university("mcg") == "McGill University"
+    assert normalizer.university("university of british columbia") == \
+        "University of British Columbia"
+    assert normalizer.university("") == "Unknown"
+    assert normalizer.program("mathematic") == normalizer.program("Mathematic")
+
+    for _ in range(3):
+        normalizer.university("mcg")
+    assert normalizer.cache_info()["university"]["hits"] == 3
@@ -0,0 +1,200 @@
+import sys
+from unittest.mock import MagicMock
+
+# Keep the heavy llama.cpp / Hugging Face imports out of the unit tests
+sys.modules.setdefault("llama_cpp", MagicMock())
+sys.modules.setdefault("huggingface_hub", MagicMock())
+
+import json
+import threading
+
+import pytest
+
+from src.web_scrape import main, pipeline
+from src.web_scrape.journal import replay_journal
+from src.web_scrape.progress import PipelineMetrics
+
+
+class ListSink:
+    """Load stage that keeps rows in memory and records the loading thread."""
+
+    def __init__(self, fail_at=None):
+        self.rows, self.threads, self.closed = [], set(), False
+        self.fail_at, self.complete = fail_at, None
+
+    def write(self, index, row, fields):
+        if index == self.fail_at:
+            raise OSError("disk full")
+        self.rows.append((index, {**row, **fields}))
+        self.threads.add(threading.current_thread().name)
+
+    def close(self, complete=True):
+        self.closed, self.complete = True, complete
+
+
+def fake_llm(calls=None):
+    """LLM callables for LLMStandardizer; ``boom`` programs fail."""
+    model = MagicMock()
+
+    def call(text):
+        if calls is not None:
+            calls.append(text)
+        if text == "boom":
+            raise RuntimeError("bad generation")
+        return {"standardized_program": text.upper()}
+
+    return {"load": lambda: model, "call": call, "unload": lambda: None,
+            "fallback": lambda text: [text.split()[0]]}
+
+
+def entries(n):
+    """Raw entries as the scraper produces them."""
+    return [{"program": f"prog {i}", "university": f"U{i}", "text": "", "decision": ""}
+            for i in range(n)]
+
+
+def test_pipeline_runs_stages_concurrently_in_order():
+    """
+    Verifies that rows flow through every stage in source order with small
+    bounded queues and that each stage runs on its own thread.
+
+
+    :return: None.
+    :rtype: None
+    """
+    sink = ListSink()
+    standardize = lambda rows: ((i, row, {"std": row["Program Name"].upper()}) for i, row in rows)
+    metrics = PipelineMetrics(interval=0, emit=lambda line: None)
+    run = pipeline.Pipeline(lambda: iter(entries(50)), main.clean_entry, standardize, sink,
+                            queue_size=2, metrics=metrics)
+
+    counts = run.run()
+
+    assert counts == {"scraped": 50, "cleaned": 50, "standardized": 50, "loaded": 50}
+    assert [i for i, _ in sink.rows] == list(range(50))
+    assert sink.rows[3][1]["std"] == "PROG 3"
+    assert sink.threads == {"pipeline-load"}
+    assert sink.closed and sink.complete
+    assert [metrics.stage(name).count for name in ("scrape", "clean", "load")] == [50, 50, 50]
+
+
+def test_pipeline_stage_failure_stops_and_closes_sink():
+    """
+    Verifies that an exception in a thread stage surfaces as PipelineError
+    and that the sink is still closed.
+
+
+    :return: None.
+    :rtype: None
+    """
+    def source():
+        yield from entries(5)
+        raise ValueError("page broke")
+
+    sink = ListSink()
+    run = pipeline.Pipeline(source, main.clean_entry, lambda rows: ((i, r, {}) for i, r in rows),
+                            sink, queue_size=1)
+    with pytest.raises(pipeline.PipelineError, match="scrape stage failed: page broke"):
+        run.run()
+    assert sink.closed and sink.complete is False
+
+    sink = ListSink(fail_at=2)
+    run = pipeline.Pipeline(lambda: iter(entries(100)), main.clean_entry,
+                            lambda rows: ((i, r, {}) for i, r in rows), sink, queue_size=1)
+    with pytest.raises(pipeline.PipelineError, match="load stage failed: disk full"):
+        run.run()
+    assert len(sink.rows) == 2 and sink.complete is False
+
+
+def test_standardizer_skips_journaled_rows_and_falls_back():
+    """
+    Verifies that replayed rows and empty programs skip the model and that a
+    failing call takes the split fallback.
+
+
+    :return: None.
+    :rtype: None
+    """
+    calls = []
+    done = {0: {"LLM Program Name": "Cached", "LLM University Name": "U0"}}
+    standardizer = pipeline.LLMStandardizer(fake_llm(calls), done, {"timeout": 0},
+                                            log=lambda msg: None)
+    rows = [(0, {"Program Name": "prog 0"}), (1, {"Program Name": "", "University": "U1"}),
+            (2, {"Program Name": "boom", "University": "U2"}),
+            (3, {"Program Name": "math", "University": "U3"})]
+
+    out = list(standardizer(iter(rows)))
+
+    assert calls == ["boom", "math"]
+    assert [fields["LLM Program Name"] for _, _, fields in out] == ["Cached", "", "boom", "MATH"]
+    assert standardizer.counts == {"successes": 1, "failures": 1, "timeouts": 0,
+                                   "resumed": 1, "model_reloads": 0}
+    assert standardizer.metrics.counters == {"resumed": 1, "empty": 1, "fallback": 1,
+                                             "success": 1}
+
+
+def test_pooled_standardizer_interleaves_pass_through_rows(monkeypatch):
+    """
+    Verifies that rows needing no model call keep their place between pool
+    outcomes and that pool errors take the fallback path.
+
+
+    :param monkeypatch: Pytest fixture for replacing the worker pool.
+    :type monkeypatch: _pytest.monkeypatch.MonkeyPatch
+    :return: None.
+    :rtype: None
+    """
+    def fake_pool(items, **kwargs):
+        for idx, text in items:
+            if text == "slow":
+                yield idx, None, "CallTimeout: LLM call exceeded 1s"
+            else:
+                yield idx, {"standardized_program": text.upper()}, None
+
+    monkeypatch.setattr(pipeline, "iter_standardized", fake_pool)
+    done = {1: {"LLM Program Name": "Cached"}}
+    standardizer = pipeline.LLMStandardizer(fake_llm(), done, {"workers": 2},
+                                            log=lambda msg: None)
+    rows = [(0, {"Program Name": "a"}), (1, {"Program Name": "b"}), (2, {"Program Name": ""}),
+            (3, {"Program Name": "slow x"}), (4, {"Program Name": "slow"}), (5, {})]
+
+    out = list(standardizer(iter(rows)))
+
+    assert [i for i, _, _ in out] == list(range(6))
+    assert [f["LLM Program Name"] for _, _, f in out] == ["A", "Cached", "", "SLOW X", "slow", ""]
+    assert standardizer.counts["timeouts"] == 1
+
+
+def test_cli_writes_output_journal_free_and_resumes(tmp_path, monkeypatch):
+    """
+    Verifies the CLI end to end: rows are standardized into the output file,
+    the journal is removed after a complete run, and journaled rows are not
+    sent to the model again.
+
+
+    :param tmp_path: Pytest fixture providing a temporary directory.
+    :type tmp_path: pathlib.Path
+    :param monkeypatch: Pytest fixture for patching paths and the model.
+    :type monkeypatch: _pytest.monkeypatch.MonkeyPatch
+    :return: None.
+    :rtype: None
+    """
+    raw = tmp_path / "raw.json"
+    raw.write_text(json.dumps({str(i): e for i, e in enumerate(entries(4))}), encoding="utf-8")
+    out, journal = tmp_path / "out.json", tmp_path / "journal.jsonl"
+    journal.write_text('{"i": 1, "LLM Program Name": "Resumed", "LLM University Name": "U1"}\n',
+                       encoding="utf-8")
+    calls = []
+    llm = fake_llm(calls)
+    monkeypatch.setattr(main, "RAW_JSON_PATH", str(raw))
+    monkeypatch.setattr(main, "LLM_TIMEOUT", 0)
+    monkeypatch.setattr(main, "_load_llm", llm["load"])
+    monkeypatch.setattr(main, "_call_llm", llm["call"])
+
+    assert main.main(["--output", str(out), "--journal", str(journal)]) == 0
+
+    rows = json.loads(out.read_text(encoding="utf-8"))
+    assert [r["LLM Program Name"] for r in rows] == ["PROG 0", "Resumed", "PROG 2", "PROG 3"]
+    assert calls == ["prog 0", "prog 2", "prog 3"]
+    assert not journal.exists()
+    assert replay_journal(str(journal)) == {}
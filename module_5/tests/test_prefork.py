@@ -0,0 +1,86 @@
+import os
+import signal
+import socket
+import subprocess
+import sys
+import urllib.request
+
+import pytest
+
+from src.web_scrape.llm_hosting.prefork import memory_report, smaps_rollup
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODEL_MB = 64
+
+pytestmark = pytest.mark.skipif(not os.path.exists("/proc/self/smaps_rollup"),
+                                reason="needs Linux /proc/<pid>/smaps_rollup")
+
+SERVER = """
+import os, sys
+from src.web_scrape.llm_hosting import prefork
+
+weights = []
+
+def preload():
+    weights.append(b"\\x01" * ({mb} << 20))  # written once, like loaded tensors
+
+def app(environ, start_response):
+    start_response("200 OK", [("Content-Type", "text/plain")])
+    return [str(os.getpid()).encode()]
+
+prefork.serve_prefork(app, "127.0.0.1", int(sys.argv[1]), 3, preload,
+                      log=lambda msg: print(msg, flush=True))
+"""
+
+
+def free_port():
+    """Returns a currently unused local TCP port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_smaps_rollup_reports_this_process():
+    """
+    Verifies that the rollup is parsed into MiB values and that an unknown
+    process yields an empty report.
+
+
+    :return: None.
+    :rtype: None
+    """
+    report = smaps_rollup()
+    assert report["Rss"] > 0 and 0 < report["Pss"] <= report["Rss"]
+    assert smaps_rollup(2 ** 22 + 1) == {}
+    assert memory_report([])["total_pss_mb"] == 0
+
+
+def test_workers_share_weights_loaded_before_fork():
+    """
+    Verifies that forked workers serve requests and that weights loaded in
+    the parent are counted in every worker's RSS but only once in the summed
+    PSS; SIGTERM stops the parent and all workers.
+
+
+    :return: None.
+    :rtype: None
+    """
+    port = free_port()
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    server = subprocess.Popen([sys.executable, "-c", SERVER.format(mb=MODEL_MB), str(port)],
+                              cwd=ROOT, env=env, stdout=subprocess.PIPE, text=True)
+    try:
+        assert server.stdout.readline().startswith("[serve] 3 workers")
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/", timeout=10) as response:
+            worker_pid = int(response.read())
+
+        with open(f"/proc/{server.pid}/task/{server.pid}/children", encoding="ascii") as f:
+            workers = [int(pid) for pid in f.read().split()]
+        assert len(workers) == 3 and worker_pid in workers
+
+        report = memory_report(workers)
+        assert all(w["Rss"] >= MODEL_MB for w in report["workers"].values())
+        assert report["total_pss_mb"] < 2 * MODEL_MB  # not 3 copies
+    finally:
+        server.send_signal(signal.SIGTERM)
+        assert server.wait(timeout=10) == 0
@@ -0,0 +1,120 @@
+import sys
+from unittest.mock import MagicMock
+
+# Keep the heavy llama.cpp / Hugging Face imports out of the unit tests
+sys.modules.setdefault("llama_cpp", MagicMock())
+sys.modules.setdefault("huggingface_hub", MagicMock())
+
+import src.web_scrape.llm_hosting.app as llm_app
+from src.web_scrape.llm_hosting.program_cache import ProgramCache, normalize_key
+
+
+def test_normalize_key_collapses_whitespace_and_case():
+    """
+    Verifies that trivially different program strings share one cache key.
+
+
+    :return: None.
+    :rtype: None
+    """
+    assert normalize_key("  Computer   Science PhD ") == normalize_key("computer science phd")
+    assert normalize_key(None) == ""
+
+
+def test_lru_evicts_least_recently_used():
+    """
+    Verifies that the memory-only cache stays bounded and evicts in LRU order.
+
+
+    :return: None.
+    :rtype: None
+    """
+    cache = ProgramCache(None, capacity=2)
+    cache.put("a", {"standardized_program": "A"})
+    cache.put("b", {"standardized_program": "B"})
+    assert cache.get("a") == {"standardized_program": "A"}
+    cache.put("c", {"standardized_program": "C"})
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.stats()["memory_entries"] == 2
+
+
+def test_disk_store_survives_restart_and_namespaces(tmp_path):
+    """
+    Verifies that entries persist across cache instances sharing a file and are
+    isolated by namespace.
+
+
+    :param tmp_path: Pytest fixture for temporary file directories.
+    :type tmp_path: pathlib.Path
+    :return: None.
+    :rtype: None
+    """
+    path = str(tmp_path / "cache.sqlite3")
+    first = ProgramCache(path, namespace="model-a")
+    first.put("Economics PhD", {"standardized_program": "Economics PhD"})
+    first.close()
+
+    second = ProgramCache(path, namespace="model-a")
+    assert second.get("economics  phd") == {"standardized_program": "Economics PhD"}
+    assert second.stats()["disk_hits"] == 1
+    assert ProgramCache(path, namespace="model-b").get("Economics PhD") is None
+
+
+def test_call_llm_only_infers_unseen_programs(monkeypatch, tmp_path):
+    """
+    Verifies that _call_llm runs the model once per normalized program text and
+    that a rerun over already-seen programs costs no model calls.
+
+
+    :param monkeypatch: Pytest fixture for mocking the inference function.
+    :type monkeypatch: _pytest.monkeypatch.MonkeyPatch
+    :param tmp_path: Pytest fixture for temporary file directories.
+    :type tmp_path: pathlib.Path
+    :return: None.
+    :rtype: None
+    """
+    calls = []
+
+    def fake_infer(text):
+        calls.append(text)
+        return {"standardized_program": text.strip().title(), "standardized_university": "Unknown"}
+
+    path = str(tmp_path / "cache.sqlite3")
+    monkeypatch.setattr(llm_app, "_infer_llm", fake_infer)
+    monkeypatch.setattr(llm_app, "_CACHE", ProgramCache(path))
+    monkeypatch.setattr(llm_app, "FAST_PATH_THRESHOLD", 2.0)
+
+    for text in ["Computer Science PhD", "computer science  PhD", "Economics PhD"]:
+        llm_app._call_llm(text)
+    assert len(calls) == 2
+
+    result = llm_app._call_llm("Economics PhD")
+    result["standardized_program"] = "mutated by caller"
+
+    monkeypatch.setattr(llm_app, "_CACHE", ProgramCache(path))
+    assert llm_app._call_llm("Economics PhD")["standardized_program"] == "Economics Phd"
+    assert len(calls) == 2
+
+
+def test_namespace_tracks_threshold_and_rules(monkeypatch):
+    """
+    Verifies that the persistent cache namespace changes with the fast-path
+    threshold and the canonical data, so old answers are not served.
+
+
+    :param monkeypatch: Pytest fixture for changing the threshold and lists.
+    :type monkeypatch: _pytest.monkeypatch.MonkeyPatch
+    :return: None.
+    :rtype: None
+    """
+    base = llm_app._cache_namespace()
+    assert base.startswith(llm_app.MODEL_FILE) and base == llm_app._cache_namespace()
+
+    monkeypatch.setattr(llm_app, "FAST_PATH_THRESHOLD", 0.8)
+    lowered = llm_app._cache_namespace()
+    assert lowered != base
+
+    monkeypatch.setitem(llm_app.COMMON_PROG_FIXES, "Comp Sci", "Computer Science")
+    assert llm_app._cache_namespace() not in (base, lowered)
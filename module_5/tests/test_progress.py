@@ -0,0 +1,94 @@
+import json
+
+from src.web_scrape.progress import PipelineMetrics, StageMetrics
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_stage_rate_is_windowed_and_ignores_resumed_rows():
+    """
+    Verifies that the rate covers only the recent window, that resumed rows
+    count toward progress but not the rate, and that the ETA uses both.
+
+
+    :return: None.
+    :rtype: None
+    """
+    clock = FakeClock()
+    stage = StageMetrics("llm", total=100, window=10.0, clock=clock)
+    for _ in range(40):
+        stage.observe(outcome="resumed", in_rate=False)
+    assert stage.rate() == 0.0 and stage.eta() is None
+
+    for _ in range(20):  # 2 rows/sec for 10 s
+        clock.now += 0.5
+        stage.observe(0.5)
+    assert stage.rate() == 2.0
+    assert stage.eta() == 20.0  # 40 remaining at 2 rows/sec
+
+    clock.now += 5.25  # about half the window is now idle
+    assert stage.rate() == 1.0
+
+
+def test_stage_snapshot_reports_counters_and_percentiles():
+    """
+    Verifies outcome counters and latency percentiles in the snapshot.
+
+
+    :return: None.
+    :rtype: None
+    """
+    stage = StageMetrics("llm")
+    for ms in range(1, 101):
+        stage.observe(ms / 1000, "success" if ms % 10 else "fallback")
+    stage.observe(2.0, "timeout")
+
+    snap = stage.snapshot()
+    assert snap["count"] == 101
+    assert snap["counters"] == {"success": 90, "fallback": 10, "timeout": 1}
+    assert snap["latency_p50_ms"] == 51.0
+    assert snap["latency_p99_ms"] == 100.0
+    assert snap["total"] is None and snap["eta_s"] is None
+
+
+def test_report_emits_json_lines_and_prometheus_textfile(tmp_path):
+    """
+    Verifies that a report emits one JSON line per stage plus process gauges
+    and writes a Prometheus text file with counters, rates and quantiles.
+
+
+    :param tmp_path: Pytest fixture providing a temporary directory.
+    :type tmp_path: pathlib.Path
+    :return: None.
+    :rtype: None
+    """
+    lines = []
+    prom = tmp_path / "pipeline.prom"
+    metrics = PipelineMetrics(interval=0, textfile=str(prom), emit=lines.append,
+                              gauges=lambda: {"rss_mb": 512.5})
+    metrics.set_total(10)
+    metrics.stage("llm").observe(0.25, "timeout")
+    metrics.stage("scrape").observe(0.1)
+
+    metrics.start()
+    metrics.stop()
+
+    events = [json.loads(line) for line in lines]
+    assert [e["stage"] for e in events[:4]] == ["scrape", "clean", "llm", "load"]
+    assert events[2]["counters"] == {"timeout": 1} and events[2]["total"] == 10
+    assert events[4] == {"ts": events[0]["ts"], "event": "process", "rss_mb": 512.5}
+
+    text = prom.read_text(encoding="utf-8")
+    assert 'pipeline_items_total{stage="llm",outcome="timeout"} 1' in text
+    assert 'pipeline_item_latency_seconds{stage="llm",quantile="0.95"} 0.25' in text
+    assert 'pipeline_rate_items_per_second{stage="load"} 0.0' in text
+    assert "pipeline_rss_mb 512.5" in text
+    assert not (tmp_path / "pipeline.prom.tmp").exists()
@@ -0,0 +1,188 @@
+import sys
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+# Keep the heavy llama.cpp / Hugging Face imports out of the unit tests
+sys.modules.setdefault("llama_cpp", MagicMock())
+sys.modules.setdefault("huggingface_hub", MagicMock())
+
+import src.web_scrape.llm_hosting.app as llm_app
+
+
+class FakeLlama:
+    """Character-level stand-in that tracks which prompt tokens get evaluated."""
+
+    def __init__(self):
+        self._ids = []
+        self.n_tokens = 0
+        self.evaluated = 0
+        self.loads = 0
+        self.kwargs = {}
+        self.reply = ('{"standardized_program": "Economics PhD", '
+                      '"standardized_university": "Unknown"}')
+
+    @property
+    def input_ids(self):
+        # Like llama.cpp, entries past n_tokens are stale, not cleared
+        return np.array(self._ids, dtype=np.intc)
+
+    def tokenize(self, text, add_bos=True, special=False):
+        return ([1] if add_bos else []) + list(text)  # bytes -> ints
+
+    def reset(self):
+        self.n_tokens = 0
+
+    def eval(self, tokens):
+        self.evaluated += len(tokens)
+        self._ids = self._ids[: self.n_tokens] + list(tokens)
+        self.n_tokens = len(self._ids)
+
+    def save_state(self):
+        return self._ids[: self.n_tokens]
+
+    def load_state(self, state):
+        self.loads += 1
+        self._ids = list(state)
+        self.n_tokens = len(state)
+
+    def create_completion(self, prompt, **kwargs):
+        # Mirrors llama.cpp: skip the longest prefix already in the context
+        shared = 0
+        for a, b in zip(self._ids[: self.n_tokens], prompt[:-1]):
+            if a != b:
+                break
+            shared += 1
+        self.n_tokens = shared
+        self.eval(prompt[shared:])
+        self.kwargs = kwargs
+        return {
+            "choices": [{"text": self.reply}],
+            "usage": {"prompt_tokens": len(prompt), "completion_tokens": 12},
+        }
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    """
+    Installs a fresh FakeLlama with empty prefix state and counters.
+
+
+    :param monkeypatch: Pytest fixture for swapping module globals.
+    :type monkeypatch: _pytest.monkeypatch.MonkeyPatch
+    :return: The fake model.
+    :rtype: FakeLlama
+    """
+    llm = FakeLlama()
+    # llama_cpp is imported on first use, so other test modules may have replaced it
+    monkeypatch.setitem(sys.modules, "llama_cpp", MagicMock())
+    monkeypatch.setattr(llm_app, "_GRAMMAR", {"grammar": None})
+    monkeypatch.setattr(llm_app, "_load_llm", lambda: llm)
+    monkeypatch.setattr(llm_app, "_PREFIX", {"tokens": None, "state": None})
+    monkeypatch.setattr(llm_app, "_LLM_STATS", dict.fromkeys(llm_app._LLM_STATS, 0))
+    monkeypatch.setattr(llm_app, "PROMPT_PREFIX_CACHE", True)
+    return llm
+
+
+def test_prefix_is_evaluated_once(fake_llm):
+    """
+    Verifies that the few-shot prefix is evaluated once and later calls only
+    evaluate their own suffix.
+
+
+    :param fake_llm: Fake llama.cpp model.
+    :type fake_llm: FakeLlama
+    :return: None.
+    :rtype: None
+    """
+    prefix_len = len(llm_app.PROMPT_PREFIX) + 1
+    suffixes = [len(llm_app._prompt_suffix(t)) for t in ("Economics PhD", "Econ PhD")]
+
+    result = llm_app._infer_llm("Economics PhD")
+    llm_app._infer_llm("Econ PhD")
+
+    assert result["standardized_program"].startswith("Economics")
+    # Only the per-row suffixes (minus what llama.cpp can share between them)
+    # are evaluated after the one-off prefix
+    assert prefix_len + suffixes[0] < fake_llm.evaluated <= prefix_len + sum(suffixes)
+    stats = llm_app._LLM_STATS
+    assert stats["prompt_tokens"] == 2 * prefix_len + sum(suffixes)
+    # Every prompt token was either served from the context or evaluated
+    assert stats["prompt_tokens"] - stats["prompt_tokens_reused"] == fake_llm.evaluated - prefix_len
+    assert stats["prompt_tokens_reused"] > 2 * prefix_len
+
+
+def test_prefix_state_restored_after_foreign_prompt(fake_llm):
+    """
+    Verifies that the saved prefix state is loaded back when another prompt
+    has replaced the model context.
+
+
+    :param fake_llm: Fake llama.cpp model.
+    :type fake_llm: FakeLlama
+    :return: None.
+    :rtype: None
+    """
+    llm_app._infer_llm("Economics PhD")
+    fake_llm.reset()
+    fake_llm.eval([1] + list(b"something else entirely"))
+    before = fake_llm.evaluated
+
+    llm_app._infer_llm("Economics PhD")
+    assert fake_llm.loads == 1
+    assert fake_llm.evaluated - before == len(llm_app._prompt_suffix("Economics PhD"))
+
+
+def test_prefix_state_restored_after_reset(fake_llm):
+    """
+    Verifies that a reset context is detected from n_tokens even though
+    input_ids still holds the old prefix, so the state is reloaded and the
+    reuse counter only credits tokens llama.cpp actually skips.
+
+
+    :param fake_llm: Fake llama.cpp model.
+    :type fake_llm: FakeLlama
+    :return: None.
+    :rtype: None
+    """
+    llm_app._infer_llm("Economics PhD")
+    fake_llm.reset()
+    before, reused = fake_llm.evaluated, llm_app._LLM_STATS["prompt_tokens_reused"]
+
+    llm_app._infer_llm("Biology MS")
+    suffix = len(llm_app._prompt_suffix("Biology MS"))
+    assert fake_llm.loads == 1
+    assert fake_llm.evaluated - before == suffix
+    assert llm_app._LLM_STATS["prompt_tokens_reused"] - reused == len(llm_app.PROMPT_PREFIX) + 1
+
+
+def test_grammar_and_parse_failure_metrics(fake_llm, monkeypatch):
+    """
+    Verifies that the JSON grammar is passed to llama.cpp only when enabled and
+    that unparseable generations are counted in the model metrics.
+
+
+    :param fake_llm: Fake llama.cpp model.
+    :type fake_llm: FakeLlama
+    :param monkeypatch: Pytest fixture for toggling the grammar.
+    :type monkeypatch: _pytest.monkeypatch.MonkeyPatch
+    :return: None.
+    :rtype: None
+    """
+    grammar = object()
+    monkeypatch.setattr(llm_app, "_GRAMMAR", {"grammar": grammar})
+    monkeypatch.setattr(llm_app, "LLM_JSON_GRAMMAR", True)
+    llm_app._infer_llm("Economics PhD")
+    assert fake_llm.kwargs["grammar"] is grammar
+
+    monkeypatch.setattr(llm_app, "LLM_JSON_GRAMMAR", False)
+    fake_llm.reply = "Sure! The program is Economics."
+    result = llm_app._infer_llm("Economics PhD, McG")
+    assert fake_llm.kwargs["grammar"] is None
+    assert result["standardized_university"].lower() == "mcgill university"
+
+    metrics = llm_app._llm_metrics()
+    assert metrics["parse_failures"] == 1
+    assert metrics["parse_failure_rate"] == 0.5
+    assert metrics["avg_completion_tokens"] == 12
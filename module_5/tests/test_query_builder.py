@@ -0,0 +1,205 @@
+import pytest
+from contextlib import contextmanager
+import src.query_builder as query_builder
+from src.query_builder import (
+    normalize_filters,
+    filter_shape,
+    build_where_clause,
+    get_filtered_stats,
+    list_applicants
+)
+
+views_path = "src.web_app.app.views"
+
+
+class FakeCursor:
+    """Minimal cursor that records executed statements and returns canned rows."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.rowcount = len(rows)
+        self.executed = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def execute(self, stmt, params=None, prepare=None):
+        self.executed.append((stmt, params, prepare))
+
+    def fetchone(self):
+        return self.rows[0] if self.rows else None
+
+    def fetchall(self):
+        return self.rows
+
+
+class FakeConnection:
+    """Minimal connection handing out a single FakeCursor."""
+
+    def __init__(self, rows):
+        self.cursor_obj = FakeCursor(rows)
+
+    def cursor(self):
+        return self.cursor_obj
+
+    def close(self):
+        pass
+
+
+def fake_pool(factory):
+    """Build a pooled_connection replacement yielding connections from factory."""
+    @contextmanager
+    def pooled_connection():
+        yield factory()
+    return pooled_connection
+
+
+def test_normalize_filters_drops_unknown_and_empty():
+    """
+    Verifies that only supported, non-empty, reasonably sized filters survive.
+
+
+    :return: None.
+    :rtype: None
+    """
+    raw = {
+        "term": " Fall 2026 ",
+        "status": "",
+        "citizenship": "International",
+        "table": "pg_user",
+        "program": "x" * (query_builder.MAX_FILTER_LENGTH + 1)
+    }
+    assert normalize_filters(raw) == {"term": "Fall 2026", "citizenship": "International"}
+    assert normalize_filters(None) == {}
+
+
+def test_where_clause_uses_indexed_equality_predicates():
+    """
+    Verifies that each filter becomes an equality predicate on its mapped column.
+
+
+    :return: None.
+    :rtype: None
+    """
+    shape = filter_shape({"term": "Fall 2026", "citizenship": "American"})
+    assert shape == ("citizenship", "term")
+    clause = build_where_clause(shape).as_string(None)
+    assert clause == '"us_or_international" = %s AND "term" = %s'
+    assert build_where_clause(()).as_string(None) == "TRUE"
+
+
+def test_statements_are_cached_per_filter_shape(monkeypatch):
+    """
+    Verifies that two cohorts with the same filter shape reuse one composed
+    statement and that values are bound as prepared-statement parameters.
+
+
+    :param monkeypatch: Pytest fixture for mocking the database connection.
+    :type monkeypatch: _pytest.monkeypatch.MonkeyPatch
+    :return: None.
+    :rtype: None
+    """
+    connections = []
+
+    def fake_connection():
+        conn = FakeConnection([(10, 50, 20, 3.5, 320, 160, 4.0, 2)])
+        connections.append(conn)
+        return conn
+
+    monkeypatch.setattr(query_builder, "pooled_connection", fake_pool(fake_connection))
+    monkeypatch.setattr(query_builder, "_STATEMENT_CACHE", {})
+
+    get_filtered_stats({"term": "Fall 2026"})
+    get_filtered_stats({"term": "Fall 2025"})
+
+    first, second = (c.cursor_obj.executed[0] for c in connections)
+    assert first[0] is second[0]
+    assert first[1] == ("International", "Accepted", "Fall 2026")
+    assert second[1] == ("International", "Accepted", "Fall 2025")
+    assert first[2] is True
+    assert len(query_builder._STATEMENT_CACHE) == 2
+
+
+def test_list_applicants_keyset_cursor_and_clamp(monkeypatch):
+    """
+    Verifies that the listing clamps the page size and returns a next cursor
+    only when a full page was fetched.
+
+
+    :param monkeypatch: Pytest fixture for mocking the database connection.
+    :type monkeypatch: _pytest.monkeypatch.MonkeyPatch
+    :return: None.
+    :rtype: None
+    """
+    row = tuple(range(len(query_builder.LISTING_COLUMNS)))
+    conn = FakeConnection([row])
+    monkeypatch.setattr(query_builder, "pooled_connection", fake_pool(lambda: conn))
+    monkeypatch.setattr(query_builder, "clamp_limit", lambda limit: 1)
+
+    page = list_applicants({"status": "Accepted"}, after_id="41", limit=5000)
+    assert conn.cursor_obj.executed[0][1] == ("Accepted", 41, 1)
+    assert page["rows"][0]["p_id"] == 0
+    assert page["next_after_id"] == 0
+
+    monkeypatch.setattr(query_builder, "clamp_limit", lambda limit: 10)
+    page = list_applicants({}, after_id="not-a-number")
+    assert conn.cursor_obj.executed[1][1] == (0, 10)
+    assert page["next_after_id"] is None
+
+
+@pytest.mark.web
+def test_api_routes_pass_query_string(client, monkeypatch):
+    """
+    Verifies that the JSON endpoints forward query-string filters to the builder.
+
+
+    :param client: Flask test client.
+    :type client: flask.testing.FlaskClient
+    :param monkeypatch: Pytest fixture for mocking the query builder.
+    :type monkeypatch: _pytest.monkeypatch.MonkeyPatch
+    :return: None.
+    :rtype: None
+    """
+    monkeypatch.setattr(f"{views_path}.get_filtered_stats",
+                        lambda args: {"filters": normalize_filters(args)})
+    monkeypatch.setattr(f"{views_path}.list_applicants",
+                        lambda args, after_id, limit: {"after_id": after_id, "limit": limit})
+
+    response = client.get("/api/stats?term=Fall%202026&bogus=1")
+    assert response.status_code == 200
+    assert response.get_json() == {"filters": {"term": "Fall 2026"}}
+
+    response = client.get("/api/applicants?after_id=5&limit=20")
+    assert response.get_json() == {"after_id": "5", "limit": "20"}
+
+
+@pytest.mark.db
+def test_filtered_stats_against_database():
+    """
+    Verifies that the builder runs against the real schema and returns every family.
+
+
+    :return: None.
+    :rtype: None
+    """
+    results = get_filtered_stats({"term": "Fall 2026", "status": "Accepted"})
+    for key in ["applicant_count", "percent_international", "avg_gpa", "top_university"]:
+        assert key in results
+
+
+def test_counter_shapes_read_summary_table():
+    """
+    Verifies that cohorts filtered only on counter keys aggregate from
+    applicant_counters while university/program filters scan applicantdata.
+
+
+    :return: None.
+    :rtype: None
+    """
+    counter_stmt = query_builder._build_stats_statement(("status", "term")).as_string(None)
+    scan_stmt = query_builder._build_stats_statement(("term", "university")).as_string(None)
+    assert '"applicant_counters"' in counter_stmt
+    assert '"applicantdata"' in scan_stmt
@@ -0,0 +1,175 @@
+import pytest
+from contextlib import contextmanager
+import src.query_data as query_data
+from instrumentation import reset_query_metrics
+
+
+class RecordingCursor:
+    """Cursor stand-in that records executions and returns one canned row."""
+
+    rowcount = 1
+
+    def __init__(self, executed):
+        self.executed = executed
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def execute(self, stmt, params=None, prepare=None):
+        self.executed.append((stmt, params, prepare))
+
+    def fetchone(self):
+        return (7, 3)
+
+
+@pytest.fixture
+def recording_pool(monkeypatch):
+    """
+    Replaces the pooled connection with a recorder so no database is needed.
+
+
+    :param monkeypatch: Pytest fixture for mocking the connection pool.
+    :type monkeypatch: _pytest.monkeypatch.MonkeyPatch
+    :return: List that collects (statement, params, prepare) tuples.
+    :rtype: list
+    """
+    executed = []
+
+    class Connection:
+        def cursor(self):
+            return RecordingCursor(executed)
+
+    @contextmanager
+    def pooled_connection():
+        yield Connection()
+
+    monkeypatch.setattr(query_data, "pooled_connection", pooled_connection)
+    reset_query_metrics()
+    return executed
+
+
+def test_registry_statements_are_reused_and_prepared(recording_pool):
+    """
+    Verifies that repeated calls execute the same import-time composition as a
+    prepared statement with the registered parameters.
+
+
+    :param recording_pool: Fixture collecting executed statements.
+    :type recording_pool: list
+    :return: None.
+    :rtype: None
+    """
+    assert query_data.get_fall_2026_apps_count() == 7
+    assert query_data.get_fall_2026_apps_count() == 7
+
+    first, second = recording_pool
+    assert first[0] is second[0] is query_data.STATEMENTS["fall_2026_apps_count"][0]
+    assert first[1] == ("Fall 2026",)
+    assert first[2] is True
+
+
+def test_statement_stats_count_executions(recording_pool):
+    """
+    Verifies that per-statement counters and timings are reported for every
+    registered statement, including ones that have not run yet.
+
+
+    :param recording_pool: Fixture collecting executed statements.
+    :type recording_pool: list
+    :return: None.
+    :rtype: None
+    """
+    assert query_data.get_llm_variance() == 0
+    query_data.get_llm_variance()
+
+    stats = query_data.get_statement_stats()
+    assert set(stats) == set(query_data.STATEMENTS)
+    assert stats["llm_variance_program"]["calls"] == 2
+    assert stats["llm_variance_llm"]["calls"] == 2
+    assert stats["llm_variance_llm"]["avg_ms"] >= 0.0
+    assert stats["averages"]["calls"] == 0
+
+
+def test_headline_metrics_read_counters_table():
+    """
+    Verifies that the plain count/percentage/average metrics are served from the
+    trigger-maintained applicant_counters table rather than a full scan.
+
+
+    :return: None.
+    :rtype: None
+    """
+    headline = [
+        "fall_2026_apps_count", "percent_international", "averages",
+        "avg_gpa_american_fall_2026", "percent_accepted_fall_2025",
+        "avg_gpa_fall_2026_acceptances", "rejected_missing_gpa"
+    ]
+    for name in headline:
+        stmt = query_data.STATEMENTS[name][0].as_string(None)
+        assert '"applicant_counters"' in stmt
+        assert '"applicantdata"' not in stmt
+
+
+def test_pooled_connection_reuses_and_closes_on_any_error(monkeypatch):
+    """
+    Verifies that a connection goes back to the pool after a clean exit and
+    is closed, not pooled, when the block raises a non-database exception.
+
+
+    :param monkeypatch: Pytest fixture for replacing the connection factory.
+    :type monkeypatch: _pytest.monkeypatch.MonkeyPatch
+    :return: None.
+    :rtype: None
+    """
+    import queue
+    import config
+
+    class Connection:
+        autocommit, closed = False, False
+
+        def close(self):
+            self.closed = True
+
+    opened = []
+
+    def connect():
+        opened.append(Connection())
+        return opened[-1]
+
+    monkeypatch.setattr(config, "_CONNECTION_POOL", queue.LifoQueue(maxsize=1))
+    monkeypatch.setattr(config, "get_db_connection", connect)
+
+    with config.pooled_connection() as first:
+        pass
+    with config.pooled_connection() as second:
+        assert second is first and first.autocommit
+    with pytest.raises(KeyError):
+        with config.pooled_connection() as failed:
+            raise KeyError("missing")
+
+    assert failed is first and first.closed
+    with config.pooled_connection() as fresh:
+        assert fresh is not first
+    assert len(opened) == 2
+
+
+def test_query_modules_share_one_clamp_limit():
+    """
+    Verifies that the analysis and builder paths use the same clamp, so an
+    invalid limit falls back to the same row count everywhere.
+
+
+    :return: None.
+    :rtype: None
+    """
+    import config
+    import src.query_builder as query_builder
+
+    assert query_data.clamp_limit is config.clamp_limit
+    assert query_builder.clamp_limit is config.clamp_limit
+    assert config.clamp_limit("abc") == 10
+    assert config.clamp_limit(10_000) == config.Config.MAX_ALLOWED_LIMIT
+    assert config.clamp_limit(0) == 1
@@ -0,0 +1,92 @@
+import sys
+from unittest.mock import MagicMock
+
+# Keep the heavy llama.cpp / Hugging Face imports out of the unit tests
+sys.modules.setdefault("llama_cpp", MagicMock())
+sys.modules.setdefault("huggingface_hub", MagicMock())
+
+import src.web_scrape.llm_hosting.app as llm_app
+from src.web_scrape.llm_hosting.program_cache import ProgramCache
+from src.web_scrape.llm_hosting.rules_resolver import RulesResolver
+
+PROGRAMS = ["Computer Science", "Economics", "Mechanical Engineering"]
+UNIVERSITIES = ["Johns Hopkins University", "University of California, Berkeley"]
+ABBREVIATIONS = {r"(?i)^jhu$": "Johns Hopkins University"}
+
+
+def make_resolver():
+    """Small resolver over a fixed canonical vocabulary."""
+    return RulesResolver(PROGRAMS, UNIVERSITIES, ABBREVIATIONS)
+
+
+def test_exact_and_abbreviation_matches_are_fully_confident():
+    """
+    Verifies that canonical and abbreviated inputs resolve with confidence 1.0.
+
+
+    :return: None.
+    :rtype: None
+    """
+    resolver = make_resolver()
+
+    result = resolver.resolve("computer science PhD, JHU")
+    assert result.program == "Computer Science PhD"
+    assert result.university == "Johns Hopkins University"
+    assert result.confidence == 1.0
+
+    assert resolver.resolve("Economics Masters").university == "Unknown"
+    assert resolver.resolve("Economics Masters").confidence == 1.0
+
+
+def test_fuzzy_and_unknown_inputs_score_below_one():
+    """
+    Verifies that typos score their similarity ratio and that unmatched or
+    ambiguous inputs score zero.
+
+
+    :return: None.
+    :rtype: None
+    """
+    resolver = make_resolver()
+
+    typo = resolver.resolve("Mechanical Enginering MS at Johns Hopkins University")
+    assert typo.program == "Mechanical Engineering MS"
+    assert 0.9 < typo.confidence < 1.0
+
+    assert resolver.resolve("Underwater Basket Weaving, JHU").confidence == 0.0
+    assert resolver.resolve("CS, Math, Physics, JHU").confidence == 0.0
+    assert resolver.resolve("").confidence == 0.0
+
+
+def test_call_llm_skips_model_for_confident_rules(monkeypatch):
+    """
+    Verifies that _call_llm answers confident inputs from the rules, sends the
+    rest to the model, and tracks the fast-path hit rate.
+
+
+    :param monkeypatch: Pytest fixture for mocking the inference function.
+    :type monkeypatch: _pytest.monkeypatch.MonkeyPatch
+    :return: None.
+    :rtype: None
+    """
+    calls = []
+
+    def fake_infer(text):
+        calls.append(text)
+        return {"standardized_program": "Other", "standardized_university": "Unknown"}
+
+    monkeypatch.setattr(llm_app, "_infer_llm", fake_infer)
+    monkeypatch.setattr(llm_app, "_CACHE", ProgramCache(None))
+    monkeypatch.setattr(llm_app, "_RESOLVER", make_resolver())
+    monkeypatch.setattr(llm_app, "FAST_PATH_THRESHOLD", 0.9)
+
+    fast = llm_app._call_llm("Economics PhD, JHU")
+    assert fast["resolved_by"] == "rules"
+    assert fast["confidence"] == 1.0
+    assert fast["standardized_university"] == "Johns Hopkins University"
+
+    slow = llm_app._call_llm("Underwater Basket Weaving, JHU")
+    assert slow["resolved_by"] == "llm"
+    assert calls == ["Underwater Basket Weaving, JHU"]
+
+    assert llm_app._RESOLVER.stats() == {"hits": 1, "misses": 1, "hit_rate": 0.5}
@@ -0,0 +1,228 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.load_data import ENTRY_KEYS, INSERT_FIELDS, bulk_insert_rows, load_snapshot_to_db
+from src.web_scrape import snapshot
+from src.web_scrape.journal import JsonArrayWriter, RowJournal
+from src.web_scrape.pipeline import ResultSink
+from src.web_scrape.snapshot import CLEAN_FIELDS, LLM_FIELDS, read_snapshot, write_snapshot
+
+ROWS = [
+    {"Program Name": "Computer Science PhD", "University": "Stanford University",
+     "Comments": "Très bien ✓", "date_added": "February 01, 2026", "URL": "u/1",
+     "Applicant Status": "Accepted", "GPA": 3.9, "GRE Score": "330",
+     "LLM Program Name": "Computer Science", "LLM University Name": "Stanford University"},
+    {"Program Name": "Economics PhD", "University": "Stanford University",
+     "Comments": None, "date_added": "February 02, 2026", "URL": "u/2",
+     "Applicant Status": "Rejected", "GPA": None, "GRE Score": None},
+    {"Program Name": "", "University": None, "URL": "u/3", "GPA": "n/a"},
+]
+
+
+def test_npy_round_trip_projects_and_memory_maps(tmp_path):
+    """
+    Verifies that the npy fallback stores text dictionary-encoded and scores
+    as NaN-filled floats, reads back only the projected columns, and maps the
+    arrays from disk.
+
+
+    :param tmp_path: Pytest fixture providing a temporary directory.
+    :type tmp_path: pathlib.Path
+    :return: None.
+    :rtype: None
+    """
+    path = str(tmp_path / "applicants.snapshot")
+    assert write_snapshot(ROWS, path, fmt="npy") == 3
+
+    snap = read_snapshot(path, columns=["University", "GPA", "Comments", "not a column"])
+    assert snap.format == "npy" and len(snap) == 3
+    assert snap.columns == ["University", "Comments", "GPA"]
+
+    codes, values = snap.dictionary("University")
+    assert isinstance(codes, np.memmap) and codes.tolist() == [0, 0, -1]
+    assert values == ["Stanford University"]
+    gpa = snap.floats("GPA")
+    assert isinstance(gpa, np.memmap) and gpa[0] == 3.9 and np.isnan(gpa[1:]).all()
+
+    rows = list(snap.rows())
+    assert rows[0] == {"University": "Stanford University", "Comments": "Très bien ✓", "GPA": 3.9}
+    assert rows[2] == {"University": None, "Comments": None, "GPA": None}
+    with pytest.raises(KeyError):
+        snap.floats("GRE Score")
+
+
+def test_npy_snapshot_replaces_previous_and_handles_empty(tmp_path):
+    """
+    Verifies that rewriting a snapshot replaces it as a whole and that an
+    empty snapshot reads back with no rows.
+
+
+    :param tmp_path: Pytest fixture providing a temporary directory.
+    :type tmp_path: pathlib.Path
+    :return: None.
+    :rtype: None
+    """
+    path = str(tmp_path / "clean.snapshot")
+    write_snapshot(ROWS, path, fields=LLM_FIELDS, fmt="npy")
+    assert write_snapshot([], path, fields=CLEAN_FIELDS, fmt="npy") == 0
+
+    snap = read_snapshot(path)
+    assert len(snap) == 0 and snap.columns == list(CLEAN_FIELDS)
+    assert list(snap.rows()) == []
+    assert not (tmp_path / "clean.snapshot.tmp").exists()
+
+
+def test_format_selection(monkeypatch, tmp_path):
+    """
+    Verifies that parquet is the default only with pyarrow installed and that
+    unknown formats are rejected.
+
+
+    :param monkeypatch: Pytest fixture for hiding pyarrow.
+    :type monkeypatch: _pytest.monkeypatch.MonkeyPatch
+    :param tmp_path: Pytest fixture providing a temporary directory.
+    :type tmp_path: pathlib.Path
+    :return: None.
+    :rtype: None
+    """
+    monkeypatch.setattr(snapshot, "_pyarrow", lambda: None)
+    assert snapshot.default_format() == "npy"
+    with pytest.raises(ValueError):
+        snapshot.SnapshotWriter(str(tmp_path / "x"), fmt="parquet")
+    with pytest.raises(ValueError):
+        snapshot.SnapshotWriter(str(tmp_path / "x"), fmt="csv")
+
+
+def test_parquet_round_trip(tmp_path):
+    """
+    Verifies that the parquet format reads back the same projected values.
+
+
+    :param tmp_path: Pytest fixture providing a temporary directory.
+    :type tmp_path: pathlib.Path
+    :return: None.
+    :rtype: None
+    """
+    pytest.importorskip("pyarrow")
+    path = str(tmp_path / "applicants.parquet")
+    write_snapshot(ROWS, path, fmt="parquet")
+
+    snap = read_snapshot(path, columns=["University", "GPA"])
+    assert snap.format == "parquet" and snap.columns == ["University", "GPA"]
+    assert [r["University"] for r in snap.rows()] == ["Stanford University"] * 2 + [None]
+    assert snap.dictionary("University")[0].tolist() == [0, 0, -1]
+    assert np.isnan(snap.floats("GPA")[1])
+
+
+def test_result_sink_streams_rows_into_snapshot(tmp_path):
+    """
+    Verifies that the LLM stage's sink writes every merged row to the
+    snapshot and finishes it on close.
+
+
+    :param tmp_path: Pytest fixture providing a temporary directory.
+    :type tmp_path: pathlib.Path
+    :return: None.
+    :rtype: None
+    """
+    path = str(tmp_path / "llm.snapshot")
+    sink = ResultSink(RowJournal(str(tmp_path / "j.jsonl")),
+                      JsonArrayWriter(str(tmp_path / "out.json")), {},
+                      snapshot=snapshot.SnapshotWriter(path, fmt="npy"))
+    sink.write(0, {"Program Name": "Math", "URL": "u/9"}, {"LLM Program Name": "Mathematics"})
+    sink.close()
+
+    rows = list(read_snapshot(path, columns=["URL", "LLM Program Name"]).rows())
+    assert rows == [{"URL": "u/9", "LLM Program Name": "Mathematics"}]
+
+
+def test_result_sink_keeps_previous_snapshot_after_partial_run(tmp_path):
+    """
+    Verifies that closing the sink after an interrupted or failed run drops
+    the new snapshot and its temporary files instead of replacing the last
+    complete snapshot.
+
+
+    :param tmp_path: Pytest fixture providing a temporary directory.
+    :type tmp_path: pathlib.Path
+    :return: None.
+    :rtype: None
+    """
+    path = str(tmp_path / "llm.snapshot")
+    write_snapshot(ROWS, path, fmt="npy")
+    (tmp_path / "llm.snapshot.tmp").mkdir()
+    sink = ResultSink(RowJournal(str(tmp_path / "j.jsonl")),
+                      JsonArrayWriter(str(tmp_path / "out.json")), {},
+                      snapshot=snapshot.SnapshotWriter(path, fmt="npy"))
+    sink.write(0, {"Program Name": "Math", "URL": "u/9"}, {"LLM Program Name": "Mathematics"})
+    sink.close(complete=False)
+
+    assert [r["URL"] for r in read_snapshot(path, columns=["URL"]).rows()] == ["u/1", "u/2", "u/3"]
+    assert not (tmp_path / "llm.snapshot.tmp").exists()
+
+
+def test_bulk_insert_copies_then_merges_in_order():
+    """
+    Verifies that rows are COPY'd into the staging table with their input
+    ordinal and merged with one ON CONFLICT statement.
+
+
+    :return: None.
+    :rtype: None
+    """
+    executed, copied = [], []
+
+    class Copy:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *args):
+            return False
+
+        def write_row(self, row):
+            copied.append(row)
+
+    class Cursor:
+        rowcount = 2
+
+        def execute(self, stmt, params=None, prepare=None):
+            executed.append(stmt.as_string(None))
+
+        def copy(self, stmt):
+            executed.append(stmt.as_string(None))
+            return Copy()
+
+    assert bulk_insert_rows(Cursor(), ROWS[:2]) == 2
+    assert "CREATE TEMP TABLE" in executed[0] and executed[1].startswith("COPY")
+    assert "ON CONFLICT (url) DO NOTHING" in executed[2] and "ORDER BY ord" in executed[2]
+    assert [row[0] for row in copied] == [0, 1]
+    assert len(copied[0]) == len(INSERT_FIELDS) + 1
+    assert copied[0][1] == "Stanford University - Computer Science PhD"
+
+
+@pytest.mark.db
+def test_load_snapshot_to_db_skips_duplicates(db, tmp_path):
+    """
+    Verifies that a snapshot is bulk-loaded once and that loading it again
+    inserts nothing.
+
+
+    :param db: Fixture providing a connection to the PostgreSQL database.
+    :type db: psycopg.Connection
+    :param tmp_path: Pytest fixture providing a temporary directory.
+    :type tmp_path: pathlib.Path
+    :return: None.
+    :rtype: None
+    """
+    rows = [dict(r, URL=f"http://snapshot-test/{i}") for i, r in enumerate(ROWS)]
+    with db.cursor() as cur:
+        cur.execute("DELETE FROM applicantdata WHERE url LIKE %s", ("http://snapshot-test/%",))
+    db.commit()
+    path = str(tmp_path / "load.snapshot")
+    write_snapshot(rows, path, fmt="npy")
+
+    assert load_snapshot_to_db(str(tmp_path / "missing")) == 0
+    assert load_snapshot_to_db(path) == 3
+    assert load_snapshot_to_db(path) == 0
+    assert set(ENTRY_KEYS) >= {"URL", "GPA", "LLM Program Name"}
@@ -0,0 +1,153 @@
+import io
+import json
+import sys
+import threading
+from collections import deque
+from unittest.mock import MagicMock
+
+import pytest
+
+# Keep the heavy llama.cpp / Hugging Face imports out of the unit tests
+sys.modules.setdefault("llama_cpp", MagicMock())
+sys.modules.setdefault("huggingface_hub", MagicMock())
+
+import src.web_scrape.llm_hosting.app as llm_app
+from src.web_scrape.llm_hosting.batching import BatchScheduler
+from src.web_scrape.llm_hosting.json_stream import iter_json_rows
+
+ROWS = [{"program": f"program {i}", "url": i} for i in range(12)]
+
+
+def fake_result(text):
+    """Deterministic stand-in for _call_llm."""
+    return {"standardized_program": text.title(), "standardized_university": "Unknown"}
+
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 4096])
+def test_iter_json_rows_accepts_array_and_ndjson(chunk_size):
+    """
+    Verifies that rows are parsed incrementally from both body shapes, whatever
+    the read size, and that truncated input raises ValueError.
+
+
+    :param chunk_size: Bytes read from the stream at a time.
+    :type chunk_size: int
+    :return: None.
+    :rtype: None
+    """
+    array = json.dumps(ROWS).encode()
+    ndjson = "\n".join(json.dumps(r) for r in ROWS).encode()
+
+    assert list(iter_json_rows(io.BytesIO(array), chunk_size)) == ROWS
+    assert list(iter_json_rows(io.BytesIO(ndjson), chunk_size)) == ROWS
+    with pytest.raises(ValueError):
+        list(iter_json_rows(io.BytesIO(array[:-1]), chunk_size))
+
+
+@pytest.fixture
+def scheduler(monkeypatch):
+    """
+    Installs a scheduler backed by fake_result and a small streaming window.
+
+
+    :param monkeypatch: Pytest fixture for swapping app globals.
+    :type monkeypatch: _pytest.monkeypatch.MonkeyPatch
+    :return: The scheduler.
+    :rtype: BatchScheduler
+    """
+    sched = BatchScheduler(fake_result, max_batch=4, max_queue=8)
+    monkeypatch.setattr(llm_app, "_SCHEDULER", sched)
+    monkeypatch.setattr(llm_app, "STREAM_WINDOW", 3)
+    yield sched
+    sched.stop(timeout=5)
+
+
+@pytest.mark.parametrize("body,content_type", [
+    ("\n".join(json.dumps(r) for r in ROWS), "application/x-ndjson"),
+    (json.dumps(ROWS), "application/json"),
+])
+def test_standardize_streams_ndjson_in_order(scheduler, body, content_type):
+    """
+    Verifies that /standardize?stream=1 answers NDJSON rows in input order for
+    NDJSON and JSON-array bodies.
+
+
+    :param scheduler: Fake-backed scheduler.
+    :type scheduler: BatchScheduler
+    :param body: Request body.
+    :type body: str
+    :param content_type: Request content type.
+    :type content_type: str
+    :return: None.
+    :rtype: None
+    """
+    client = llm_app.app.test_client()
+    response = client.post("/standardize?stream=1", data=body, content_type=content_type)
+
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.data.decode().splitlines()]
+    assert [line["url"] for line in lines] == list(range(12))
+    assert lines[2]["llm-generated-program"] == "Program 2"
+
+
+def test_stream_reports_bad_rows_and_invalid_input(scheduler):
+    """
+    Verifies that non-object rows and a truncated body are reported as NDJSON
+    error lines after the rows that were readable.
+
+
+    :param scheduler: Fake-backed scheduler.
+    :type scheduler: BatchScheduler
+    :return: None.
+    :rtype: None
+    """
+    client = llm_app.app.test_client()
+    body = '{"program": "econ"}\n"oops"\n{"program": '
+    response = client.post("/standardize", data=body, content_type="application/x-ndjson")
+
+    lines = [json.loads(line) for line in response.data.decode().splitlines()]
+    assert lines[0]["llm-generated-program"] == "Econ"
+    assert lines[1]["error"] == "each row must be a JSON object"
+    assert lines[2]["error"].startswith("invalid input")
+
+    response = client.post("/standardize?stream=1", data="{nope", content_type="application/json")
+    assert response.status_code == 400
+
+
+def test_closing_stream_cancels_queued_rows(monkeypatch):
+    """
+    Verifies that a client disconnect (generator close) cancels rows that are
+    still queued so the worker never runs them.
+
+
+    :param monkeypatch: Pytest fixture for swapping app globals.
+    :type monkeypatch: _pytest.monkeypatch.MonkeyPatch
+    :return: None.
+    :rtype: None
+    """
+    release, seen = threading.Event(), []
+
+    def slow(text):
+        if text != "p0":
+            release.wait(5)
+        seen.append(text)
+        return fake_result(text)
+
+    sched = BatchScheduler(slow, max_batch=1, max_queue=16)
+    monkeypatch.setattr(llm_app, "_SCHEDULER", sched)
+    monkeypatch.setattr(llm_app, "STREAM_WINDOW", 4)
+
+    rows = iter([{"program": f"p{i}"} for i in range(1, 6)])
+    pending = deque([({"program": "p0"}, sched.submit("p0"))])
+    stream = llm_app._stream_rows(rows, pending)
+
+    first = json.loads(next(stream))  # p1..p3 are now queued behind p0
+    queued = [future for _, future in pending]
+    stream.close()
+    release.set()
+    sched.stop(timeout=5)
+
+    assert first["llm-generated-program"] == "P0"
+    assert sum(future.cancelled() for future in queued) >= 2
+    assert "p3" not in seen and "p4" not in seen
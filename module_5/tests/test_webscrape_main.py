@@ -1,92 +1,60 @@
-import pytest
-import json
-import os
 import sys
-from pathlib import Path
 from unittest.mock import MagicMock
 
-# --- Pytest-only Mocking of heavy AI libraries and Environment ---
-
-# Prevent ModuleNotFoundErrors during import by mocking heavy dependencies
-class DummyAI:
-    def __getattr__(self, name):
-        return lambda *args, **kwargs: None
-
-sys.modules["llama_cpp"] = DummyAI()
-sys.modules["huggingface_hub"] = DummyAI()
-
-# Set environment variables to bypass the check logic in main.py
-os.environ["SKIP_SCRAPING"] = "False" 
-
-# Capture original functions to restore them after import
-original_exit = sys.exit
-original_exists = os.path.exists
-original_open = open
-
-# 1. Force os.path.exists to return True
-# 2. Neutralize sys.exit
-# 3. Mock open to return a dummy file to prevent FileNotFoundError during import
-os.path.exists = lambda path: True
-sys.exit = lambda code: None
-
-try:
-    # Use a dummy context manager for 'open' to satisfy top-level script execution
-    with MagicMock() as mock_open:
-        mock_open.return_value.__enter__.return_value.read.return_value = "{}"
-        # Temporarily override open only during the import
-        import builtins
-        builtins.open = lambda *args, **kwargs: mock_open.return_value
-        
-        import src.web_scrape.main as main
-finally:
-    # Always restore original functions immediately after import
-    import builtins
-    builtins.open = original_open
-    sys.exit = original_exit
-    os.path.exists = original_exists
+# Keep the heavy llama.cpp / Hugging Face imports out of the unit tests
+sys.modules.setdefault("llama_cpp", MagicMock())
+sys.modules.setdefault("huggingface_hub", MagicMock())
+
+import json
+
+import pytest
+
+import src.web_scrape.main as main
+from src.web_scrape.scrape import RawDataWriter, save_data
+
 
 @pytest.fixture
-def mock_dependencies(monkeypatch, tmp_path):
+def cli(monkeypatch, tmp_path):
     """
-    Fixture to mock file system paths and heavy functions to prevent actual 
-    LLM loading or web scraping during tests.
+    Points the CLI at temporary files and replaces the model with a stub
+    that records the programs it is called with.
 
 
     :param monkeypatch: Pytest fixture for mocking.
     :type monkeypatch: _pytest.monkeypatch.MonkeyPatch
     :param tmp_path: Pytest fixture for temporary directory.
     :type tmp_path: pathlib.Path
-    :return: Dictionary containing mock paths.
+    :return: Paths of the raw, output and journal files and the recorded calls.
     :rtype: dict
     """
-    # Create temporary paths for data isolation
-    raw_dir = tmp_path / "raw_data"
-    raw_dir.mkdir()
-    raw_json = raw_dir / "raw.json"
-    output_json = raw_dir / "llm_extended_applicant_data.json"
-    checkpoint_json = raw_dir / ".llm_checkpoint.json"
-
-    # Ensure the raw_json exists in the temp directory so main.py functions work
-    raw_json.write_text(json.dumps({"test": "data"}))
-
-    # Mock file paths in the main module to point to temporary test files
-    monkeypatch.setattr(main, "raw_json_path", str(raw_json))
-    monkeypatch.setattr(main, "output_path", str(output_json))
-    monkeypatch.setattr(main, "checkpoint_path", str(checkpoint_json))
-
-    # Mock heavy functions to ensure no real AI or Web calls occur
-    monkeypatch.setattr(main, "scrape_data", lambda: {"1": {"text": "test"}})
-    monkeypatch.setattr(main, "save_data", lambda x: None)
-    monkeypatch.setattr(main, "_load_llm", lambda: "mock_model")
-    monkeypatch.setattr(main, "_call_llm", lambda x: {"standardized_program": "Standardized CS"})
-    monkeypatch.setattr(main, "load_data", lambda: [{"Program Name": "CS", "University": "JHU"}])
-    
+    calls = []
+
+    def call(text):
+        calls.append(text)
+        return {"standardized_program": text.upper()}
+
+    raw_json = tmp_path / "raw_data" / "raw.json"
+    monkeypatch.setattr(main, "RAW_JSON_PATH", str(raw_json))
+    monkeypatch.setattr(main, "LLM_TIMEOUT", 0)
+    monkeypatch.setattr(main, "PROGRESS_INTERVAL", 0)
+    monkeypatch.setattr(main, "_load_llm", MagicMock)
+    monkeypatch.setattr(main, "_call_llm", call)
     return {
         "raw_json": raw_json,
-        "output_json": output_json,
-        "checkpoint_json": checkpoint_json
+        "args": ["--output", str(tmp_path / "out.json"),
+                 "--journal", str(tmp_path / "journal.jsonl")],
+        "output": tmp_path / "out.json",
+        "journal": tmp_path / "journal.jsonl",
+        "calls": calls,
     }
 
+
+def scraped(n):
+    """Entries as ``scrape.iter_entries`` yields them."""
+    return [{"university": f"U{i}", "program": f"prog {i}", "date_added": "", "decision": "",
+             "text": f"entry {i}"} for i in range(n)]
+
+
 def test_log_function(capsys):
     """
     Verifies that the log function correctly formats timestamps and flushes output.
@@ -100,7 +68,7 @@ def test_log_function(capsys):
     main.log("Test Message")
     captured = capsys.readouterr()
     assert "Test Message" in captured.out
-    assert "[" in captured.out 
+    assert "[" in captured.out
 
 def test_timeout_handler():
     """
@@ -114,87 +82,91 @@ def test_timeout_handler():
     with pytest.raises(main.TimeoutException, match="LLM call timed out"):
         main.timeout_handler(None, None)
 
-def test_main_logic_flow(mock_dependencies, monkeypatch):
+def test_parser_defaults():
     """
-    Tests the high-level logic of the main script, including data loading and LLM processing.
+    Verifies the default command line: read raw.json, no database or snapshot.
 
 
-    :param mock_dependencies: Fixture providing mocked paths.
-    :type mock_dependencies: dict
-    :param monkeypatch: Pytest fixture for mocking.
-    :type monkeypatch: _pytest.monkeypatch.MonkeyPatch
     :return: None.
     :rtype: None
     """
-    # Simulate existing data for the main logic flow
-    mock_dependencies["raw_json"].write_text(json.dumps({"1": {"text": "test"}}))
-    monkeypatch.setattr(main, "CHECKPOINT_INTERVAL", 1)
-    
-    data = [{"Program Name": "CS", "University": "JHU"}]
-    
-    # Verify LLM call result integration
-    result = main._call_llm(data[0]["Program Name"])
-    data[0]["LLM Program Name"] = result["standardized_program"]
-    
-    assert data[0]["LLM Program Name"] == "Standardized CS"
-
-def test_checkpoint_resume_logic(mock_dependencies, monkeypatch):
+    args = main.build_parser().parse_args([])
+    assert not args.scrape and not args.load_db and args.snapshot is None
+    assert (args.output, args.journal) == (main.OUTPUT_PATH, main.JOURNAL_PATH)
+    assert (args.start_page, args.end_page) == (1, 2500)
+
+def test_missing_raw_json_without_scrape_fails(cli):
     """
-    Tests the logic that restores progress from a checkpoint file.
+    Verifies that the CLI exits with an error when raw.json is missing and
+    --scrape is not given.
 
 
-    :param mock_dependencies: Fixture providing mocked paths.
-    :type mock_dependencies: dict
-    :param monkeypatch: Pytest fixture for mocking.
-    :type monkeypatch: _pytest.monkeypatch.MonkeyPatch
+    :param cli: Fixture providing temporary paths and the stub model.
+    :type cli: dict
     :return: None.
     :rtype: None
     """
-    # Create a fake checkpoint to test the resume functionality
-    checkpoint_content = {
-        "last_index": 1,
-        "0": {"LLM Program Name": "Standardized Math", "LLM University Name": "MIT"}
-    }
-    mock_dependencies["checkpoint_json"].write_text(json.dumps(checkpoint_content))
-    
-    cleaned_data = [
-        {"Program Name": "Math", "University": "MIT"},
-        {"Program Name": "Bio", "University": "JHU"}
-    ]
-    
-    # Simulate the resume logic by manually reading the mocked checkpoint
-    start_index = 0
-    if os.path.exists(main.checkpoint_path):
-        with open(main.checkpoint_path, "r") as f:
-            cp = json.load(f)
-            start_index = cp.get("last_index", 0)
-            for i in range(start_index):
-                cleaned_data[i]["LLM Program Name"] = cp[str(i)]["LLM Program Name"]
-
-    assert start_index == 1
-    assert cleaned_data[0]["LLM Program Name"] == "Standardized Math"
-
-def test_llm_failure_fallback(monkeypatch):
+    assert main.run(main.build_parser().parse_args(cli["args"])) == 1
+    assert not cli["output"].exists() and cli["calls"] == []
+
+def test_raw_data_writer_matches_save_data(tmp_path):
+    """
+    Verifies that streaming entries produces the same file as save_data on
+    the output of scrape_data, and that an empty scrape is an empty object.
+
+
+    :param tmp_path: Pytest fixture for temporary directory.
+    :type tmp_path: pathlib.Path
+    :return: None.
+    :rtype: None
+    """
+    entries = scraped(3)
+    entries[0]["text"] = "Très bien ✓"
+    save_data(dict(enumerate(entries, start=1)), str(tmp_path / "saved.json"))
+    writer = RawDataWriter(str(tmp_path / "streamed.json"))
+    for entry in entries:
+        writer.write(entry)
+    assert writer.close() == 3
+    writer.write({"late": True})
+
+    assert (tmp_path / "streamed.json").read_text(encoding="utf-8") == \
+        (tmp_path / "saved.json").read_text(encoding="utf-8")
+    assert not (tmp_path / "streamed.json.tmp").exists()
+    assert RawDataWriter(str(tmp_path / "empty.json")).close() == 0
+    assert json.loads((tmp_path / "empty.json").read_text(encoding="utf-8")) == {}
+
+def test_interrupted_scrape_resumes_without_scrape(cli, monkeypatch):
     """
-    Verifies that the script falls back to a basic split if the LLM call fails.
+    Verifies that a --scrape run that fails midway leaves raw.json and the
+    journal in place, that --scrape refuses to discard that journal, and that
+    a run without --scrape finishes the work without calling the model again
+    for journaled rows.
 
 
+    :param cli: Fixture providing temporary paths and the stub model.
+    :type cli: dict
     :param monkeypatch: Pytest fixture for mocking.
     :type monkeypatch: _pytest.monkeypatch.MonkeyPatch
     :return: None.
     :rtype: None
     """
-    def mock_fail(text):
-        raise Exception("LLM Error")
-
-    # Mock the failure and the fallback function to test error handling
-    monkeypatch.setattr(main, "_call_llm", mock_fail)
-    monkeypatch.setattr(main, "_split_fallback", lambda x: [x.split()[0]])
-
-    program_text = "Computer Science"
-    try:
-        main._call_llm(program_text)
-    except Exception:
-        fallback = main._split_fallback(program_text)[0]
-    
-    assert fallback == "Computer"
\ No newline at end of file
+    def flaky_scrape(start_page, end_page):
+        yield from scraped(4)
+        raise ConnectionError("connection reset")
+
+    monkeypatch.setattr(main, "iter_entries", flaky_scrape)
+    assert main.main(["--scrape"] + cli["args"]) == 1
+
+    raw = json.loads(cli["raw_json"].read_text(encoding="utf-8"))
+    assert list(raw) == ["1", "2", "3", "4"] and raw["4"]["program"] == "prog 3"
+    assert cli["journal"].exists()
+    first_calls = list(cli["calls"])
+
+    assert main.main(["--scrape"] + cli["args"]) == 1
+    assert cli["journal"].exists() and cli["calls"] == first_calls
+
+    assert main.main(cli["args"]) == 0
+    rows = json.loads(cli["output"].read_text(encoding="utf-8"))
+    assert [r["LLM Program Name"] for r in rows] == [f"PROG {i}" for i in range(4)]
+    assert sorted(cli["calls"]) == [f"prog {i}" for i in range(4)]
+    assert not cli["journal"].exists()
@@ -0,0 +1,127 @@
+import sys
+from unittest.mock import MagicMock
+
+# Keep the heavy llama.cpp / Hugging Face imports out of the unit tests
+sys.modules.setdefault("llama_cpp", MagicMock())
+sys.modules.setdefault("huggingface_hub", MagicMock())
+
+import os
+
+import src.web_scrape.llm_hosting.app as llm_app
+from src.web_scrape.llm_hosting import worker_pool
+
+
+def fake_call_llm(program_text):
+    """Stand-in for the model: fails on one marker row, tags results with the pid."""
+    if program_text == "boom":
+        raise ValueError("bad generation")
+    return {"standardized_program": program_text.upper(), "pid": os.getpid()}
+
+
+def test_iter_standardized_preserves_order_across_workers(monkeypatch):
+    """
+    Verifies that rows come back in input order from several forked workers,
+    each configured with its share of threads, and that a failing row is
+    reported as an error without stopping the rest.
+
+
+    :param monkeypatch: Pytest fixture for patching the model before forking.
+    :type monkeypatch: _pytest.monkeypatch.MonkeyPatch
+    :return: None.
+    :rtype: None
+    """
+    monkeypatch.setattr(llm_app, "_call_llm", fake_call_llm)
+    monkeypatch.setattr(llm_app, "_load_llm", lambda: None)
+    monkeypatch.setattr(llm_app, "LLM_CACHE_PATH", "")
+    monkeypatch.setattr(llm_app, "N_THREADS", 8)
+
+    items = [(i, f"program {i}") for i in range(40)]
+    items[7] = (7, "boom")
+    outcomes = list(worker_pool.iter_standardized(items, processes=2, chunk_size=3))
+
+    assert [idx for idx, _, _ in outcomes] == list(range(40))
+    assert outcomes[7][1] is None
+    assert outcomes[7][2] == "ValueError: bad generation"
+    assert outcomes[8][1]["standardized_program"] == "PROGRAM 8"
+    assert {result["pid"] for _, result, _ in outcomes if result} - {os.getpid()}
+
+
+def test_worker_init_splits_threads(monkeypatch):
+    """
+    Verifies that the worker initializer sets the per-process thread count and
+    replaces the inherited cache handle before loading the model.
+
+
+    :param monkeypatch: Pytest fixture for patching app globals.
+    :type monkeypatch: _pytest.monkeypatch.MonkeyPatch
+    :return: None.
+    :rtype: None
+    """
+    loaded = []
+    inherited = llm_app._CACHE
+    monkeypatch.setattr(llm_app, "_load_llm", lambda: loaded.append(llm_app.N_THREADS))
+    monkeypatch.setattr(llm_app, "LLM_CACHE_PATH", "")
+    monkeypatch.setattr(llm_app, "N_THREADS", 8)
+    monkeypatch.setattr(llm_app, "_CACHE", inherited)
+    monkeypatch.setattr(worker_pool.signal, "signal", lambda *args: None)
+
+    worker_pool._init_worker(3)
+
+    assert loaded == [3]
+    assert llm_app._CACHE is not inherited
+
+
+def test_worker_cache_uses_shared_namespace(monkeypatch):
+    """
+    Verifies that a worker's cache is namespaced like the single-process paths,
+    so threshold or rules changes are not served stale and entries are shared.
+
+
+    :param monkeypatch: Pytest fixture for patching app globals.
+    :type monkeypatch: _pytest.monkeypatch.MonkeyPatch
+    :return: None.
+    :rtype: None
+    """
+    monkeypatch.setattr(llm_app, "_load_llm", lambda: None)
+    monkeypatch.setattr(llm_app, "LLM_CACHE_PATH", "")
+    monkeypatch.setattr(llm_app, "N_THREADS", 8)
+    monkeypatch.setattr(llm_app, "_CACHE", None)
+    monkeypatch.setattr(llm_app, "FAST_PATH_THRESHOLD", 0.5)
+    monkeypatch.setattr(worker_pool.signal, "signal", lambda *args: None)
+
+    worker_pool._init_worker(2)
+
+    assert llm_app._CACHE.namespace == llm_app._cache_namespace()
+    assert ":0.5:" in llm_app._CACHE.namespace
+
+
+def test_worker_deadline_times_out_slow_rows(monkeypatch):
+    """
+    Verifies that a row exceeding the per-call deadline is interrupted inside
+    its worker, reported as a CallTimeout, and that later rows still succeed.
+
+
+    :param monkeypatch: Pytest fixture for patching the model before forking.
+    :type monkeypatch: _pytest.monkeypatch.MonkeyPatch
+    :return: None.
+    :rtype: None
+    """
+    import time
+
+    def stuck(program_text):
+        if program_text == "stuck":
+            time.sleep(30)
+        return {"standardized_program": program_text}
+
+    monkeypatch.setattr(llm_app, "_call_llm", stuck)
+    monkeypatch.setattr(llm_app, "_load_llm", lambda: None)
+    monkeypatch.setattr(llm_app, "LLM_CACHE_PATH", "")
+
+    start = time.perf_counter()
+    outcomes = list(worker_pool.iter_standardized(
+        [(0, "ok"), (1, "stuck"), (2, "after")], processes=2, chunk_size=1, timeout=0.2
+    ))
+
+    assert time.perf_counter() - start < 10
+    assert outcomes[1][2].startswith(worker_pool.CallTimeout.__name__)
+    assert outcomes[2][1] == {"standardized_program": "after"}